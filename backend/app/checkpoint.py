@@ -0,0 +1,364 @@
+import random
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import sessionmaker
+
+from .metrics import metrics
+from .models import GraphCheckpoint, GraphCheckpointBlob, GraphCheckpointWrite
+
+
+class SQLCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer on the app's SQLAlchemy engine (thread_id = session id).
+
+    Layout follows the upstream Postgres saver: the checkpoint row holds versions and
+    bookkeeping only, and channel values are stored per (channel, version). A super-step
+    therefore writes blobs only for the channels its node returned; untouched channels
+    (resume text/summary, role, ...) keep pointing at their existing rows.
+    """
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None, serde=None):
+        super().__init__(serde=serde)
+        if session_factory is None:
+            from .database import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _ids(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+    def _load_blobs(self, db, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        if not versions:
+            return {}
+        keys = [(channel, str(version)) for channel, version in versions.items()]
+        rows = db.execute(
+            select(GraphCheckpointBlob).where(
+                GraphCheckpointBlob.thread_id == thread_id,
+                GraphCheckpointBlob.checkpoint_ns == checkpoint_ns,
+                tuple_(GraphCheckpointBlob.channel, GraphCheckpointBlob.version).in_(keys),
+            )
+        ).scalars()
+        values = {}
+        for row in rows:
+            if row.value_type == "empty":
+                continue
+            values[row.channel] = self.serde.loads_typed((row.value_type, row.value))
+        return values
+
+    def _pending_writes(self, db, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        rows = db.execute(
+            select(GraphCheckpointWrite).where(
+                GraphCheckpointWrite.thread_id == thread_id,
+                GraphCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                GraphCheckpointWrite.checkpoint_id == checkpoint_id,
+            ).order_by(GraphCheckpointWrite.task_path, GraphCheckpointWrite.task_id, GraphCheckpointWrite.idx)
+        ).scalars()
+        return [(w.task_id, w.channel, self.serde.loads_typed((w.value_type, w.value))) for w in rows]
+
+    def _to_tuple(self, db, row: GraphCheckpoint) -> CheckpointTuple:
+        checkpoint = self.serde.loads_typed((row.checkpoint_type, row.checkpoint))
+        checkpoint["channel_values"] = self._load_blobs(db, row.thread_id, row.checkpoint_ns, checkpoint["channel_versions"])
+        parent_config = None
+        if row.parent_checkpoint_id:
+            parent_config = {"configurable": {
+                "thread_id": row.thread_id, "checkpoint_ns": row.checkpoint_ns,
+                "checkpoint_id": row.parent_checkpoint_id,
+            }}
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": row.thread_id, "checkpoint_ns": row.checkpoint_ns,
+                "checkpoint_id": row.checkpoint_id,
+            }},
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((row.metadata_type, row.metadata_blob)),
+            parent_config=parent_config,
+            pending_writes=self._pending_writes(db, row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+        )
+
+    # --- BaseCheckpointSaver ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns = self._ids(config)
+        stmt = select(GraphCheckpoint).where(
+            GraphCheckpoint.thread_id == thread_id,
+            GraphCheckpoint.checkpoint_ns == checkpoint_ns,
+        )
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            stmt = stmt.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            # Checkpoint ids are monotonic (uuid6), so the max id is the latest
+            stmt = stmt.order_by(GraphCheckpoint.checkpoint_id.desc()).limit(1)
+
+        db = self._session_factory()
+        try:
+            row = db.execute(stmt).scalars().first()
+            return self._to_tuple(db, row) if row is not None else None
+        finally:
+            db.close()
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        stmt = select(GraphCheckpoint)
+        if config is not None:
+            configurable = config["configurable"]
+            stmt = stmt.where(GraphCheckpoint.thread_id == configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                stmt = stmt.where(GraphCheckpoint.checkpoint_ns == configurable["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                stmt = stmt.where(GraphCheckpoint.checkpoint_id == get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            stmt = stmt.where(GraphCheckpoint.checkpoint_id < get_checkpoint_id(before))
+        stmt = stmt.order_by(GraphCheckpoint.checkpoint_id.desc())
+        if limit is not None and not filter:
+            stmt = stmt.limit(limit)
+
+        db = self._session_factory()
+        try:
+            returned = 0
+            for row in db.execute(stmt).scalars():
+                if limit is not None and returned >= limit:
+                    break
+                item = self._to_tuple(db, row)
+                # Metadata is serialized, so filter after loading
+                if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                returned += 1
+                yield item
+        finally:
+            db.close()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, checkpoint_ns = self._ids(config)
+        stored = dict(checkpoint)
+        values = stored.pop("channel_values")
+
+        db = self._session_factory()
+        try:
+            written = 0
+            for channel, version in new_versions.items():
+                if channel in values:
+                    value_type, value = self.serde.dumps_typed(values[channel])
+                else:
+                    value_type, value = "empty", None
+                written += len(value or b"")
+                db.merge(GraphCheckpointBlob(
+                    thread_id=thread_id, checkpoint_ns=checkpoint_ns,
+                    channel=channel, version=str(version),
+                    value_type=value_type, value=value,
+                ))
+
+            checkpoint_type, checkpoint_blob = self.serde.dumps_typed(stored)
+            metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            written += len(checkpoint_blob) + len(metadata_blob)
+            db.merge(GraphCheckpoint(
+                thread_id=thread_id, checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+                checkpoint_type=checkpoint_type, checkpoint=checkpoint_blob,
+                metadata_type=metadata_type, metadata_blob=metadata_blob,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+        metrics.incr("checkpoint.puts")
+        metrics.incr("checkpoint.bytes_written", written)
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, checkpoint_ns = self._ids(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        db = self._session_factory()
+        written = 0
+        try:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                key = (thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx)
+                # Regular writes are first-wins; special channels (errors, interrupts) overwrite
+                if write_idx >= 0 and db.get(GraphCheckpointWrite, key) is not None:
+                    continue
+                value_type, blob = self.serde.dumps_typed(value)
+                written += len(blob or b"")
+                db.merge(GraphCheckpointWrite(
+                    thread_id=thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id=checkpoint_id,
+                    task_id=task_id, idx=write_idx, channel=channel,
+                    value_type=value_type, value=blob, task_path=task_path,
+                ))
+            db.commit()
+        finally:
+            db.close()
+        metrics.incr("checkpoint.bytes_written", written)
+
+    def get_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]) -> Mapping[str, dict]:
+        """
+        Rebuild inputs for delta channels (the interview histories): walks the parent chain
+        of the target checkpoint and, per channel, collects writes back to the nearest
+        ancestor holding a full snapshot. Same contract as the base class, but in three
+        queries instead of a get_tuple() per ancestor.
+        """
+        if not channels:
+            return {}
+        thread_id, checkpoint_ns = self._ids(config)
+        target_id = get_checkpoint_id(config)
+
+        db = self._session_factory()
+        try:
+            rows = db.execute(
+                select(GraphCheckpoint.checkpoint_id, GraphCheckpoint.parent_checkpoint_id,
+                       GraphCheckpoint.checkpoint_type, GraphCheckpoint.checkpoint).where(
+                    GraphCheckpoint.thread_id == thread_id,
+                    GraphCheckpoint.checkpoint_ns == checkpoint_ns,
+                )
+            ).all()
+            by_id = {r.checkpoint_id: r for r in rows}
+            if not target_id:
+                target_id = max(by_id, default=None)
+
+            # Ancestors of the target, newest first
+            chain: List[str] = []
+            current = by_id[target_id].parent_checkpoint_id if target_id in by_id else None
+            while current is not None and current in by_id:
+                chain.append(current)
+                current = by_id[current].parent_checkpoint_id
+
+            versions = {
+                cp_id: self.serde.loads_typed((by_id[cp_id].checkpoint_type, by_id[cp_id].checkpoint))["channel_versions"]
+                for cp_id in chain
+            }
+            blob_keys = {(ch, str(v[ch])) for v in versions.values() for ch in channels if ch in v}
+            blobs = {}
+            if blob_keys:
+                for b in db.execute(
+                    select(GraphCheckpointBlob).where(
+                        GraphCheckpointBlob.thread_id == thread_id,
+                        GraphCheckpointBlob.checkpoint_ns == checkpoint_ns,
+                        GraphCheckpointBlob.value_type != "empty",
+                        tuple_(GraphCheckpointBlob.channel, GraphCheckpointBlob.version).in_(list(blob_keys)),
+                    )
+                ).scalars():
+                    blobs[(b.channel, b.version)] = b
+
+            writes_by_cp: Dict[str, list] = {}
+            if chain:
+                for w in db.execute(
+                    select(GraphCheckpointWrite).where(
+                        GraphCheckpointWrite.thread_id == thread_id,
+                        GraphCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                        GraphCheckpointWrite.checkpoint_id.in_(chain),
+                        GraphCheckpointWrite.channel.in_(list(channels)),
+                    )
+                ).scalars():
+                    writes_by_cp.setdefault(w.checkpoint_id, []).append(w)
+        finally:
+            db.close()
+
+        collected: Dict[str, list] = {ch: [] for ch in channels}
+        seeds: Dict[str, Any] = {}
+        remaining = set(channels)
+        for cp_id in chain:
+            if not remaining:
+                break
+            # A snapshot is the value *before* this ancestor's own writes, so those are still collected
+            terminated = {}
+            for ch in remaining:
+                version = versions[cp_id].get(ch)
+                blob = blobs.get((ch, str(version))) if version is not None else None
+                if blob is not None:
+                    terminated[ch] = self.serde.loads_typed((blob.value_type, blob.value))
+            ordered = sorted(writes_by_cp.get(cp_id, []), key=lambda w: writes_sort_key(w.task_path, w.task_id, w.idx))
+            for w in reversed(ordered):
+                if w.channel in remaining:
+                    collected[w.channel].append((w.task_id, w.channel, self.serde.loads_typed((w.value_type, w.value))))
+            for ch, value in terminated.items():
+                seeds[ch] = value
+                remaining.discard(ch)
+
+        result = {}
+        for ch in channels:
+            entry = {"writes": list(reversed(collected[ch]))}
+            if ch in seeds:
+                entry["seed"] = seeds[ch]
+            result[ch] = entry
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        db = self._session_factory()
+        try:
+            for model in (GraphCheckpointWrite, GraphCheckpointBlob, GraphCheckpoint):
+                db.execute(delete(model).where(model.thread_id == thread_id))
+            db.commit()
+        finally:
+            db.close()
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded counter + random suffix, so versions sort as text and forks don't collide.
+        # Upstream savers pad to 32 digits; versions are repeated in every checkpoint's
+        # channel_versions/versions_seen, and an interview never gets near a million steps.
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:06}.{random.getrandbits(24):06x}"
+
+    # The graph only runs synchronously (worker threads); async variants delegate.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+    async def aget_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]) -> Mapping[str, dict]:
+        return self.get_delta_channel_history(config=config, channels=channels)
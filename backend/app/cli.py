@@ -0,0 +1,142 @@
+"""
+Offline admin commands.
+
+    python -m app.cli evaluate-batch items.jsonl -o evaluations.jsonl
+    python -m app.cli export -o reports.zip --role SDE1 --from 2026-01-01
+    python -m app.cli backfill-analytics
+    python -m app.cli upgrade-state
+"""
+import sys
+import argparse
+from datetime import datetime
+
+from .models import BatchEvaluationItem, ExportFilters
+
+
+def cmd_evaluate_batch(args):
+    from .services.batch_eval import evaluate_items
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        items = [BatchEvaluationItem.model_validate_json(line) for line in f if line.strip()]
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = 0
+        for result in evaluate_items(items, token_budget=args.token_budget, max_workers=args.workers):
+            out.write(result.model_dump_json() + "\n")
+            out.flush()
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scored {count}/{len(items)} items", file=sys.stderr)
+
+
+def cmd_export(args):
+    from .services.export import stream_export
+
+    filters = ExportFilters(
+        role=args.role, difficulty=args.difficulty,
+        created_from=args.created_from, created_to=args.created_to,
+        is_active=args.is_active
+    )
+    fmt = "tar" if args.output.endswith((".tar", ".tar.gz", ".tgz")) else "zip"
+    written = 0
+    with open(args.output, "wb") as f:
+        for chunk in stream_export(filters, fmt=fmt, include_pdf=not args.no_pdf):
+            f.write(chunk)
+            written += len(chunk)
+    print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+
+
+def cmd_backfill_analytics(args):
+    from .database import SessionLocal, init_db
+    from .repo import SessionRepo
+    from .services.analytics import backfill_session
+
+    init_db()
+    reader, writer = SessionLocal(), SessionLocal()
+    count = 0
+    try:
+        for session in SessionRepo(reader).iter_sessions(ExportFilters()):
+            if session.state_json:
+                backfill_session(writer, session.id, session.state_json)
+                count += 1
+    finally:
+        reader.close()
+        writer.close()
+    print(f"Backfilled analytics for {count} sessions", file=sys.stderr)
+
+
+def cmd_upgrade_state(args):
+    from .database import SessionLocal, init_db
+    from .models import Session
+    from .state_codec import STATE_CODEC, parse_codec
+
+    if parse_codec(STATE_CODEC) is None:
+        sys.exit("STATE_CODEC is text; nothing to upgrade to")
+    init_db()
+    db = SessionLocal()
+    count = 0
+    try:
+        while True:
+            batch = (
+                db.query(Session)
+                .filter(Session.state_blob.is_(None), Session.state_text.isnot(None))
+                .limit(args.batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            for session in batch:
+                session.state_json = session.state_text
+            db.commit()
+            db.expunge_all()
+            count += len(batch)
+    finally:
+        db.close()
+    print(f"Re-encoded state of {count} sessions as {STATE_CODEC}", file=sys.stderr)
+
+
+def _bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Interviewer.AI admin tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("evaluate-batch", help="Score JSONL items of {id, question, expected_points, answer}")
+    p.add_argument("input", help="Input JSONL file")
+    p.add_argument("-o", "--output", help="Output JSONL file (default: stdout)")
+    p.add_argument("--token-budget", type=int, default=None, help="Max prompt+output tokens per LLM call")
+    p.add_argument("--workers", type=int, default=None, help="Concurrent batches (default: LLM_MAX_CONCURRENCY)")
+    p.set_defaults(func=cmd_evaluate_batch)
+
+    p = sub.add_parser("export", help="Export reports (JSON + PDF) as a .zip or .tar.gz archive")
+    p.add_argument("-o", "--output", required=True, help="Output path (.zip, or .tar.gz for tar)")
+    p.add_argument("--role", default=None)
+    p.add_argument("--difficulty", default=None)
+    p.add_argument("--from", dest="created_from", type=datetime.fromisoformat, default=None)
+    p.add_argument("--to", dest="created_to", type=datetime.fromisoformat, default=None)
+    p.add_argument("--active", dest="is_active", type=_bool, default=None)
+    p.add_argument("--no-pdf", action="store_true", help="Only export report.json files")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("backfill-analytics", help="Rebuild evaluation/report analytics rows and the skill index from stored session state")
+    p.set_defaults(func=cmd_backfill_analytics)
+
+    p = sub.add_parser("upgrade-state", help="Re-encode sessions still stored as JSON text with STATE_CODEC (they are also upgraded on their next write)")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.set_defaults(func=cmd_upgrade_state)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,95 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Any, Dict
 import os
+import time
 from dotenv import load_dotenv
 
+from .metrics import metrics
+
 load_dotenv()
 
 # robust default to sqlite if no URL provided
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./interviewer.db")
 
-# Basic check: if it looks like a postgres URL but we want to use sqlite for local driver issues, 
-# sometimes users change their mind. But here we trust the env var.
-# If using sqlite, check for thread check requirement
-connect_args = {}
-if "sqlite" in DATABASE_URL:
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(
-    DATABASE_URL, connect_args=connect_args
-)
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "true" if default else "false").lower() in ("1", "true", "yes")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Per-dialect create_engine() kwargs, tunable via env vars.
+
+    Postgres: DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+    SQLite:   pool sizing as above; pragmas are applied on connect (see sqlite_pragmas)
+    """
+    options: Dict[str, Any] = {"echo": _env_bool("DB_ECHO", False)}
+
+    if url.startswith("sqlite"):
+        # FastAPI runs sync endpoints in a threadpool; connections cross threads
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in url or url.rstrip("/") == "sqlite:":
+            return options
+        options.update(
+            pool_size=_env_int("DB_POOL_SIZE", 5),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        )
+        return options
+
+    # Postgres (and other server databases)
+    options.update(
+        pool_size=_env_int("DB_POOL_SIZE", 10),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        # Recycle before typical server/proxy idle timeouts drop the socket
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+    )
+    return options
+
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """
+    WAL lets readers proceed while a writer commits; synchronous=NORMAL is durable
+    across app crashes in WAL mode and avoids an fsync per commit.
+    """
+    return {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),  # negative = KiB
+        "temp_store": "MEMORY",
+    }
+
+
+def build_engine(url: str = DATABASE_URL, tuned: bool = True) -> Engine:
+    """tuned=False gives plain create_engine() defaults (used by the commit benchmark)."""
+    if not tuned:
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        return create_engine(url, connect_args=connect_args)
+
+    new_engine = create_engine(url, **engine_options(url))
+    if url.startswith("sqlite") and ":memory:" not in url:
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(new_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return new_engine
+
+
+engine = build_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -26,6 +97,34 @@ Base = declarative_base()
 def get_db():
     db = SessionLocal()
     try:
+        # Check out eagerly so pool wait time is measured (every endpoint using this touches the DB anyway)
+        start = time.perf_counter()
+        db.connection()
+        metrics.observe("db.pool_checkout_ms", (time.perf_counter() - start) * 1000)
         yield db
     finally:
         db.close()
+
+def pool_stats() -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {"dialect": engine.dialect.name, "pool": type(pool).__name__}
+    for attr in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            stats[attr] = fn()
+    return stats
+
+def init_db():
+    """Creates missing tables, plus columns and indexes added to tables that already exist."""
+    Base.metadata.create_all(bind=engine)
+    # create_all skips new columns and indexes on pre-existing tables
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                # Added as nullable with no backfill; readers treat NULL as the old behaviour
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"))
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,233 @@
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .models import Evaluation, Question
+
+# Local stand-ins for when a node's LLM call misses its deadline. They keep the interview
+# moving; state records which steps degraded (degraded_steps), and provisional evaluations
+# are re-graded by the LLM in the background (deferred_evaluations).
+
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = {
+    "about", "after", "also", "been", "being", "from", "have", "into", "like", "more", "most",
+    "only", "other", "over", "some", "such", "than", "that", "their", "them", "then", "there",
+    "these", "they", "this", "what", "when", "where", "which", "while", "with", "would", "your",
+}
+
+
+def _terms(text: str) -> Set[str]:
+    return {w for w in _WORD.findall(text.lower()) if len(w) > 3 and w not in _STOPWORDS}
+
+
+def _clamp(score: float) -> int:
+    return max(0, min(10, round(score)))
+
+
+def heuristic_evaluation(question: Dict[str, Any], answer_text: str) -> Evaluation:
+    """
+    Quick local grade: expected-point coverage by keyword overlap, plus length and sentence
+    structure. Marked provisional; follow-up rules mirror the evaluation prompt's rubric.
+    """
+    words = _WORD.findall((answer_text or "").lower())
+    vocabulary = set(words)
+    expected = question.get("expected_points") or []
+
+    covered, missing = [], []
+    for point in expected:
+        terms = _terms(point)
+        (covered if terms and len(terms & vocabulary) * 2 >= len(terms) else missing).append(point)
+
+    n_words = len(words)
+    coverage = len(covered) / len(expected) if expected else min(1.0, n_words / 80)
+    length = min(1.0, n_words / 120)
+    sentences = max(1, len(re.findall(r"[.!?]+", answer_text or "")))
+    words_per_sentence = n_words / sentences
+
+    correctness = _clamp(2 + 6 * coverage)  # can't judge accuracy locally: capped at 8
+    depth = _clamp(2 + 4 * coverage + 3 * length)
+    structure = _clamp(3 + 4 * min(1.0, sentences / 4) + (1 if n_words >= 60 else 0))
+    communication = _clamp(3 if n_words < 10 else 7 if 8 <= words_per_sentence <= 25 else 5)
+
+    followup = n_words < 30 or len(missing) >= 2 or correctness < 6 or depth < 6
+    return Evaluation(
+        question_id=question.get("id", ""),
+        correctness_score=correctness,
+        depth_score=depth,
+        structure_score=structure,
+        communication_score=communication,
+        missing_points=missing,
+        feedback_text=(
+            f"Provisional score from a quick check ({len(covered)} of {len(expected)} expected points covered); "
+            "the full evaluation will replace it."
+        ),
+        followup_needed=followup,
+        followup_reason="Answer looks short or misses expected points." if followup else None,
+        provisional=True,
+    )
+
+
+# --- Question bank ---
+
+# Topics whose questions fit every role
+QUESTION_BANK: Dict[str, List[Dict[str, Any]]] = {
+    "General/Intro": [
+        {"text": "Walk me through your background and the project you are most proud of.",
+         "expected_points": ["Context of the project", "Personal contribution", "Outcome or impact"]},
+        {"text": "Tell me about a recent piece of work where you had to learn something new quickly.",
+         "expected_points": ["What had to be learned", "How it was learned", "Result"]},
+    ],
+}
+
+# Role-specific questions for the default schedule's topics (which every role gets unless a
+# template says otherwise). A topic a role has no entry for gets GENERIC_TOPIC_QUESTION.
+ROLE_QUESTION_BANK: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+    "SDE1": {
+        "Technical Deep Dive": [
+            {"text": "Pick a system from your resume and explain its architecture and the hardest bug you fixed in it.",
+             "expected_points": ["Components and data flow", "Root cause of the bug", "How it was verified"]},
+            {"text": "Describe a performance problem you diagnosed. How did you measure it and what did you change?",
+             "expected_points": ["Measurement or profiling", "Bottleneck identified", "Change and its measured effect"]},
+        ],
+        "System Design / Architecture": [
+            {"text": "How would you design a URL shortener that handles a billion redirects a day?",
+             "expected_points": ["Key generation", "Storage and caching", "Scaling reads", "Failure handling"]},
+            {"text": "Design a notification service that sends email and push messages reliably.",
+             "expected_points": ["Queueing", "Retries and idempotency", "Provider failover", "Rate limiting"]},
+        ],
+    },
+    "Product Manager": {
+        "Technical Deep Dive": [
+            {"text": "Walk me through a product you shipped: the main technical constraint and a trade-off you worked out with engineering.",
+             "expected_points": ["Product goal", "Constraint and its impact", "Trade-off and who agreed it", "Outcome"]},
+        ],
+        "System Design / Architecture": [
+            {"text": "How would you scope the first release of a feature that lets users schedule posts? What would you cut, and how would you know it works?",
+             "expected_points": ["Target user and problem", "MVP scope and cuts", "Success metrics", "Rollout plan"]},
+        ],
+    },
+    "Marketing Manager": {
+        "Technical Deep Dive": [
+            {"text": "Walk me through a campaign you ran end to end: the audience, the channels, and how you measured the result.",
+             "expected_points": ["Audience and goal", "Channel choice", "Measurement", "What you changed afterwards"]},
+        ],
+        "System Design / Architecture": [
+            {"text": "How would you set up the funnel and tracking for a product launch so you could tell which channels worked?",
+             "expected_points": ["Funnel stages", "Attribution and tracking", "Budget allocation", "Reporting cadence"]},
+        ],
+    },
+}
+
+GENERIC_TOPIC_QUESTION = {
+    "text": "Tell me about your experience with {topic}: a concrete problem, what you did, and what you would do differently.",
+    "expected_points": ["Concrete example", "Own contribution", "Reflection or trade-offs"],
+}
+
+
+def banked_question(role: str, topic: str, difficulty: str, question_index: int, asked_texts: Set[str]) -> Question:
+    """A main question from the bank for this role and topic that hasn't been asked yet."""
+    entries = QUESTION_BANK.get(topic) or ROLE_QUESTION_BANK.get(role, {}).get(topic, [])
+    entry = next((e for e in entries if e["text"] not in asked_texts), None)
+    if entry is None:
+        entry = {**GENERIC_TOPIC_QUESTION, "text": GENERIC_TOPIC_QUESTION["text"].format(topic=topic)}
+    return Question(
+        id=f"q_{question_index}", text=entry["text"], topic=topic,
+        expected_points=list(entry["expected_points"]), difficulty=difficulty, kind="main",
+    )
+
+
+def fallback_followup_text(last_eval: Dict[str, Any]) -> str:
+    """The evaluator's own suggested follow-up, else one aimed at the first missing point."""
+    if last_eval.get("followup_question"):
+        return last_eval["followup_question"]
+    missing = last_eval.get("missing_points") or []
+    if missing:
+        return f"Could you go deeper on this part: {missing[0]}?"
+    return "Could you walk me through a concrete example of that, step by step?"
+
+
+# --- Deferred evaluation ---
+
+def evaluation_key(question: Dict[str, Any], answer_text: str) -> str:
+    raw = f"{question.get('id')}\x00{question.get('text')}\x00{answer_text}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class EvaluationFinalizer:
+    """
+    Runs the full LLM evaluation for answers that got a provisional grade, off the request
+    path, or adopts the evaluation call that missed its deadline and is still running.
+    Results are picked up by the graph on a later step of the same session (in this
+    process); the report step waits for or recomputes any that are still missing.
+    """
+
+    def __init__(self, max_workers: int = 2, max_entries: int = 1000):
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, key: str, grade: Callable[[], Evaluation]) -> Future:
+        with self._lock:
+            future = self._current(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="eval-finalize")
+                future = self._executor.submit(grade)
+                self._store(key, future)
+            return future
+
+    def adopt(self, key: str, pending: Future) -> Future:
+        """Tracks an evaluation already in flight (LLMDeadlineExceeded.pending) instead of starting one."""
+        with self._lock:
+            future = self._current(key)
+            if future is None:
+                future = pending
+                self._store(key, future)
+            return future
+
+    def _current(self, key: str) -> Optional[Future]:
+        future = self._futures.get(key)
+        if future is not None and future.done() and future.exception() is not None:
+            return None  # failed earlier (e.g. provider down); try again
+        return future
+
+    def _store(self, key: str, future: Future):
+        self._futures[key] = future
+        while len(self._futures) > self.max_entries:
+            self._futures.popitem(last=False)
+
+    def ready(self, key: str) -> Optional[Evaluation]:
+        """The finished evaluation for key, without waiting."""
+        with self._lock:
+            future = self._futures.get(key)
+        if future is None or not future.done():
+            return None
+        return self._result(future, 0)
+
+    def result(self, key: str, grade: Callable[[], Evaluation], timeout: Optional[float]) -> Optional[Evaluation]:
+        """Waits up to timeout, submitting the evaluation first if this process never started it."""
+        return self._result(self.submit(key, grade), timeout)
+
+    def _result(self, future: Future, timeout: Optional[float]) -> Optional[Evaluation]:
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            return None
+        except Exception as e:
+            print(f"Deferred evaluation failed: {e}")
+            return None
+
+
+finalizer = EvaluationFinalizer(max_workers=int(os.getenv("EVAL_FINALIZE_WORKERS", "2")))
+
+
+def effective_evaluations(state: Dict[str, Any]) -> List[Dict]:
+    """eval_history with provisional grades replaced by their deferred LLM evaluation, when done."""
+    deferred = state.get("deferred_evaluations") or {}
+    return [deferred.get(e.get("question_id"), e) for e in state.get("eval_history") or []]
@@ -1,12 +1,25 @@
-from typing import Dict, Any, List, TypedDict, Optional, Literal
-from langgraph.graph import StateGraph, END
-from .models import ResumeSummary, Question, Evaluation, FinalReport, RoleEnum, DifficultyEnum
-from .llm import llm_client
+import os
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, TypedDict, Optional, Literal, Annotated
+from .models import ResumeSummary, Question, Evaluation, FinalReport, TurnResult, RoleEnum, DifficultyEnum
+from .llm import llm_client, LLMDeadlineExceeded, map_future
+from .metrics import metrics
+from .shared_cache import shared_cache
+from .singleflight import SingleFlight
+from .resume_extract import extract_summary
+from .fallbacks import (
+    finalizer, evaluation_key, heuristic_evaluation, banked_question, fallback_followup_text
+)
+from .interview_templates import template_registry, topic_for, question_system_prompt
 from .prompts.templates import (
     SUMMARIZE_SYSTEM_PROMPT, SUMMARIZE_USER_PROMPT,
-    GENERATE_QUESTION_SYSTEM_PROMPT, GENERATE_QUESTION_USER_PROMPT,
+    GENERATE_QUESTION_USER_PROMPT,
     GENERATE_FOLLOWUP_SYSTEM_PROMPT, GENERATE_FOLLOWUP_USER_PROMPT,
     EVALUATE_ANSWER_SYSTEM_PROMPT, EVALUATE_ANSWER_USER_PROMPT,
+    FUSED_TURN_SYSTEM_PROMPT, FUSED_TURN_USER_PROMPT,
     REPORT_SYSTEM_PROMPT, REPORT_USER_PROMPT
 )
 
@@ -14,15 +27,18 @@ from .prompts.templates import (
 class InterviewState(TypedDict):
     resume_text: str
     resume_summary: Optional[Dict] # serialized ResumeSummary
+    resume_summary_source: Optional[str] # "llm" | "local" (app/resume_extract.py, until the LLM refine lands)
     role: str
     difficulty: str
     total_questions: int
+    template_id: Optional[str] # interview template (topic schedule); None = default for role/difficulty
     
     question_history: List[Dict] # serialized Question
     answer_history: List[Dict] # serialized Answer (includes question_id)
     eval_history: List[Dict] # serialized Evaluation
     
     current_question: Optional[Dict] # serialized Question
+    prepared_question: Optional[Dict] # next Question written ahead of its node (fused turn, parallel intro)
     current_step: int # Legacy counter, synced to main questions
     
     # New Fields for Logic
@@ -33,114 +49,307 @@ class InterviewState(TypedDict):
     pending_followup: Optional[Dict] # serialized Question
     
     final_report: Optional[Dict] # serialized FinalReport
+
+    # Deadline fallbacks
+    degraded_steps: List[Dict] # {node, question_id, fallback, budget_sec} per step that missed its deadline
+    deferred_evaluations: Dict[str, Dict] # question_id -> LLM evaluation replacing a provisional one
     
     # Flags
     is_finished: bool
 
+# Per-node LLM budgets in seconds (0 = no deadline). Past them a node falls back to a
+# local answer (app/fallbacks.py) and records it in degraded_steps.
+EVAL_DEADLINE_SEC = float(os.getenv("EVAL_DEADLINE_SEC", "20"))
+QUESTION_DEADLINE_SEC = float(os.getenv("QUESTION_DEADLINE_SEC", "15"))
+RESUME_SUMMARY_TTL_SEC = float(os.getenv("RESUME_SUMMARY_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+
+# How long the report step waits for provisional evaluations to be re-graded
+EVAL_FINALIZE_WAIT_SEC = float(os.getenv("EVAL_FINALIZE_WAIT_SEC", "60"))
+# Ask the evaluator's own followup_question when it has one, instead of a second LLM call
+FOLLOWUP_FROM_EVALUATION = os.getenv("FOLLOWUP_FROM_EVALUATION", "true").lower() in ("1", "true", "yes")
+# One LLM call per answer turn that grades the answer and writes the next question
+FUSED_TURNS = os.getenv("FUSED_TURNS", "false").lower() in ("1", "true", "yes")
+
+# The intro question barely depends on the resume summary, so it is written while the
+# summary is (from the start of the resume text) instead of after it
+PARALLEL_INTRO_QUESTION = os.getenv("PARALLEL_INTRO_QUESTION", "true").lower() in ("1", "true", "yes")
+INTRO_TOPICS = {"General/Intro"}
+INTRO_RESUME_CHARS = 2000
+_intro_executor = ThreadPoolExecutor(max_workers=int(os.getenv("INTRO_QUESTION_WORKERS", "8")), thread_name_prefix="intro-question")
+
+# Where ResumeSummary comes from: "llm" (one LLM call), "local" (app/resume_extract.py, no LLM)
+# or "local_refine" (local summary right away, LLM summary swapped in once it is ready)
+RESUME_SUMMARY_MODE = os.getenv("RESUME_SUMMARY_MODE", "llm").lower()
+_refine_executor = ThreadPoolExecutor(max_workers=int(os.getenv("RESUME_REFINE_WORKERS", "4")), thread_name_prefix="resume-refine")
+_refinements: Dict[str, Any] = {}  # summary cache key -> Future of the LLM summary (bytes)
+
+# In-process coalescing of identical concurrent calls (see app/singleflight.py)
+_summary_flight = SingleFlight("resume_summary")
+_report_flight = SingleFlight("report")
+
+def _degraded(state: InterviewState, node: str, question_id: str, fallback: str, budget: float) -> List[Dict]:
+    print(f"--- {node}: no LLM answer within {budget:g}s, using {fallback} ---")
+    metrics.incr(f"deadline.fallback.{node}")
+    step = {"node": node, "question_id": question_id, "fallback": fallback, "budget_sec": budget}
+    return (state.get("degraded_steps") or []) + [step]
+
 # --- Nodes ---
+# Nodes return the whole state but never mutate the lists they were given: changed keys
+# get new objects, so the checkpointed graph can tell which channels a step wrote.
 
 def node_summarize_resume(state: InterviewState) -> InterviewState:
     print("--- Node: Summarize Resume ---")
     text = state.get("resume_text", "")
+    key = shared_cache.make_key(SUMMARIZE_SYSTEM_PROMPT, text)
+
+    if RESUME_SUMMARY_MODE in ("local", "local_refine"):
+        summary, source = _local_summary(text, key)
+        intro = None  # the local summary takes milliseconds, nothing to overlap
+    else:
+        intro = _start_intro_question(state)
+        summary, source = ResumeSummary.model_validate_json(_llm_summary(text, key)), "llm"
     
-    summary = llm_client.generate_structured(
-        system_prompt=SUMMARIZE_SYSTEM_PROMPT,
-        user_prompt=SUMMARIZE_USER_PROMPT.format(resume_text=text),
-        response_model=ResumeSummary
-    )
-    
-    state["resume_summary"] = summary.model_dump()
+    update = {"resume_summary": summary.model_dump(), "resume_summary_source": source}
+    if intro is not None:
+        update.update(_finish_intro_question(state, *intro))
     # Init new fields if missing
-    state.setdefault("transcript", [])
-    state.setdefault("asked_main_questions", 0)
-    state.setdefault("followup_count_for_current", 0)
-    state.setdefault("max_followups_per_question", 1) # Cap at 1 follow-up per main question
-    state.setdefault("question_history", [])
-    state.setdefault("answer_history", [])
-    state.setdefault("eval_history", [])
-    return state
+    defaults = {
+        "transcript": [],
+        "asked_main_questions": 0,
+        "followup_count_for_current": 0,
+        "max_followups_per_question": 1, # Cap at 1 follow-up per main question
+        "question_history": [],
+        "answer_history": [],
+        "eval_history": [],
+    }
+    for key, value in defaults.items():
+        if state.get(key) is None:
+            update[key] = value
+    return {**state, **update}
+
+def _llm_summary(text: str, key: str) -> bytes:
+    """ResumeSummary JSON from the LLM; the same resume (e.g. a shared sample) is summarized once across workers."""
+    def summarize() -> bytes:
+        summary = llm_client.generate_structured(
+            system_prompt=SUMMARIZE_SYSTEM_PROMPT,
+            user_prompt=SUMMARIZE_USER_PROMPT.format(resume_text=text),
+            response_model=ResumeSummary,
+            cache_tag="summarize"
+        )
+        return summary.model_dump_json().encode("utf-8")
+
+    return _summary_flight.do(
+        key, lambda: shared_cache.get_or_compute("resume_summary", key, summarize, ttl=RESUME_SUMMARY_TTL_SEC)
+    )
+
+def _local_summary(text: str, key: str):
+    """
+    (summary, source) without waiting on the LLM. In local_refine mode an LLM summary that is
+    already cached is used as is; otherwise one is started in the background for _refined_summary.
+    """
+    if RESUME_SUMMARY_MODE == "local_refine":
+        cached = shared_cache.get("resume_summary", key)
+        if cached is not None:
+            return ResumeSummary.model_validate_json(cached), "llm"
+        if key not in _refinements:
+            ctx = contextvars.copy_context()
+            _refinements[key] = _refine_executor.submit(ctx.run, _llm_summary, text, key)
+    start = time.perf_counter()
+    summary = extract_summary(text)
+    metrics.observe("resume_summary.local_ms", (time.perf_counter() - start) * 1000)
+    return summary, "local"
+
+def _refined_summary(state: InterviewState) -> Dict[str, Any]:
+    """
+    State update swapping a local resume summary for the LLM one once the background refine
+    has finished (in this process, or in another worker via the shared cache); {} until then.
+    """
+    if state.get("resume_summary_source") != "local" or RESUME_SUMMARY_MODE != "local_refine":
+        return {}
+    key = shared_cache.make_key(SUMMARIZE_SYSTEM_PROMPT, state.get("resume_text", ""))
+    future = _refinements.get(key)
+    if future is not None and future.done():
+        _refinements.pop(key, None)
+        refined = None if future.exception() else future.result()
+    else:
+        refined = shared_cache.get("resume_summary", key)
+    if refined is None:
+        return {}
+    metrics.incr("resume_summary.refined")
+    return {"resume_summary": ResumeSummary.model_validate_json(refined).model_dump(), "resume_summary_source": "llm"}
+
+def _start_intro_question(state: InterviewState):
+    """
+    Starts generating question 1 next to the summary call when its topic is an intro one.
+    Returns (future, topic), or None when the first question has to wait for the summary.
+    """
+    if not PARALLEL_INTRO_QUESTION or state.get("asked_main_questions"):
+        return None
+    topic = topic_for(template_registry.for_state(state), 1)
+    if topic not in INTRO_TOPICS:
+        return None
+    metrics.incr("intro.parallel")
+    ctx = contextvars.copy_context()  # keeps the request's profile attached
+    future = _intro_executor.submit(
+        ctx.run, llm_client.generate_structured,
+        system_prompt=question_system_prompt(state["role"], state["difficulty"], topic),
+        user_prompt=GENERATE_QUESTION_USER_PROMPT.format(
+            resume_summary=str({"resume_excerpt": (state.get("resume_text") or "")[:INTRO_RESUME_CHARS]}),
+            transcript_history="",
+            question_index=1
+        ),
+        response_model=Question,
+        deadline_sec=QUESTION_DEADLINE_SEC
+    )
+    return future, topic
+
+def _finish_intro_question(state: InterviewState, future, topic: str) -> dict:
+    """State update handing the parallel intro question to node_generate_main_question."""
+    update = {}
+    try:
+        question = future.result()
+    except LLMDeadlineExceeded:
+        question = banked_question(state["role"], topic, state["difficulty"], 1, set())
+        update["degraded_steps"] = _degraded(state, "generate_main_question", "q_1", "question_bank", QUESTION_DEADLINE_SEC)
+    except Exception as e:
+        print(f"Parallel intro question failed, generating it after the summary: {e}")
+        return update
+    question.kind = "main"
+    update["prepared_question"] = question.model_dump(mode="json")
+    return update
+
+def _transcript_tail(state: InterviewState) -> str:
+    """Recent turns as prompt context (last 3ish QA pairs)."""
+    return "".join(f"{turn['role'].upper()}: {turn['text']}\n" for turn in (state.get("transcript") or [])[-6:])
+
+def _take_prepared(state: InterviewState, kind: str):
+    """
+    Returns (update, Question or None): the question a fused turn (or the parallel intro)
+    already wrote, if it is the kind the router chose. A pending one is cleared either way.
+    """
+    prepared = state.get("prepared_question")
+    if prepared is None:
+        return {}, None
+    if prepared.get("kind") != kind:
+        metrics.incr("prepared_question.discarded")
+        return {"prepared_question": None}, None
+    metrics.incr(f"prepared_question.used.{kind}")
+    return {"prepared_question": None}, Question(**prepared)
 
 def node_generate_main_question(state: InterviewState) -> InterviewState:
     print("--- Node: Generate Main Question ---")
     
-    # Prepare history for context
-    transcript_text = ""
-    for turn in state.get("transcript", [])[-6:]: # Last 3ish QA pairs
-        transcript_text += f"{turn['role'].upper()}: {turn['text']}\n"
-    
-    summary_dict = state.get("resume_summary", {})
     idx = state.get("asked_main_questions", 0) + 1
     
-    # Topic Logic
-    current_topic = "General/Intro"
-    if idx > 1: current_topic = "Technical Deep Dive"
-    if idx > 3: current_topic = "System Design / Architecture"
+    # Topic comes from the session's template schedule
+    current_topic = topic_for(template_registry.for_state(state), idx)
     
-    question = llm_client.generate_structured(
-        system_prompt=GENERATE_QUESTION_SYSTEM_PROMPT.format(
-            role=state["role"],
-            difficulty=state["difficulty"],
-            topic=current_topic
-        ),
-        user_prompt=GENERATE_QUESTION_USER_PROMPT.format(
-            resume_summary=str(summary_dict),
-            transcript_history=transcript_text,
-            question_index=idx
-        ),
-        response_model=Question
-    )
+    update, question = _take_prepared(state, "main")
+    update.update(_refined_summary(state))
+    if question is None:
+        try:
+            question = llm_client.generate_structured(
+                system_prompt=question_system_prompt(state["role"], state["difficulty"], current_topic),
+                user_prompt=GENERATE_QUESTION_USER_PROMPT.format(
+                    resume_summary=str(update.get("resume_summary", state.get("resume_summary", {}))),
+                    transcript_history=_transcript_tail(state),
+                    question_index=idx
+                ),
+                response_model=Question,
+                deadline_sec=QUESTION_DEADLINE_SEC
+            )
+        except LLMDeadlineExceeded:
+            asked = {q["text"] for q in state.get("question_history") or []}
+            question = banked_question(state["role"], current_topic, state["difficulty"], idx, asked)
+            update["degraded_steps"] = _degraded(state, "generate_main_question", f"q_{idx}", "question_bank", QUESTION_DEADLINE_SEC)
     
     question.id = f"q_{idx}"
     question.kind = "main"
     
-    state["current_question"] = question.model_dump()
-    state["asked_main_questions"] = idx
-    state["followup_count_for_current"] = 0 # Reset for new main question
-    state["current_step"] = idx # Sync legacy
-    
-    # Add to transcript
-    tr = state.get("transcript", [])
-    tr.append({"role": "interviewer", "text": question.text})
-    state["transcript"] = tr
-    
-    return state
+    current = question.model_dump(mode="json")
+    return {
+        **state,
+        **update,
+        "current_question": current,
+        "question_history": (state.get("question_history") or []) + [current],
+        "asked_main_questions": idx,
+        "followup_count_for_current": 0, # Reset for new main question
+        "current_step": idx, # Sync legacy
+        # Add to transcript
+        "transcript": (state.get("transcript") or []) + [{"role": "interviewer", "text": question.text}],
+    }
+
+def _usable_followup(last_eval: Dict, last_q: Dict) -> Optional[str]:
+    """The evaluator's followup_question, if it reads like a real question we haven't just asked."""
+    text = (last_eval.get("followup_question") or "").strip()
+    if len(text.split()) < 4 or text.lower() == (last_q.get("text") or "").strip().lower():
+        return None
+    return text
 
 def node_generate_followup(state: InterviewState) -> InterviewState:
     print("--- Node: Generate Follow-up ---")
+    start = time.perf_counter()
     
     # Context
     last_q = state.get("current_question")
     last_ans = state.get("answer_history", [])[-1]
     last_eval = state.get("eval_history", [])[-1]
     
-    question = llm_client.generate_structured(
-        system_prompt=GENERATE_FOLLOWUP_SYSTEM_PROMPT,
-        user_prompt=GENERATE_FOLLOWUP_USER_PROMPT.format(
-            original_question=last_q['text'],
-            last_answer=last_ans['text'],
-            feedback=last_eval['feedback_text'],
-            missing_points=str(last_eval.get('missing_points', []))
-        ),
-        response_model=Question
-    )
-    
     # ID logic: q_1_f1
     # ensure we don't nest IDs too deep q_1_f1_f1 if we allowed multiple chains
     parent_id = last_q['id'].split('_f')[0] 
     f_idx = state.get("followup_count_for_current", 0) + 1
+
+    update, question = _take_prepared(state, "followup")
+    suggested = _usable_followup(last_eval, last_q) if FOLLOWUP_FROM_EVALUATION else None
+    if question is not None:
+        source = "fused"
+    elif suggested:
+        # The evaluator already wrote the follow-up: no second LLM call
+        question = Question(
+            id="", text=suggested, topic=last_q['topic'],
+            expected_points=last_eval.get('missing_points') or [], difficulty=last_q.get('difficulty') or state["difficulty"]
+        )
+        source = "evaluation"
+        metrics.incr("followup.llm_calls_saved")
+    else:
+        try:
+            question = llm_client.generate_structured(
+                system_prompt=GENERATE_FOLLOWUP_SYSTEM_PROMPT,
+                user_prompt=GENERATE_FOLLOWUP_USER_PROMPT.format(
+                    original_question=last_q['text'],
+                    last_answer=last_ans['text'],
+                    feedback=last_eval['feedback_text'],
+                    missing_points=str(last_eval.get('missing_points', []))
+                ),
+                response_model=Question,
+                deadline_sec=QUESTION_DEADLINE_SEC
+            )
+            source = "llm"
+        except LLMDeadlineExceeded:
+            question = Question(
+                id="", text=fallback_followup_text(last_eval), topic=last_q['topic'],
+                expected_points=last_eval.get('missing_points') or [], difficulty=last_q.get('difficulty') or state["difficulty"]
+            )
+            source = "fallback"
+            update["degraded_steps"] = _degraded(state, "generate_followup", f"{parent_id}_f{f_idx}", "evaluation_followup", QUESTION_DEADLINE_SEC)
+
     question.id = f"{parent_id}_f{f_idx}"
     question.kind = "followup"
     question.topic = last_q['topic']
+    metrics.incr(f"followup.source.{source}")
+    metrics.observe(f"followup.latency_ms.{source}", (time.perf_counter() - start) * 1000)
     
-    state["current_question"] = question.model_dump()
-    state["followup_count_for_current"] = f_idx
-    
-    # Add to transcript
-    tr = state.get("transcript", [])
-    tr.append({"role": "interviewer", "text": question.text})
-    state["transcript"] = tr
-    
-    return state
+    current = question.model_dump(mode="json")
+    return {
+        **state,
+        **update,
+        "current_question": current,
+        "question_history": (state.get("question_history") or []) + [current],
+        "followup_count_for_current": f_idx,
+        # Add to transcript
+        "transcript": (state.get("transcript") or []) + [{"role": "interviewer", "text": question.text}],
+    }
 
 def node_evaluate_answer(state: InterviewState) -> InterviewState:
     print("--- Node: Evaluate Answer ---")
@@ -148,50 +357,150 @@ def node_evaluate_answer(state: InterviewState) -> InterviewState:
     # The answer should have been injected into state['answer_history'] mostly recently 
     last_answer = state["answer_history"][-1]
     
+    update = {}
     # Add candidate answer to transcript if not already last item
-    transcript = state.get("transcript", [])
+    transcript = state.get("transcript") or []
     if not transcript or transcript[-1]['role'] != "candidate":
-         transcript.append({"role": "candidate", "text": last_answer['text']})
-         state["transcript"] = transcript
-    else:
-         # Update text if it was placeholder? (Unlikely)
-         pass
+         update["transcript"] = transcript + [{"role": "candidate", "text": last_answer['text']}]
 
-    evaluation = llm_client.generate_structured(
-        system_prompt=EVALUATE_ANSWER_SYSTEM_PROMPT,
-        user_prompt=EVALUATE_ANSWER_USER_PROMPT.format(
-            question=cur_q["text"],
-            expected_points=str(cur_q["expected_points"]),
-            answer=last_answer["text"]
-        ),
-        response_model=Evaluation
-    )
+    allowed = _allowed_next_kinds(state) if FUSED_TURNS else []
+    try:
+        if allowed:
+            evaluation, prepared = _grade_and_ask(state, cur_q, last_answer["text"], allowed)
+            update["prepared_question"] = prepared
+        else:
+            evaluation = _grade(cur_q, last_answer["text"], EVAL_DEADLINE_SEC)
+    except LLMDeadlineExceeded as e:
+        evaluation = heuristic_evaluation(cur_q, last_answer["text"])
+        # The full grade finishes in the background; a later step swaps it in (deferred_evaluations).
+        # The call that missed the deadline is still running, so it is adopted, not repeated.
+        key = evaluation_key(cur_q, last_answer["text"])
+        if e.pending is not None:
+            finalizer.adopt(key, map_future(e.pending, lambda turn: turn.evaluation) if allowed else e.pending)
+        else:
+            finalizer.submit(key, lambda: _grade(cur_q, last_answer["text"]))
+        update["degraded_steps"] = _degraded(state, "evaluate_answer", cur_q["id"], "heuristic_evaluation", EVAL_DEADLINE_SEC)
     
     # Store
     evaluation.question_id = cur_q["id"]
-    state.setdefault("eval_history", []).append(evaluation.model_dump())
+    update["eval_history"] = (state.get("eval_history") or []) + [evaluation.model_dump()]
+
+    deferred = _collect_deferred(state)
+    if deferred is not None:
+        update["deferred_evaluations"] = deferred
     
-    return state
+    return {**state, **update}
+
+def _grade(question: Dict, answer_text: str, deadline_sec: Optional[float] = None) -> Evaluation:
+    return llm_client.generate_structured(
+        system_prompt=EVALUATE_ANSWER_SYSTEM_PROMPT,
+        user_prompt=EVALUATE_ANSWER_USER_PROMPT.format(
+            question=question["text"],
+            expected_points=str(question["expected_points"]),
+            answer=answer_text
+        ),
+        response_model=Evaluation,
+        deadline_sec=deadline_sec
+    )
+
+def _allowed_next_kinds(state: InterviewState) -> List[str]:
+    """Question kinds the router could still pick after this answer (decide_next_step's limits)."""
+    allowed = []
+    if state.get("followup_count_for_current", 0) < state.get("max_followups_per_question", 1):
+        allowed.append("followup")
+    if state.get("asked_main_questions", 0) < state.get("total_questions", 5):
+        allowed.append("main")
+    return allowed
+
+def _grade_and_ask(state: InterviewState, question: Dict, answer_text: str, allowed: List[str]):
+    """
+    One call for the evaluation and the next question (FUSED_TURNS). Returns the evaluation
+    and the serialized next question, which decide_next_step is sure to route to; None if
+    the model picked a kind that isn't allowed, or the interview moves on to the report.
+    """
+    idx = state.get("asked_main_questions", 0) + 1
+    metrics.incr("fused.turns")
+    turn = llm_client.generate_structured(
+        system_prompt=FUSED_TURN_SYSTEM_PROMPT,
+        user_prompt=FUSED_TURN_USER_PROMPT.format(
+            role=state["role"],
+            difficulty=state["difficulty"],
+            resume_summary=str(state.get("resume_summary", {})),
+            transcript_history=_transcript_tail(state),
+            question=question["text"],
+            expected_points=str(question["expected_points"]),
+            answer=answer_text,
+            allowed_kinds=", ".join(allowed),
+            next_topic=topic_for(template_registry.for_state(state), idx),
+            question_index=idx
+        ),
+        response_model=TurnResult,
+        deadline_sec=EVAL_DEADLINE_SEC
+    )
+    routed = _NEXT_KIND.get(_next_step(state, turn.evaluation.followup_needed))
+    if routed is None or turn.next_kind not in allowed:
+        metrics.incr("prepared_question.discarded")
+        return turn.evaluation, None
+    if turn.next_kind != routed:
+        # followup_needed and next_kind disagree: follow the question the model wrote, so it is used
+        turn.evaluation.followup_needed = turn.next_kind == "followup"
+    turn.next_question.kind = turn.next_kind
+    return turn.evaluation, turn.next_question.model_dump(mode="json")
+
+def _collect_deferred(state: InterviewState, wait: Optional[float] = None) -> Optional[Dict[str, Dict]]:
+    """
+    Picks up background grades for provisional evaluations. wait=None only takes finished
+    ones; otherwise waits up to `wait` seconds in total, starting any this process never ran.
+    Returns the updated deferred_evaluations, or None if nothing new arrived.
+    """
+    until = time.monotonic() + wait if wait is not None else None
+    deferred = dict(state.get("deferred_evaluations") or {})
+    questions = {q["id"]: q for q in state.get("question_history") or [] if q}
+    answers = {a["question_id"]: a["text"] for a in state.get("answer_history") or []}
+    found = False
+    for e in state.get("eval_history") or []:
+        qid = e.get("question_id")
+        if not e.get("provisional") or qid in deferred or qid not in questions or qid not in answers:
+            continue
+        question, answer_text = questions[qid], answers[qid]
+        key = evaluation_key(question, answer_text)
+        if wait is None:
+            evaluation = finalizer.ready(key)
+        else:
+            remaining = max(0.0, until - time.monotonic())
+            evaluation = finalizer.result(key, lambda q=question, a=answer_text: _grade(q, a), timeout=remaining)
+        if evaluation is not None:
+            evaluation.question_id = qid
+            deferred[qid] = evaluation.model_dump()
+            found = True
+    return deferred if found else None
 
 def node_generate_report_json(state: InterviewState) -> InterviewState:
     print("--- Node: Generate Report ---")
     
+    # Provisional grades get their full evaluation before the session is closed out
+    update = {}
+    deferred = _collect_deferred(state, wait=EVAL_FINALIZE_WAIT_SEC)
+    if deferred is not None:
+        update["deferred_evaluations"] = deferred
+
     # Re-build complete history from transcript for the report
     history_text = "\n".join([f"{t['role'].upper()}: {t['text']}" for t in state.get("transcript", [])])
     
-    report = llm_client.generate_structured(
-        system_prompt=REPORT_SYSTEM_PROMPT,
-        user_prompt=REPORT_USER_PROMPT.format(
-            role=state["role"],
-            difficulty=state["difficulty"],
-            history_summary=history_text
-        ),
-        response_model=FinalReport
+    user_prompt = REPORT_USER_PROMPT.format(
+        role=state["role"],
+        difficulty=state["difficulty"],
+        history_summary=history_text
     )
+    # A double-clicked "end" runs this node twice at once: the second run waits for the first
+    report = _report_flight.do(shared_cache.make_key(REPORT_SYSTEM_PROMPT, user_prompt), lambda: llm_client.generate_structured(
+        system_prompt=REPORT_SYSTEM_PROMPT,
+        user_prompt=user_prompt,
+        response_model=FinalReport,
+        cache_tag="report"
+    ))
     
-    state["final_report"] = report.model_dump()
-    state["is_finished"] = True
-    return state
+    return {**state, **update, "final_report": report.model_dump(), "is_finished": True, "prepared_question": None}
 
 # --- Router ---
 
@@ -203,13 +512,17 @@ def decide_next_step(state: InterviewState) -> Literal["generate_followup", "gen
         
     # 2. Check last evaluation for follow-up
     evals = state.get("eval_history", [])
-    if evals:
-        last_eval = evals[-1]
-        
-        # Check if we should followup
-        if last_eval.get("followup_needed") and \
-           state.get("followup_count_for_current", 0) < state.get("max_followups_per_question", 1):
-               return "generate_followup"
+    return _next_step(state, bool(evals and evals[-1].get("followup_needed")))
+
+# Question kind of each step after an answer (the report has none)
+_NEXT_KIND = {"generate_followup": "followup", "generate_main_question": "main"}
+
+def _next_step(state: InterviewState, followup_needed: bool) -> str:
+    """The step after an evaluation; shared by decide_next_step and the fused turn."""
+    # Check if we should followup
+    if followup_needed and \
+       state.get("followup_count_for_current", 0) < state.get("max_followups_per_question", 1):
+           return "generate_followup"
     
     # 3. Check if we reached total MAIN questions
     if state.get("asked_main_questions", 0) >= state.get("total_questions", 5):
@@ -220,6 +533,7 @@ def decide_next_step(state: InterviewState) -> Literal["generate_followup", "gen
 # --- Entry Router ---
 def node_router_start(state: InterviewState) -> Literal["summarize_resume", "generate_report", "evaluate_answer", "generate_main_question", "generate_followup"]:
     print("--- Node: Router Start ---")
+    from langgraph.graph import END
     
     # 1. New Session?
     if not state.get("resume_summary"):
@@ -253,53 +567,168 @@ def node_router_start(state: InterviewState) -> Literal["summarize_resume", "gen
     return decide_next_step(state)
 
 # --- Graph Construction ---
+# langgraph is only imported when the graph is first built (startup warm-up or first request),
+# so importing this module for its nodes/state stays cheap.
 
-workflow = StateGraph(InterviewState)
-
-# Add nodes
-workflow.add_node("router_start", node_router_start) # Virtual node acting as router? 
-# LangGraph nodes must return state updates OR we use conditional_entry_point.
-# Let's use set_conditional_entry_point instead of a node if possible.
-# Actually, LangGraph supports conditional entry points directly.
-
-workflow.add_node("summarize_resume", node_summarize_resume)
-workflow.add_node("generate_main_question", node_generate_main_question)
-workflow.add_node("generate_followup", node_generate_followup)
-workflow.add_node("evaluate_answer", node_evaluate_answer)
-workflow.add_node("generate_report", node_generate_report_json)
-
-# Entry point logic
-workflow.set_conditional_entry_point(
-    node_router_start,
-    {
-        "summarize_resume": "summarize_resume",
-        "generate_report": "generate_report",
-        "evaluate_answer": "evaluate_answer",
-        "generate_main_question": "generate_main_question",
-        "generate_followup": "generate_followup",
-        END: END
-    }
-)
+def build_workflow():
+    from langgraph.graph import StateGraph, END
 
-# Edges
-workflow.add_edge("summarize_resume", "generate_main_question")
-
-# Conditional Routing after Evaluate
-workflow.add_conditional_edges(
-    "evaluate_answer",
-    decide_next_step,
-    {
-        "generate_followup": "generate_followup",
-        "generate_main_question": "generate_main_question",
-        "generate_report": "generate_report"
-    }
-)
+    workflow = StateGraph(InterviewState)
+
+    # Add nodes
+    workflow.add_node("router_start", node_router_start) # Virtual node acting as router? 
+    # LangGraph nodes must return state updates OR we use conditional_entry_point.
+    # Let's use set_conditional_entry_point instead of a node if possible.
+    # Actually, LangGraph supports conditional entry points directly.
+
+    workflow.add_node("summarize_resume", node_summarize_resume)
+    workflow.add_node("generate_main_question", node_generate_main_question)
+    workflow.add_node("generate_followup", node_generate_followup)
+    workflow.add_node("evaluate_answer", node_evaluate_answer)
+    workflow.add_node("generate_report", node_generate_report_json)
+
+    # Entry point logic
+    workflow.set_conditional_entry_point(
+        node_router_start,
+        {
+            "summarize_resume": "summarize_resume",
+            "generate_report": "generate_report",
+            "evaluate_answer": "evaluate_answer",
+            "generate_main_question": "generate_main_question",
+            "generate_followup": "generate_followup",
+            END: END
+        }
+    )
+
+    # Edges
+    workflow.add_edge("summarize_resume", "generate_main_question")
+
+    # Conditional Routing after Evaluate
+    workflow.add_conditional_edges(
+        "evaluate_answer",
+        decide_next_step,
+        {
+            "generate_followup": "generate_followup",
+            "generate_main_question": "generate_main_question",
+            "generate_report": "generate_report"
+        }
+    )
+
+    # New questions go to END (to wait for user input)
+    workflow.add_edge("generate_main_question", END)
+    workflow.add_edge("generate_followup", END)
+
+    # Report goes to END
+    workflow.add_edge("generate_report", END)
+    return workflow
+
+# --- Checkpointed Graph (GRAPH_CHECKPOINT=sql) ---
+# State lives in the checkpointer (thread_id = session id). The graph pauses in
+# await_answer with an interrupt and is resumed with the candidate's reply, so no
+# re-entry router is needed.
+
+# Histories only ever grow, so in the checkpointed graph they are delta channels:
+# a step stores the items it appended, and the list is rebuilt by replaying those
+# writes from the last full snapshot.
+APPEND_ONLY_KEYS = ("question_history", "answer_history", "eval_history", "transcript")
+CHECKPOINT_SNAPSHOT_EVERY = int(os.getenv("GRAPH_CHECKPOINT_SNAPSHOT_EVERY", "20"))
+
+def _append(current: list, batches: list) -> list:
+    return list(current) + [item for batch in batches for item in batch]
+
+def checkpointed_state_schema():
+    from langgraph.channels import DeltaChannel
+
+    fields = dict(InterviewState.__annotations__)
+    for key in APPEND_ONLY_KEYS:
+        fields[key] = Annotated[List[Dict], DeltaChannel(_append, snapshot_frequency=CHECKPOINT_SNAPSHOT_EVERY)]
+    return TypedDict("CheckpointedInterviewState", fields)
+
+def node_await_answer(state: InterviewState) -> dict:
+    from langgraph.types import interrupt
+
+    cur_q = state.get("current_question") or {}
+    # Resume value: {"type": "answer", "text": ...} or {"type": "end"}
+    reply = interrupt({"question_id": cur_q.get("id")})
+    if reply.get("type") == "end":
+        return {**state, "is_finished": True}
+    answer = {"question_id": cur_q.get("id"), "text": reply.get("text", "")}
+    return {**state, "answer_history": (state.get("answer_history") or []) + [answer]}
+
+def route_after_answer(state: InterviewState) -> Literal["evaluate_answer", "generate_report"]:
+    return "generate_report" if state.get("is_finished") else "evaluate_answer"
+
+def changed_only(node):
+    """
+    Wraps a node so it returns only what it changed: untouched keys are dropped (every
+    write bumps a channel's version) and histories are reduced to their new items.
+    """
+    def wrapper(state: InterviewState) -> dict:
+        result = node(state)
+        update = {}
+        for key, value in result.items():
+            if key in state and state[key] is value:
+                continue
+            if key in APPEND_ONLY_KEYS:
+                value = value[len(state.get(key) or []):]
+            update[key] = value
+        return update
+    wrapper.__name__ = node.__name__
+    return wrapper
+
+def build_checkpointed_workflow():
+    from langgraph.graph import StateGraph, START, END
+
+    workflow = StateGraph(checkpointed_state_schema())
+    workflow.add_node("summarize_resume", changed_only(node_summarize_resume))
+    workflow.add_node("generate_main_question", changed_only(node_generate_main_question))
+    workflow.add_node("generate_followup", changed_only(node_generate_followup))
+    workflow.add_node("await_answer", changed_only(node_await_answer))
+    workflow.add_node("evaluate_answer", changed_only(node_evaluate_answer))
+    workflow.add_node("generate_report", changed_only(node_generate_report_json))
+
+    workflow.add_edge(START, "summarize_resume")
+    workflow.add_edge("summarize_resume", "generate_main_question")
+    workflow.add_edge("generate_main_question", "await_answer")
+    workflow.add_edge("generate_followup", "await_answer")
+    workflow.add_conditional_edges(
+        "await_answer",
+        route_after_answer,
+        {"evaluate_answer": "evaluate_answer", "generate_report": "generate_report"}
+    )
+    workflow.add_conditional_edges(
+        "evaluate_answer",
+        decide_next_step,
+        {
+            "generate_followup": "generate_followup",
+            "generate_main_question": "generate_main_question",
+            "generate_report": "generate_report"
+        }
+    )
+    workflow.add_edge("generate_report", END)
+    return workflow
 
-# New questions go to END (to wait for user input)
-workflow.add_edge("generate_main_question", END)
-workflow.add_edge("generate_followup", END)
+_compiled = {}
+_compile_lock = threading.Lock()
 
-# Report goes to END
-workflow.add_edge("generate_report", END)
+def get_graph(checkpointed: bool = False):
+    """Compiled interview graph, built once on first use."""
+    graph = _compiled.get(checkpointed)
+    if graph is None:
+        with _compile_lock:
+            if checkpointed not in _compiled:
+                if checkpointed:
+                    from .checkpoint import SQLCheckpointSaver
+                    _compiled[True] = build_checkpointed_workflow().compile(checkpointer=SQLCheckpointSaver())
+                else:
+                    _compiled[False] = build_workflow().compile()
+            graph = _compiled[checkpointed]
+    return graph
 
-app = workflow.compile()
+def __getattr__(name):
+    # `workflow` and `app` used to be built at import time; keep them importable, lazily.
+    if name == "workflow":
+        return build_workflow()
+    if name == "app":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+import os
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from .models import InterviewTemplate, RoleEnum, DifficultyEnum, Question, ResumeSummary, Evaluation, FinalReport
+from .prompts.templates import (
+    GENERATE_QUESTION_SYSTEM_PROMPT, SUMMARIZE_SYSTEM_PROMPT, GENERATE_FOLLOWUP_SYSTEM_PROMPT,
+    EVALUATE_ANSWER_SYSTEM_PROMPT, REPORT_SYSTEM_PROMPT
+)
+
+# Schedule the question node used before templates existed: intro, two deep dives, then design
+DEFAULT_TOPIC_SCHEDULE = ["General/Intro", "Technical Deep Dive", "Technical Deep Dive", "System Design / Architecture"]
+
+BUILTIN_TEMPLATES = [
+    InterviewTemplate(
+        id=f"{role.name.lower()}-{difficulty.name.lower()}",
+        name=f"{role.value} ({difficulty.value})",
+        role=role, difficulty=difficulty,
+        topic_schedule=DEFAULT_TOPIC_SCHEDULE,
+    )
+    for role in RoleEnum for difficulty in DifficultyEnum
+] + [
+    InterviewTemplate(
+        id="sde1-system-design", name="SDE1 System Design Focus",
+        role=RoleEnum.SDE1, difficulty=DifficultyEnum.HARD, num_questions=4,
+        topic_schedule=["General/Intro", "System Design / Architecture", "Scalability & Reliability", "Trade-offs"],
+    ),
+    InterviewTemplate(
+        id="pm-product-sense", name="Product Manager: Product Sense",
+        role=RoleEnum.PRODUCT_MANAGER, difficulty=DifficultyEnum.MEDIUM, num_questions=4,
+        topic_schedule=["General/Intro", "Product Sense", "Metrics & Prioritization", "Execution & Stakeholders"],
+    ),
+]
+
+# System prompts that don't depend on the template
+STATIC_PROMPTS = [
+    (SUMMARIZE_SYSTEM_PROMPT, ResumeSummary),
+    (GENERATE_FOLLOWUP_SYSTEM_PROMPT, Question),
+    (EVALUATE_ANSWER_SYSTEM_PROMPT, Evaluation),
+    (REPORT_SYSTEM_PROMPT, FinalReport),
+]
+
+
+def topic_for(template: InterviewTemplate, question_index: int) -> str:
+    """Topic of the 1-based main question; the last scheduled topic repeats."""
+    schedule = template.topic_schedule
+    return schedule[min(question_index, len(schedule)) - 1]
+
+
+@lru_cache(maxsize=256)
+def question_system_prompt(role: str, difficulty: str, topic: str) -> str:
+    """
+    The question node's system prompt for one (role, difficulty, topic). Rendered once
+    and returned as the same string object afterwards, so every turn on that topic sends a
+    byte-identical prefix (what provider-side prompt caching keys on).
+    """
+    return GENERATE_QUESTION_SYSTEM_PROMPT.format(role=role, difficulty=difficulty, topic=topic)
+
+
+class TemplateRegistry:
+    """
+    Built-in templates plus any from INTERVIEW_TEMPLATES_FILE (a JSON list of
+    InterviewTemplate objects; an entry with a built-in id replaces it).
+    """
+
+    def __init__(self, templates: List[InterviewTemplate]):
+        self._templates: Dict[str, InterviewTemplate] = {t.id: t for t in templates}
+        self._warm_lock = threading.Lock()
+        self._warmed = False
+
+    @classmethod
+    def from_env(cls) -> "TemplateRegistry":
+        templates = list(BUILTIN_TEMPLATES)
+        path = os.getenv("INTERVIEW_TEMPLATES_FILE")
+        if path:
+            try:
+                with open(path) as f:
+                    templates += [InterviewTemplate.model_validate(t) for t in json.load(f)]
+            except Exception as e:
+                print(f"Could not load interview templates from {path}: {e}")
+        return cls(templates)
+
+    def all(self) -> List[InterviewTemplate]:
+        return list(self._templates.values())
+
+    def get(self, template_id: Optional[str]) -> Optional[InterviewTemplate]:
+        return self._templates.get(template_id) if template_id else None
+
+    def default_for(self, role: str, difficulty: str) -> InterviewTemplate:
+        """Template for sessions that didn't pick one (including sessions from before templates)."""
+        role, difficulty = RoleEnum(role), DifficultyEnum(difficulty)
+        return self._templates.get(f"{role.name.lower()}-{difficulty.name.lower()}") or InterviewTemplate(
+            id="default", name="Default", role=role, difficulty=difficulty, topic_schedule=DEFAULT_TOPIC_SCHEDULE
+        )
+
+    def for_state(self, state: dict) -> InterviewTemplate:
+        return self.get(state.get("template_id")) or self.default_for(state["role"], state["difficulty"])
+
+    def warm_up(self):
+        """Renders every system prompt prefix (with its schema suffix) ahead of the first session."""
+        from .llm import system_prompt_with_schema
+
+        with self._warm_lock:
+            if self._warmed:
+                return
+            for prompt, response_model in STATIC_PROMPTS:
+                system_prompt_with_schema(prompt, response_model)
+            for template in self._templates.values():
+                for topic in set(template.topic_schedule):
+                    prompt = question_system_prompt(template.role.value, template.difficulty.value, topic)
+                    system_prompt_with_schema(prompt, Question)
+            self._warmed = True
+
+
+template_registry = TemplateRegistry.from_env()
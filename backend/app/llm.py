@@ -1,12 +1,19 @@
 import os
-from typing import Type, TypeVar, Optional, Any
-from pydantic import BaseModel, ValidationError
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+import time
+import threading
+import contextvars
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeout
+from typing import Callable, Type, TypeVar, Optional, List, Tuple
+from pydantic import BaseModel
 from dotenv import load_dotenv
 import pathlib
 
+from .providers import Provider, CircuitBreaker, ProviderHealth, build_providers_from_env
+from .llm_cache import ResponseCache, CacheMissError
+from .metrics import metrics
+from .profiling import span
+
 # Try loading from current dir, then parent
 load_dotenv()
 env_path = pathlib.Path(__file__).parent.parent.parent / ".env"
@@ -15,126 +22,369 @@ if env_path.exists():
 
 T = TypeVar("T", bound=BaseModel)
 
+
+class LLMUnavailableError(Exception):
+    """No provider is configured or every provider's circuit is open."""
+
+
+class LLMDeadlineExceeded(Exception):
+    """
+    The call did not finish within the caller's deadline. The provider request keeps
+    running in the background; pending is a Future of its parsed result (None if no
+    request was started), so a caller can still use it instead of calling again.
+    """
+
+    def __init__(self, message: str, pending: Optional[Future] = None):
+        super().__init__(message)
+        self.pending = pending
+
+
+def map_future(future: Future, fn: Callable) -> Future:
+    """A Future of fn(future's result), completed in the thread that completes future."""
+    mapped = Future()
+
+    def done(source: Future):
+        try:
+            mapped.set_result(fn(source.result()))
+        except Exception as e:
+            mapped.set_exception(e)
+
+    future.add_done_callback(done)
+    return mapped
+
+
+class ProviderSlot:
+    """A provider plus its health stats and circuit breaker."""
+
+    def __init__(self, provider: Provider, breaker: CircuitBreaker):
+        self.provider = provider
+        self.breaker = breaker
+        self.health = ProviderHealth()
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+
 class LLMClient:
-    def __init__(self):
-        # Determine provider
-        self.provider = os.getenv("LLM_PROVIDER", "google").lower()
-        
-        if self.provider == "google":
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                print("CRITICAL WARNING: GOOGLE_API_KEY not found. LLM features will not work.")
-                return
-                
+    """
+    Multi-provider client. Providers are tried in order; each one has its own
+    circuit breaker so a dead provider is skipped instead of stalling every turn.
+
+    With hedging enabled, if the primary has not answered by its p95 latency
+    (or LLM_HEDGE_DELAY_SEC before enough samples exist), the same request is
+    sent to the next healthy provider and the first answer wins.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[List[Provider]] = None,
+        hedge: Optional[bool] = None,
+        hedge_delay: Optional[float] = None,
+        breaker_threshold: Optional[int] = None,
+        breaker_reset: Optional[float] = None,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if hedge is None:
+            hedge = os.getenv("LLM_HEDGE", "false").lower() in ("1", "true", "yes")
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay if hedge_delay is not None else float(os.getenv("LLM_HEDGE_DELAY_SEC", "5"))
+
+        self._breaker_threshold = breaker_threshold or int(os.getenv("LLM_BREAKER_THRESHOLD", "3"))
+        self._breaker_reset = breaker_reset if breaker_reset is not None else float(os.getenv("LLM_BREAKER_RESET_SEC", "30"))
+        # Provider SDKs are imported/constructed on first use, not at module import
+        self._providers = providers
+        self._slots: Optional[List[ProviderSlot]] = None
+        self._slots_lock = threading.Lock()
+
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+
+        # Caps in-flight provider requests across all callers (graph nodes, batch jobs, ...)
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self._limiter = threading.BoundedSemaphore(self.max_concurrency)
+
+        # Only used for hedged requests; sequential failover runs on the caller thread.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Runs calls that have a deadline, so the caller can stop waiting
+        self._deadline_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def slots(self) -> List[ProviderSlot]:
+        if self._slots is None:
+            with self._slots_lock:
+                if self._slots is None:
+                    providers = self._providers if self._providers is not None else build_providers_from_env()
+                    self._slots = [
+                        ProviderSlot(p, CircuitBreaker(self._breaker_threshold, self._breaker_reset))
+                        for p in providers
+                    ]
+                    if not self._slots:
+                        print("CRITICAL WARNING: no LLM provider configured. LLM features will not work.")
+        return self._slots
+
+    def warm_up(self):
+        """Builds providers and lets each open its connection ahead of the first request."""
+        for slot in self.slots:
             try:
-                self.llm = ChatGoogleGenerativeAI(
-                    model="gemini-flash-latest",
-                    google_api_key=api_key,
-                    temperature=0.7,
-                    convert_system_message_to_human=True
-                )
+                slot.provider.warm_up()
             except Exception as e:
-                print(f"Error initializing Gemini: {e}")
-                
-        elif self.provider == "ollama":
-            # Local Ollama support
-            # Requires `ollama pull llama3` (or other model) to be run locally first
-            model_name = os.getenv("OLLAMA_MODEL", "llama3")
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            
+                print(f"Warm-up failed for {slot.name}: {e}")
+
+    @property
+    def provider(self) -> Optional[str]:
+        """Name of the primary provider (kept for backwards compatibility)."""
+        return self.slots[0].name if self.slots else None
+
+    def health(self) -> List[dict]:
+        out = []
+        for slot in self.slots:
+            info = slot.health.snapshot()
+            info.update({
+                "name": slot.name,
+                "model": slot.provider.model,
+                "circuit": slot.breaker.state,
+                "p95_latency_sec": slot.health.p95(),
+            })
+            out.append(info)
+        return out
+
+    # --- Provider Calls ---
+
+    def _call(self, slot: ProviderSlot, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        # One limiter slot per provider request, so a hedge (and the loser still running
+        # after the winner returned) counts against LLM_MAX_CONCURRENCY too
+        with self._limiter:
+            return self._timed_call(slot, system_prompt, user_prompt, response_model)
+
+    def _timed_call(self, slot: ProviderSlot, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        start = time.perf_counter()
+        metrics.incr(f"llm.calls.{slot.name}")
+        try:
+            text = slot.provider.complete(system_prompt, user_prompt, response_model)
+        except Exception as e:
+            slot.health.record_failure(e)
+            slot.breaker.record_failure()
+            metrics.incr(f"llm.failures.{slot.name}")
+            raise
+        elapsed = time.perf_counter() - start
+        slot.health.record_success(elapsed)
+        slot.breaker.record_success()
+        metrics.observe(f"llm.latency.{slot.name}", elapsed)
+        return text
+
+    def _next_slot(self, remaining: List[ProviderSlot]) -> Optional[ProviderSlot]:
+        while remaining:
+            slot = remaining.pop(0)
+            if slot.breaker.allow():
+                return slot
+            metrics.incr(f"llm.skipped_open.{slot.name}")
+        return None
+
+    def _hedge_delay_for(self, slot: ProviderSlot) -> float:
+        p95 = slot.health.p95()
+        return p95 if p95 is not None else self.hedge_delay
+
+    def _complete(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Tuple[str, ProviderSlot]:
+        """Returns (raw text, slot that answered), failing over across providers."""
+        if not self.slots:
+            raise LLMUnavailableError("LLM Client not initialized. Check LLM_PROVIDERS / GOOGLE_API_KEY.")
+
+        remaining = list(self.slots)
+        last_error: Optional[Exception] = None
+        attempted = False
+
+        while True:
+            slot = self._next_slot(remaining)
+            if slot is None:
+                break
+            if attempted:
+                metrics.incr("llm.failover")
+            attempted = True
+
+            if not self.hedge or not remaining:
+                try:
+                    return self._call(slot, system_prompt, user_prompt, response_model), slot
+                except Exception as e:
+                    print(f"LLM provider {slot.name} failed: {e}")
+                    last_error = e
+                    continue
+
+            try:
+                return self._hedged(slot, remaining, system_prompt, user_prompt, response_model)
+            except Exception as e:
+                last_error = e
+
+        if not attempted:
+            raise LLMUnavailableError("All LLM providers are unavailable (circuits open).")
+        raise last_error or LLMUnavailableError("All LLM providers failed.")
+
+    def _hedged(self, primary: ProviderSlot, remaining: List[ProviderSlot], system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Tuple[str, ProviderSlot]:
+        if self._executor is None:
+            with self._slots_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=int(os.getenv("LLM_HEDGE_WORKERS", "8")), thread_name_prefix="llm-hedge"
+                    )
+
+        futures = {self._executor.submit(self._call, primary, system_prompt, user_prompt, response_model): primary}
+        done, _ = wait(futures, timeout=self._hedge_delay_for(primary))
+
+        if not done:
+            secondary = self._next_slot(remaining)
+            if secondary is not None:
+                metrics.incr("llm.hedged")
+                futures[self._executor.submit(self._call, secondary, system_prompt, user_prompt, response_model)] = secondary
+
+        last_error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    text = fut.result()
+                except Exception as e:
+                    print(f"LLM provider {futures[fut].name} failed: {e}")
+                    last_error = e
+                    continue
+                if len(futures) > 1:
+                    metrics.incr(f"llm.hedge_won.{futures[fut].name}")
+                # The slower request keeps running in the background; its result is dropped.
+                return text, futures[fut]
+        raise last_error or LLMUnavailableError("Hedged request failed")
+
+    def _complete_by(self, deadline: Optional[float], system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Tuple[str, ProviderSlot]:
+        """
+        _complete with an optional absolute deadline (time.monotonic()). Past it, the caller
+        gets LLMDeadlineExceeded carrying the in-flight request; it finishes in the
+        background, still holding its concurrency slot.
+        """
+        if deadline is None:
+            return self._complete(system_prompt, user_prompt, response_model)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMDeadlineExceeded(f"{response_model.__name__}: deadline passed before the call started")
+        if self._deadline_executor is None:
+            with self._slots_lock:
+                if self._deadline_executor is None:
+                    self._deadline_executor = ThreadPoolExecutor(
+                        max_workers=int(os.getenv("LLM_DEADLINE_WORKERS", "32")), thread_name_prefix="llm-deadline"
+                    )
+        ctx = contextvars.copy_context()  # keeps the request's profile attached
+        future = self._deadline_executor.submit(ctx.run, self._complete, system_prompt, user_prompt, response_model)
+        try:
+            return future.result(timeout=remaining)
+        except FuturesTimeout:
+            metrics.incr(f"llm.deadline_exceeded.{response_model.__name__}")
+            raise LLMDeadlineExceeded(f"{response_model.__name__}: no answer within the deadline", pending=future)
+
+    # --- Structured Output ---
+
+    def _cache_key(self, slot: ProviderSlot, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        p = slot.provider
+        return ResponseCache.make_key(p.name, p.model, p.temperature, response_model, system_prompt, user_prompt)
+
+    def _cached(self, parser, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]):
+        for slot in self.slots:
+            text = self.cache.get(self._cache_key(slot, system_prompt, user_prompt, response_model))
+            if text is None:
+                continue
             try:
-                from langchain_ollama import ChatOllama
-                self.llm = ChatOllama(
-                    model=model_name,
-                    base_url=base_url,
-                    temperature=0.7
-                )
-                print(f"Initialized Ollama with model: {model_name}")
-            except ImportError:
-                print("Error: langchain-ollama not installed. Run `pip install langchain-ollama`.")
+                return parser.parse(text)
             except Exception as e:
-                print(f"Error initializing Ollama: {e}")
-        
-        else:
-            print(f"Unknown LLM_PROVIDER: {self.provider}. specific 'google' or 'ollama'.")
+                print(f"Ignoring unparseable cache entry: {e}")
+        return None
 
     def generate_structured(
-        self, 
-        system_prompt: str, 
-        user_prompt: str, 
+        self,
+        system_prompt: str,
+        user_prompt: str,
         response_model: Type[T],
-        retries: int = 2
+        retries: int = 2,
+        cache_tag: Optional[str] = None,
+        deadline_sec: Optional[float] = None
     ) -> T:
         """
         Generates a structured response complying with response_model.
-        Retries on validation error.
+        Retries on validation error; provider errors fail over to the next provider.
+        cache_tag names the calling node; it opts the call into the response cache
+        when that node is enabled in LLM_CACHE_NODES.
+        deadline_sec bounds the whole call (retries and failover included); when it
+        passes, LLMDeadlineExceeded is raised so the caller can fall back, with the
+        request still in flight as its pending Future of the parsed response_model.
         """
-        if not self.llm:
-            raise Exception("LLM Client not initialized. Check GOOGLE_API_KEY.")
-
-        parser = PydanticOutputParser(pydantic_object=response_model)
-        
-        # We append format instructions to the user prompt usually, or system.
-        # LangChain's PydanticOutputParser provides get_format_instructions()
-        
-        from langchain_core.messages import SystemMessage, HumanMessage
-
-        full_system_prompt = f"{system_prompt}\n\nIMPORTANT: You must output valid JSON matching the schema below.\n{parser.get_format_instructions()}"
-        
-        # Use simple ChatPromptTemplate from messages directly to avoid template parsing of '{' in JSON schema
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=full_system_prompt),
-            HumanMessage(content=user_prompt)
-        ])
-        
-        chain = prompt | self.llm
-        
+        deadline = time.monotonic() + deadline_sec if deadline_sec else None
+        parser, _ = _parser_for(response_model)
+        full_system_prompt = system_prompt_with_schema(system_prompt, response_model)
+
+        use_cache = self.cache.enabled_for(cache_tag)
+        if use_cache:
+            cached = self._cached(parser, full_system_prompt, user_prompt, response_model)
+            self.cache.record(cached is not None, cache_tag)
+            if cached is not None:
+                return cached
+            if self.cache.mode == "replay":
+                raise CacheMissError(f"No recorded response for {cache_tag} ({response_model.__name__})")
+
+        def parse(completed: Tuple[str, ProviderSlot]) -> T:
+            text_output, slot = completed
+            cleaned = strip_code_fences(text_output)
+            parsed_obj = parser.parse(cleaned)
+            if use_cache and self.cache.writable:
+                key = self._cache_key(slot, full_system_prompt, user_prompt, response_model)
+                self.cache.put(key, slot.name, slot.provider.model, response_model, cleaned)
+            return parsed_obj
+
         last_error = None
         for attempt in range(retries + 1):
             try:
-                result = chain.invoke({}) # Arguments embedded in prompt already via from_messages? 
-                # Wait, prompt uses variables {system_prompt} etc. but they were f-stringed above.
-                # prompt was created with `from_messages([SystemMessage(content=full_system_prompt), ...])`
-                # So we just invoke with empty dict or any input.
-                
-                if hasattr(result, 'content'):
-                    text_output = result.content
-                    if isinstance(text_output, list):
-                        # Some versions return list of content blocks
-                        parts = []
-                        for item in text_output:
-                            if isinstance(item, str):
-                                parts.append(item)
-                            elif isinstance(item, dict):
-                                parts.append(item.get("text", ""))
-                            elif hasattr(item, 'text'):
-                                parts.append(item.text)
-                            else:
-                                parts.append(str(item))
-                        text_output = "".join(parts)
-                else:
-                    text_output = str(result)
-                
-                # Parse
-                # Sometimes LLM puts markdown code blocks ```json ... ```
-                cleaned_text = text_output.strip()
-                if cleaned_text.startswith("```json"):
-                    cleaned_text = cleaned_text[7:]
-                if cleaned_text.startswith("```"):
-                    cleaned_text = cleaned_text[3:]
-                if cleaned_text.endswith("```"):
-                    cleaned_text = cleaned_text[:-3]
-                
-                parsed_obj = parser.parse(cleaned_text)
-                return parsed_obj
-                
+                with span(f"llm.{response_model.__name__}"):
+                    completed = self._complete_by(deadline, full_system_prompt, user_prompt, response_model)
+                return parse(completed)
+            except LLMDeadlineExceeded as e:
+                if e.pending is not None:
+                    e.pending = map_future(e.pending, parse)
+                raise
+            except LLMUnavailableError:
+                raise
             except Exception as e:
                 print(f"LLM Structure Attempt {attempt+1} failed: {e}")
                 last_error = e
                 # In a real robust system, we might feed the error back to the LLM to correct itself
-                # For MVP, simple retry might work if it was just bad luck, but often needs feedback.
-                # Let's simple retry for now.
-        
+                # For MVP, simple retry might work if it was just bad luck.
+
         raise last_error or Exception("Failed to generate structured output")
 
+
+@lru_cache(maxsize=64)
+def _parser_for(response_model: Type[BaseModel]):
+    """Parser + format instructions per response model (the JSON schema is rendered once, not per call)."""
+    from langchain_core.output_parsers import PydanticOutputParser
+
+    parser = PydanticOutputParser(pydantic_object=response_model)
+    return parser, parser.get_format_instructions()
+
+
+@lru_cache(maxsize=512)
+def system_prompt_with_schema(system_prompt: str, response_model: Type[BaseModel]) -> str:
+    """
+    System prompt plus the JSON schema instructions. Cached so a given prompt is sent as
+    the same string every call, keeping the static prefix identical for provider-side caching.
+    """
+    _, format_instructions = _parser_for(response_model)
+    return f"{system_prompt}\n\nIMPORTANT: You must output valid JSON matching the schema below.\n{format_instructions}"
+
+
+def strip_code_fences(text_output: str) -> str:
+    # Sometimes LLM puts markdown code blocks ```json ... ```
+    cleaned_text = text_output.strip()
+    if cleaned_text.startswith("```json"):
+        cleaned_text = cleaned_text[7:]
+    if cleaned_text.startswith("```"):
+        cleaned_text = cleaned_text[3:]
+    if cleaned_text.endswith("```"):
+        cleaned_text = cleaned_text[:-3]
+    return cleaned_text
+
+
 llm_client = LLMClient()
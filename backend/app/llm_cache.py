@@ -0,0 +1,169 @@
+import os
+import hashlib
+import threading
+from datetime import datetime
+from typing import Optional, Set, Type, Dict, Any
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from .models import LLMCacheEntry
+from .metrics import metrics
+
+
+class CacheMissError(Exception):
+    """Raised in replay (cassette) mode when a request has no recorded response."""
+
+
+class ResponseCache:
+    """
+    Opt-in persistent cache for structured LLM responses.
+
+    Key: (provider, model, temperature, response_model, sha256(system + user)).
+    Only nodes listed in LLM_CACHE_NODES use it; question generation stays uncached.
+
+    Modes (LLM_CACHE_MODE):
+      - off:    disabled (default)
+      - rw:     read hits, record misses
+      - ro:     read hits, never write (misses still call the provider)
+      - replay: read-only cassette; a miss raises CacheMissError (for benchmarks)
+    """
+
+    MODES = ("off", "rw", "ro", "replay")
+
+    def __init__(self, url: Optional[str] = None, mode: str = "off", max_bytes: int = 50 * 1024 * 1024, nodes: Optional[Set[str]] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.url = url
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.nodes = nodes if nodes is not None else {"summarize", "report"}
+
+        self._lock = threading.Lock()
+        self._session_factory = None
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        nodes = os.getenv("LLM_CACHE_NODES", "summarize,report")
+        return cls(
+            url=os.getenv("LLM_CACHE_DB_URL"),
+            mode=os.getenv("LLM_CACHE_MODE", "off").lower(),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024,
+            nodes={n.strip() for n in nodes.split(",") if n.strip()},
+        )
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == "rw"
+
+    def enabled_for(self, tag: Optional[str]) -> bool:
+        return self.mode != "off" and tag is not None and tag in self.nodes
+
+    # --- Storage ---
+
+    def _db(self):
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    if self.url:
+                        connect_args = {"check_same_thread": False} if self.url.startswith("sqlite") else {}
+                        engine = create_engine(self.url, connect_args=connect_args)
+                    else:
+                        from .database import engine
+                    LLMCacheEntry.__table__.create(bind=engine, checkfirst=True)
+                    self._session_factory = sessionmaker(bind=engine, autoflush=False)
+        return self._session_factory()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, response_model: Type[BaseModel], system_prompt: str, user_prompt: str) -> str:
+        prompt_hash = hashlib.sha256(f"{system_prompt}\x00{user_prompt}".encode("utf-8")).hexdigest()
+        raw = f"{provider}|{model}|{temperature}|{response_model.__name__}|{prompt_hash}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        db = self._db()
+        try:
+            entry = db.get(LLMCacheEntry, key)
+            if entry is None:
+                return None
+            if self.writable:
+                entry.hits = (entry.hits or 0) + 1
+                entry.last_used_at = datetime.utcnow()
+                db.commit()
+            return entry.response_text
+        finally:
+            db.close()
+
+    def put(self, key: str, provider: str, model: str, response_model: Type[BaseModel], text: str):
+        if not self.writable:
+            return
+        size = len(text.encode("utf-8"))
+        db = self._db()
+        try:
+            existing = db.get(LLMCacheEntry, key)
+            if existing is not None:
+                return
+            db.add(LLMCacheEntry(
+                key=key, provider=provider, model=model,
+                response_model=response_model.__name__,
+                response_text=text, size_bytes=size
+            ))
+            db.commit()
+
+            with self._lock:
+                if self._total_bytes is None:
+                    self._total_bytes = db.query(func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0)).scalar()
+                else:
+                    self._total_bytes += size
+                over = self._total_bytes > self.max_bytes
+            if over:
+                self._evict(db)
+        finally:
+            db.close()
+
+    def _evict(self, db):
+        """Drops least-recently-used entries until the cache is at 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        total = db.query(func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0)).scalar()
+        evicted = 0
+        rows = db.query(LLMCacheEntry.key, LLMCacheEntry.size_bytes).order_by(LLMCacheEntry.last_used_at.asc()).yield_per(500)
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append(key)
+            total -= size or 0
+        if doomed:
+            db.query(LLMCacheEntry).filter(LLMCacheEntry.key.in_(doomed)).delete(synchronize_session=False)
+            db.commit()
+            evicted = len(doomed)
+        with self._lock:
+            self._total_bytes = total
+        metrics.incr("llm_cache.evictions", evicted)
+
+    # --- Metrics ---
+
+    def record(self, hit: bool, tag: str):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.incr(f"llm_cache.{'hits' if hit else 'misses'}.{tag}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "nodes": sorted(self.nodes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "stored_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
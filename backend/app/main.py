@@ -1,27 +1,79 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Header, Query, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from typing import Annotated
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from contextlib import asynccontextmanager
+import asyncio
+import copy
+import threading
+from collections import Counter, OrderedDict
+from typing import Annotated, List, Optional
+from datetime import datetime
+import os
+import time
 from sqlalchemy.orm import Session as DbSession
 
 from .models import (
     Base, SessionStateResponse, AnswerRequest, ReportResponse, 
     RoleEnum, DifficultyEnum, Evaluation
 )
-from .database import engine, get_db
+from .database import init_db, get_db, pool_stats, SessionLocal
 from .repo import SessionRepo
-from .services.resume import parse_resume_pdf
-from .services.report import generate_report_pdf
-from .services.voice import check_voice_availability, transcribe_audio, synthesize_speech, get_available_voices
-from .graph import app as graph_app
-from .models import FinalReport, SpeakRequest
+from .services.resume import ResumeRejected, ResumeUpload, spool_upload, parse_resume_upload
+from .services.voice import check_voice_availability, transcribe_audio, synthesize_speech, stream_speech, get_available_voices
+from .runner import graph_runner
+from .models import FinalReport, SpeakRequest, BatchEvaluationRequest, ExportFilters, ProfilingConfig, InterviewTemplate
+from .models import SessionSearchRequest, SessionSearchResponse
+from .interview_templates import template_registry
+from .services.batch_eval import evaluate_items
+from .services.export import stream_export
+from .services import analytics
+from .services.skill_index import search_sessions
+from .llm import llm_client
+from .metrics import metrics
+from .profiling import PROFILING_ENABLED, ProfilingMiddleware, profiler
 from pydantic import BaseModel
 
 
-# Create DB Tables (Auto-migration for MVP)
-Base.metadata.create_all(bind=engine)
+# --- Startup ---
 
-app = FastAPI(title="Interviewer.AI")
+def _warm_pdf():
+    from .services.report import warm_up
+    warm_up()
+
+def run_startup(warmup: Optional[bool] = None) -> dict:
+    """
+    Ordered startup steps; returns per-step durations in ms.
+    Schema check always runs. Warm-up (APP_WARMUP, default on) pays the lazy-import
+    costs up front: graph compile, ReportLab style sheets, LLM provider clients,
+    interview template prompt prefixes.
+    """
+    if warmup is None:
+        warmup = os.getenv("APP_WARMUP", "true").lower() in ("1", "true", "yes")
+
+    steps = [("schema", init_db)]  # Create DB Tables (Auto-migration for MVP)
+    if warmup:
+        steps += [("graph", graph_runner.warm_up), ("pdf", _warm_pdf), ("llm", llm_client.warm_up), ("templates", template_registry.warm_up)]
+
+    timings = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            if name == "schema":
+                raise
+            print(f"Warm-up step '{name}' failed: {e}")
+        timings[name] = (time.perf_counter() - start) * 1000
+        metrics.observe(f"startup.{name}_ms", timings[name])
+    print("Startup: " + ", ".join(f"{k}={v:.0f}ms" for k, v in timings.items()))
+    return timings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    run_startup()
+    yield
+
+app = FastAPI(title="Interviewer.AI", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,28 +81,93 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id"],
 )
 
+# On-demand request profiling (X-Profile header, ?profile=1, or PROFILE_SAMPLE_RATE)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # --- Helper ---
 def get_repo(db: DbSession = Depends(get_db)):
     return SessionRepo(db)
 
-def run_graph_and_update(session_id: str, current_state: dict, repo: SessionRepo):
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are open unless ADMIN_TOKEN is set, in which case X-Admin-Token must match."""
+    expected = os.getenv("ADMIN_TOKEN")
+    if expected and x_admin_token != expected:
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+def run_graph_and_update(session_id: str, current_state: dict, repo: SessionRepo, action: str = "start", text: Optional[str] = None):
     """
-    Runs the graph logic on current_state until it pauses (at user input or completion).
-    Updates DB with new state.
+    Runs one turn ("start", "answer" with text, or "end") until the graph pauses
+    (at user input or completion). Updates DB with new state.
     """
-    # LangGraph 'invoke' runs until it hits an interrupt or END.
-    # Our graph is designed to do one "turn" or "block" generally.
-    # We pass the state dict.
-    
-    new_state = graph_app.invoke(current_state)
+    evals_before = len(current_state.get("eval_history") or [])
+    had_report_before = bool(current_state.get("final_report"))
+    summary_before = current_state.get("resume_summary")
+
+    new_state = graph_runner.run(session_id, current_state, action, text)
     
     # Save to DB
-    repo.update_session_state(session_id, new_state)
+    persist_turn(repo, session_id, evals_before, had_report_before, new_state, summary_before)
     return new_state
 
-def map_state_to_response(session_id: str, state: dict) -> SessionStateResponse:
+def persist_turn(repo: SessionRepo, session_id: str, evals_before: int, had_report_before: bool, new_state: dict,
+                 summary_before: Optional[dict] = None):
+    if graph_runner.checkpointed and not new_state.get("final_report"):
+        # The checkpointer already holds this turn; state_json is only refreshed once the report exists
+        repo.touch_session(session_id)
+    else:
+        repo.update_session_state(session_id, new_state)
+
+    # Keep analytics tables (and the skill index) in step with what this turn produced
+    try:
+        analytics.record_turn(repo.db, session_id, evals_before, had_report_before, new_state, summary_before)
+    except Exception as e:
+        repo.db.rollback()
+        print(f"Analytics update failed for {session_id}: {e}")
+
+def prepare_session(session_id: str, upload: ResumeUpload, initial_state: dict):
+    """
+    Background half of a two-phase /session/start: parses the resume, then runs the graph
+    (summary + first question) and marks the session ready, or failed with a reason.
+    """
+    start = time.perf_counter()
+    db = SessionLocal()
+    repo = SessionRepo(db)
+    try:
+        resume_text = parse_resume_upload(upload)
+        if not resume_text:
+            repo.set_status(session_id, "failed", "Could not parse PDF")
+            metrics.incr("session.prepare_failed")
+            return
+        run_graph_and_update(session_id, {**initial_state, "resume_text": resume_text}, repo)
+        repo.set_status(session_id, "ready")
+        metrics.observe("session.prepare_ms", (time.perf_counter() - start) * 1000)
+    except ResumeRejected as e:
+        repo.set_status(session_id, "failed", e.detail)
+        metrics.incr("session.prepare_failed")
+    except Exception as e:
+        print(f"Preparing session {session_id} failed: {e}")
+        db.rollback()
+        repo.set_status(session_id, "failed", "Failed to prepare the interview")
+        metrics.incr("session.prepare_failed")
+    finally:
+        upload.close()
+        db.close()
+
+# /state and /answer: the response is serialized once per state_version and returned as
+# bytes, skipping FastAPI's response_model round trip (false = build and validate per request)
+STATE_RESPONSE_FAST_PATH = os.getenv("STATE_RESPONSE_FAST_PATH", "true").lower() in ("1", "true", "yes")
+STATE_RESPONSE_CACHE_SIZE = int(os.getenv("STATE_RESPONSE_CACHE_SIZE", "2048"))
+
+def session_response(session) -> SessionStateResponse:
+    return map_state_to_response(
+        session.id, graph_runner.load_state(session), status=session.status or "ready", status_detail=session.status_detail
+    )
+
+def map_state_to_response(session_id: str, state: dict, status: str = "ready", status_detail: Optional[str] = None) -> SessionStateResponse:
     # Construct progress string
     curr = state.get("asked_main_questions", 1) # usage of new counter
     total = state.get("total_questions", 5)
@@ -98,11 +215,73 @@ def map_state_to_response(session_id: str, state: dict) -> SessionStateResponse:
         messages=messages,
         scores=last_eval,
         interview_complete=state.get("is_finished", False),
-        report_available=bool(state.get("final_report"))
+        report_available=bool(state.get("final_report")),
+        status=status,
+        status_detail=status_detail
     )
 
+class _ResponseCache:
+    """Serialized /state bodies, LRU, keyed by (session id, state_version, status, status detail)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple, body: bytes):
+        if not self.size:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+_state_responses = _ResponseCache(STATE_RESPONSE_CACHE_SIZE)
+
+def state_json_response(session, state: Optional[dict] = None) -> Response:
+    """
+    The session's SessionStateResponse as JSON, serialized once per state_version: /state
+    polls between turns reuse the bytes without loading or re-encoding the state.
+    """
+    key = (session.id, session.state_version, session.status or "ready", session.status_detail)
+    body = _state_responses.get(key)
+    if body is None:
+        metrics.incr("state_response.cache_misses")
+        if state is None:
+            state = graph_runner.load_state(session)
+        response = map_state_to_response(session.id, state, status=key[2], status_detail=key[3])
+        body = response.model_dump_json().encode("utf-8")
+        _state_responses.put(key, body)
+    else:
+        metrics.incr("state_response.cache_hits")
+    return Response(content=body, media_type="application/json")
+
 # --- Endpoints ---
 
+@app.get("/metrics")
+async def get_metrics():
+    """In-process counters and latency summaries."""
+    snapshot = metrics.snapshot()
+    snapshot["db_pool"] = pool_stats()
+    return snapshot
+
+@app.get("/llm/health")
+async def get_llm_health():
+    """Per-provider health, latency and circuit breaker state."""
+    return {
+        "hedging": llm_client.hedge,
+        "providers": llm_client.health(),
+        "cache": llm_client.cache.stats()
+    }
+
 @app.get("/voice/status")
 async def get_voice_status():
     """
@@ -128,6 +307,8 @@ async def text_to_speech_endpoint(request: SpeakRequest):
     if not check_voice_availability():
         raise HTTPException(status_code=503, detail="Voice mode disabled")
         
+    if request.stream:
+        return await speech_stream_response(request.text, request.voice, request.rate, request.pitch)
     try:
         audio_bytes = await synthesize_speech(
             text=request.text,
@@ -140,28 +321,89 @@ async def text_to_speech_endpoint(request: SpeakRequest):
          print(f"TTS Error: {e}")
          raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/speech/stream")
+async def text_to_speech_stream(
+    text: str = Query(..., max_length=5000),
+    voice: str = "en-US-ChristopherNeural",
+    rate: str = "+0%",
+    pitch: str = "+0Hz",
+):
+    """
+    Sentence-pipelined speech as a streamed MP3. A GET so an <audio> element can use it as
+    its src and start playing after the first sentence.
+    """
+    if not check_voice_availability():
+        raise HTTPException(status_code=503, detail="Voice mode disabled")
+    return await speech_stream_response(text, voice, rate, pitch)
+
+async def speech_stream_response(text: str, voice: str, rate: str, pitch: str) -> StreamingResponse:
+    audio = stream_speech(text, voice, rate, pitch)
+    # Wait for the first sentence before committing to a 200, so a TTS failure is still a 500
+    try:
+        first = await audio.__anext__()
+    except StopAsyncIteration:
+        first = b""
+    except Exception as e:
+        print(f"TTS Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        yield first
+        try:
+            async for chunk in audio:
+                yield chunk
+        finally:
+            await audio.aclose()
+
+    return StreamingResponse(body(), media_type="audio/mpeg")
+
+@app.get("/templates", response_model=List[InterviewTemplate])
+async def list_templates():
+    """Interview templates a session can be started from."""
+    return template_registry.all()
+
 @app.post("/session/start", response_model=SessionStateResponse)
 async def start_session(
-    role: RoleEnum = Form(...),
-    difficulty: DifficultyEnum = Form(...),
-    num_questions: int = Form(5),
+    background_tasks: BackgroundTasks,
+    role: Optional[RoleEnum] = Form(None),
+    difficulty: Optional[DifficultyEnum] = Form(None),
+    num_questions: Optional[int] = Form(None),
     voice_enabled: bool = Form(False),
+    template_id: Optional[str] = Form(None),
+    background: bool = Form(False),
     resume: UploadFile = File(...),
     repo: SessionRepo = Depends(get_repo)
 ):
-    # 1. Parse Resume
-    content = await resume.read()
-    resume_text = parse_resume_pdf(content)
-    if not resume_text:
-        raise HTTPException(status_code=400, detail="Could not parse PDF")
+    """
+    Starts an interview. By default it responds once the first question exists. With
+    background=true it responds right away with status "preparing"; the resume is parsed
+    and summarized and the first question generated after the response, and the client
+    polls /session/{id}/state (or listens on the WebSocket) until the status is "ready".
+    """
+    # Role, difficulty and question count default to the template's; explicit fields win
+    template = template_registry.get(template_id)
+    if template_id and template is None:
+        raise HTTPException(status_code=404, detail=f"Unknown template: {template_id}")
+    if template is None and (role is None or difficulty is None):
+        raise HTTPException(status_code=422, detail="role and difficulty are required without a template_id")
+    role = role or template.role
+    difficulty = difficulty or template.difficulty
+    num_questions = num_questions or (template.num_questions if template else 5)
+
+    # Copied in chunks to a spooled temp file; oversized or non-PDF uploads stop here
+    try:
+        upload = await spool_upload(resume)
+    except ResumeRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    # 2. Init State
+    # 1. Init State
     initial_state = {
-        "resume_text": resume_text,
+        "resume_text": "",
         "resume_summary": None,
         "role": role.value,
         "difficulty": difficulty.value,
         "total_questions": num_questions,
+        "template_id": template.id if template else None,
         "question_history": [],
         "answer_history": [],
         "eval_history": [],
@@ -171,6 +413,24 @@ async def start_session(
         "is_finished": False
     }
 
+    if background:
+        # 2. Create the session now; parsing and the graph run after the response
+        session = repo.create_session(role.value, difficulty.value, initial_state, status="preparing")
+        background_tasks.add_task(prepare_session, session.id, upload, initial_state)
+        metrics.incr("session.start_background")
+        return map_state_to_response(session.id, initial_state, status="preparing")
+
+    # 2. Parse Resume
+    try:
+        resume_text = parse_resume_upload(upload)
+    except ResumeRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    finally:
+        upload.close()
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Could not parse PDF")
+    initial_state["resume_text"] = resume_text
+
     # 3. Create Session DB
     session = repo.create_session(role.value, difficulty.value, initial_state)
 
@@ -188,24 +448,20 @@ async def answer_question(
     session = repo.get_session(session_id)
     if not session or not session.is_active:
         raise HTTPException(status_code=404, detail="Session not found or finished")
+    if session.status == "preparing":
+        raise HTTPException(status_code=409, detail="Session is still being prepared")
 
-    state = session.state_json
+    state = graph_runner.load_state(session)
     
-    # 1. Inject Answer
     # We must ensure there is a current question pending
     if not state.get("current_question"):
         raise HTTPException(status_code=400, detail="No pending question to answer")
         
-    ans_entry = {
-        "question_id": state["current_question"]["id"],
-        "text": request.text
-    }
-    state["answer_history"].append(ans_entry)
-    
-    # 2. Run Graph (Evaluate -> [Next Q OR Report])
-    # The graph router should see we have an answer > evaluation count and trigger evaluation
-    final_state = run_graph_and_update(session_id, state, repo)
+    # Run Graph (Evaluate -> [Next Q OR Report]) with the answer attached to the current question
+    final_state = run_graph_and_update(session_id, state, repo, action="answer", text=request.text)
     
+    if STATE_RESPONSE_FAST_PATH:
+        return state_json_response(session, final_state)  # also primes the cache for the next /state poll
     return map_state_to_response(session_id, final_state)
 
 @app.post("/session/{session_id}/end")
@@ -214,25 +470,203 @@ async def end_session(session_id: str, repo: SessionRepo = Depends(get_repo)):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # 1. Mark as finished in state
-    state = session.state_json
-    state["is_finished"] = True
-    
-    # 2. Run Graph (this will trigger generate_report via the router logic we just added)
-    # We update the state first so the router sees is_finished=True
-    repo.update_session_state(session_id, state)
-    run_graph_and_update(session_id, state, repo)
+    state = graph_runner.load_state(session)
+    if not graph_runner.checkpointed:
+        # 1. Mark as finished in state first, so the session stays finished even if the report fails
+        state["is_finished"] = True
+        repo.update_session_state(session_id, state)
+
+    # 2. Run Graph (this will trigger generate_report)
+    run_graph_and_update(session_id, state, repo, action="end")
 
     # 3. Mark DB session as inactive
     repo.end_session(session_id)
     return {"status": "ended"}
 
+# --- Real-time Channel ---
+
+# How often, and how long, a socket opened on a "preparing" session checks for the first question
+WS_PREPARE_POLL_SEC = float(os.getenv("WS_PREPARE_POLL_SEC", "0.5"))
+WS_PREPARE_WAIT_SEC = float(os.getenv("WS_PREPARE_WAIT_SEC", "120"))
+
+class _StatePersister:
+    """
+    Writes session state in the background so the socket can answer immediately.
+    Writes are chained, so they land in turn order; flush() waits for the last one.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, evals_before: int, had_report_before: bool, summary_before: Optional[dict], state: dict, end: bool = False):
+        previous = self._task
+        snapshot = copy.deepcopy(state)  # the handler keeps mutating its copy
+
+        async def run():
+            if previous is not None:
+                await previous
+            await asyncio.to_thread(self._write, evals_before, had_report_before, summary_before, snapshot, end)
+
+        self._task = asyncio.create_task(run())
+
+    def _write(self, evals_before: int, had_report_before: bool, summary_before: Optional[dict], state: dict, end: bool):
+        db = SessionLocal()
+        try:
+            repo = SessionRepo(db)
+            persist_turn(repo, self.session_id, evals_before, had_report_before, state, summary_before)
+            if end:
+                repo.end_session(self.session_id)
+        except Exception as e:
+            print(f"WS persist failed for {self.session_id}: {e}")
+        finally:
+            db.close()
+
+    async def flush(self):
+        if self._task is not None:
+            await self._task
+
+def _load_session(session_id: str):
+    """(state, is_active, state response) for a session, or (None, False, None)."""
+    db = SessionLocal()
+    try:
+        session = SessionRepo(db).get_session(session_id)
+        if not session:
+            return None, False, None
+        state = graph_runner.load_state(session)
+        response = map_state_to_response(session.id, state, status=session.status or "ready", status_detail=session.status_detail)
+        return state, session.is_active, response
+    finally:
+        db.close()
+
+def _node_events(session_id: str, node: str, state: dict) -> list:
+    """Translates a finished graph node into channel events."""
+    if node == "evaluate_answer" and state.get("eval_history"):
+        return [{"type": "evaluation", "data": state["eval_history"][-1]}]
+    if node in ("generate_main_question", "generate_followup"):
+        response = map_state_to_response(session_id, state)
+        return [
+            {"type": "question", "data": state["current_question"], "is_followup": response.is_followup},
+            {"type": "progress", "data": {"progress": response.progress}},
+        ]
+    if node == "generate_report":
+        return [{"type": "complete", "data": {"report_available": bool(state.get("final_report"))}}]
+    return []
+
+async def _ws_send(websocket: WebSocket, event: dict) -> bool:
+    """Sends an event; False if the client is gone."""
+    try:
+        await websocket.send_json(event)
+        return True
+    except Exception as e:  # WebSocketDisconnect, or RuntimeError/OSError on a socket already closed
+        metrics.incr("ws.send_failed")
+        print(f"WS send failed: {e}")
+        return False
+
+async def _ws_run_graph(websocket: WebSocket, session_id: str, state: dict, action: str, text: Optional[str] = None) -> dict:
+    """
+    Streams the graph in a worker thread, pushing events to the client as each node finishes.
+    Returns the resulting state. A client that drops mid-turn doesn't stop the graph: the turn
+    runs to the end without it so its state (an answer already graded by the LLM) is persisted.
+    """
+    loop = asyncio.get_running_loop()
+
+    def worker():
+        final, connected = state, True
+        for node, final in graph_runner.stream(session_id, state, action, text):
+            if not connected:
+                continue
+            for event in _node_events(session_id, node, final):
+                if not asyncio.run_coroutine_threadsafe(_ws_send(websocket, event), loop).result():
+                    connected = False
+                    break
+        return final
+
+    return await asyncio.to_thread(worker)
+
+@app.websocket("/session/{session_id}/ws")
+async def interview_channel(websocket: WebSocket, session_id: str):
+    """
+    Bidirectional interview channel.
+
+    Client -> server: {"type": "answer", "text": ...} | {"type": "end"} | {"type": "ping"}
+    Server -> client: state (on connect), evaluation, question, progress, complete, error, pong
+
+    State is held in the handler between turns and persisted in the background.
+    """
+    await websocket.accept()
+    state, is_active, response = await asyncio.to_thread(_load_session, session_id)
+    if state is None:
+        await websocket.send_json({"type": "error", "detail": "Session not found"})
+        await websocket.close(code=4404)
+        return
+
+    metrics.incr("ws.connections")
+    persister = _StatePersister(session_id)
+    await websocket.send_json({"type": "state", "data": response.model_dump(mode="json")})
+    # Two-phase start: push the state again once the first question exists
+    give_up = time.monotonic() + WS_PREPARE_WAIT_SEC
+    while response.status == "preparing" and time.monotonic() < give_up:
+        await asyncio.sleep(WS_PREPARE_POLL_SEC)
+        state, is_active, response = await asyncio.to_thread(_load_session, session_id)
+        if response.status != "preparing":
+            await websocket.send_json({"type": "state", "data": response.model_dump(mode="json")})
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            kind = message.get("type")
+
+            if kind == "ping":
+                await websocket.send_json({"type": "pong"})
+                continue
+
+            if kind not in ("answer", "end"):
+                await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+                continue
+
+            if not is_active:
+                await websocket.send_json({"type": "error", "detail": "Session finished"})
+                continue
+
+            if kind == "answer" and not state.get("current_question"):
+                await websocket.send_json({"type": "error", "detail": "No pending question to answer"})
+                continue
+
+            evals_before = len(state.get("eval_history") or [])
+            had_report_before = bool(state.get("final_report"))
+            summary_before = state.get("resume_summary")
+
+            start = time.perf_counter()
+            try:
+                state = await _ws_run_graph(websocket, session_id, state, kind, message.get("text", ""))
+            except Exception as e:
+                print(f"WS turn failed for {session_id}: {e}")
+                if not await _ws_send(websocket, {"type": "error", "detail": "Failed to process turn"}):
+                    break
+                continue
+            metrics.observe("ws.turn_ms", (time.perf_counter() - start) * 1000)
+
+            # Persist first: the client may already be gone
+            ended = kind == "end"
+            persister.submit(evals_before, had_report_before, summary_before, state, end=ended)
+            if ended:
+                is_active = False
+                if not await _ws_send(websocket, {"type": "ended"}):
+                    break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await persister.flush()
+
 @app.get("/session/{session_id}/state", response_model=SessionStateResponse)
 async def get_state(session_id: str, repo: SessionRepo = Depends(get_repo)):
     session = repo.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return map_state_to_response(session.id, session.state_json)
+    if STATE_RESPONSE_FAST_PATH:
+        return state_json_response(session)
+    return session_response(session)
 
 @app.get("/session/{session_id}/report", response_model=ReportResponse)
 async def get_report_json(session_id: str, repo: SessionRepo = Depends(get_repo)):
@@ -240,7 +674,7 @@ async def get_report_json(session_id: str, repo: SessionRepo = Depends(get_repo)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    state = session.state_json
+    state = graph_runner.load_state(session)
     if not state.get("final_report"):
          # Optionally trigger generation if missing?
          # For now assume it's generated at end of flow
@@ -254,20 +688,167 @@ async def get_report_pdf(session_id: str, repo: SessionRepo = Depends(get_repo))
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
-    state = session.state_json
+    state = graph_runner.load_state(session)
     if not state.get("final_report"):
         raise HTTPException(status_code=400, detail="Report not ready yet")
         
-    report_data = FinalReport(**state["final_report"])
-    
-    # Use new reportlab service which returns path
+    # Rendered with PDF_RENDERER (ReportLab or fpdf2); cached across workers
+    from .services.report import report_pdf_bytes
     try:
-        pdf_path = generate_report_pdf(report_data, session_id, state.get("messages", []))
-        
-        with open(pdf_path, "rb") as f:
-            pdf_bytes = f.read()
-            
+        pdf_bytes = report_pdf_bytes(session_id, state)
         return Response(content=pdf_bytes, media_type="application/pdf")
     except Exception as e:
         print(f"PDF Gen Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate PDF report")
+
+@app.post("/evaluate/batch")
+def evaluate_batch_endpoint(request: BatchEvaluationRequest):
+    """
+    Scores many (question, expected_points, answer) items without running the interview graph.
+    Streams one JSON object per line (Evaluation, or {question_id, error}) as batches complete.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to evaluate")
+    # Results are matched back to items by id
+    duplicates = sorted(i for i, n in Counter(item.id for item in request.items).items() if n > 1)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate item ids: {', '.join(duplicates)}")
+
+    def stream():
+        for result in evaluate_items(request.items, token_budget=request.token_budget):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/admin/export", dependencies=[Depends(require_admin)])
+def export_reports(
+    format: str = Query("zip", pattern="^(zip|tar)$"),
+    include_pdf: bool = True,
+    role: Optional[RoleEnum] = None,
+    difficulty: Optional[DifficultyEnum] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    is_active: Optional[bool] = None,
+):
+    """
+    Streams a ZIP (or tar.gz) of report.json/report.pdf for every matching session with a report.
+    """
+    filters = ExportFilters(
+        role=role, difficulty=difficulty,
+        created_from=created_from, created_to=created_to, is_active=is_active
+    )
+    filename = f"reports_{datetime.utcnow():%Y%m%d_%H%M%S}.{'zip' if format == 'zip' else 'tar.gz'}"
+    media_type = "application/zip" if format == "zip" else "application/gzip"
+    return StreamingResponse(
+        stream_export(filters, fmt=format, include_pdf=include_pdf),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/admin/sessions/{session_id}/history", dependencies=[Depends(require_admin)])
+def session_history(session_id: str, limit: int = Query(50, ge=1, le=500), checkpoint_id: Optional[str] = None):
+    """
+    Checkpoint history of a session (GRAPH_CHECKPOINT=sql), newest first.
+    With checkpoint_id, returns the full state at that checkpoint and the nodes due next.
+    """
+    if not graph_runner.checkpointed:
+        raise HTTPException(status_code=400, detail="Checkpointing is disabled (set GRAPH_CHECKPOINT=sql)")
+    if checkpoint_id:
+        snapshot = graph_runner.state_at(session_id, checkpoint_id)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="Checkpoint not found")
+        return snapshot
+    return {"session_id": session_id, "checkpoints": graph_runner.history(session_id, limit=limit)}
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+def list_profiles(session_id: Optional[str] = None):
+    """Stored request profiles, newest first (ring buffer of PROFILE_MAX_FILES)."""
+    return {
+        "enabled": PROFILING_ENABLED,
+        "sample_rate": profiler.sample_rate,
+        "profiles": profiler.store.list(session_id=session_id)
+    }
+
+@app.put("/admin/profiles/config", dependencies=[Depends(require_admin)])
+def set_profiling_config(config: ProfilingConfig):
+    """Changes the sampling rate at runtime (0 disables sampling; header/query triggers still work)."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=400, detail="Profiling is disabled (PROFILING=off)")
+    if not 0 <= config.sample_rate <= 1:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 0 and 1")
+    profiler.sample_rate = config.sample_rate
+    return {"sample_rate": profiler.sample_rate}
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    """Spans and top functions by cumulative time for one profiled request."""
+    record = profiler.store.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return record
+
+@app.get("/admin/profiles/{profile_id}/download", dependencies=[Depends(require_admin)])
+def download_profile(profile_id: str):
+    """Raw pstats file (snakeviz, `python -m pstats`)."""
+    path = profiler.store.raw_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@app.get("/analytics/evaluations")
+def evaluation_analytics(
+    metric: str = "depth",
+    group_by: Optional[str] = Query(None, description="Comma-separated: role,difficulty,topic,kind"),
+    role: Optional[RoleEnum] = None,
+    difficulty: Optional[DifficultyEnum] = None,
+    topic: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: DbSession = Depends(get_db),
+):
+    """Count, average, percentiles and histogram of one evaluation score, optionally grouped."""
+    try:
+        groups = analytics.evaluation_stats(
+            db, metric=metric,
+            group_by=[g.strip() for g in group_by.split(",") if g.strip()] if group_by else None,
+            role=role.value if role else None,
+            difficulty=difficulty.value if difficulty else None,
+            topic=topic, created_from=created_from, created_to=created_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"metric": metric, "groups": groups}
+
+@app.get("/analytics/reports")
+def report_analytics(
+    category: Optional[str] = None,
+    group_by: Optional[str] = Query(None, description="Comma-separated: role,difficulty,category"),
+    role: Optional[RoleEnum] = None,
+    difficulty: Optional[DifficultyEnum] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: DbSession = Depends(get_db),
+):
+    """Distribution of FinalReport.category_scores, grouped by category by default."""
+    try:
+        groups = analytics.report_stats(
+            db, category=category,
+            group_by=[g.strip() for g in group_by.split(",") if g.strip()] if group_by else None,
+            role=role.value if role else None,
+            difficulty=difficulty.value if difficulty else None,
+            created_from=created_from, created_to=created_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"groups": groups}
+
+@app.post("/admin/sessions/search", response_model=SessionSearchResponse, dependencies=[Depends(require_admin)])
+def search_sessions_by_skill(request: SessionSearchRequest, db: DbSession = Depends(get_db)):
+    """
+    Sessions whose resume lists all of all_skills and any of any_skills, optionally also
+    scoring at least a minimum on a topic or report category, newest first.
+    """
+    try:
+        return search_sessions(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,65 @@
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Any, Deque
+
+
+class Metrics:
+    """
+    Tiny in-process metrics registry (counters + rolling latency samples).
+    Exposed as JSON via the /metrics endpoint.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=max_samples))
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            self._samples[name].append(value)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, pct: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        return _percentile(samples, pct)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+
+        summaries = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            summaries[name] = {
+                "count": len(values),
+                "avg": sum(values) / len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "max": values[-1],
+            }
+        return {"counters": counters, "timings": summaries}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+metrics = Metrics()
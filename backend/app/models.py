@@ -1,13 +1,15 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from enum import Enum
 from pydantic import BaseModel, Field, UUID4, ConfigDict
-from sqlalchemy import Column, String, Integer, Text, Boolean, DateTime
+from pydantic.json_schema import SkipJsonSchema
+from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, Index, UniqueConstraint, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import TypeDecorator
 import json
 import uuid
 from datetime import datetime
 from .database import Base
+from .state_codec import encode_state, decode_state
 
 # --- SQLAlchemy Models ---
 
@@ -40,10 +42,175 @@ class Session(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     role = Column(String)
     difficulty = Column(String)
-    # The entire LangGraph state is stored here
-    state_json = Column(JSONType, nullable=True) 
+    # The entire LangGraph state is stored here: state_blob (app/state_codec.py) once written
+    # by this version, JSON text in the state_json column for older rows until their next write.
+    # Read and write it through the state_json property.
+    state_text = Column("state_json", JSONType, nullable=True)
+    state_blob = Column(LargeBinary, nullable=True)
     state_version = Column(Integer, default=1)
     is_active = Column(Boolean, default=True)
+    # Two-phase start: "preparing" until the resume is summarized and the first question exists,
+    # then "ready" (or "failed", with status_detail). NULL on older rows means ready.
+    status = Column(String, default="ready")
+    status_detail = Column(String, nullable=True)
+
+    @property
+    def state_json(self) -> Optional[Dict[str, Any]]:
+        blob = self.state_blob
+        if blob is None:
+            return self.state_text
+        cached = self.__dict__.get("_decoded_state")
+        if cached is not None and cached[0] is blob:
+            return cached[1]
+        state = decode_state(blob)
+        self.__dict__["_decoded_state"] = (blob, state)
+        return state
+
+    @state_json.setter
+    def state_json(self, state: Optional[Dict[str, Any]]):
+        for name, value in self.state_columns(state).items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def state_columns(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Column values storing state, for writes that bypass the ORM attribute (UPDATE statements)."""
+        blob = encode_state(state) if state is not None else None
+        return {"state_blob": blob, "state_text": None if blob is not None else state}
+
+    __table_args__ = (
+        # Admin export / analytics filters: role + difficulty within a date range
+        Index("ix_sessions_role_difficulty_created", "role", "difficulty", "created_at"),
+        Index("ix_sessions_created_at", "created_at"),
+    )
+
+class EvaluationScore(Base):
+    """One row per evaluated answer, materialized from state_json.eval_history for analytics."""
+    __tablename__ = "evaluation_scores"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, index=True)
+    question_id = Column(String)
+    role = Column(String)
+    difficulty = Column(String)
+    topic = Column(String)
+    kind = Column(String)
+    correctness_score = Column(Integer)
+    depth_score = Column(Integer)
+    structure_score = Column(Integer)
+    communication_score = Column(Integer)
+    followup_needed = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "question_id", name="uq_evaluation_scores_session_question"),
+        Index("ix_evaluation_scores_role_difficulty_created", "role", "difficulty", "created_at"),
+        Index("ix_evaluation_scores_topic_created", "topic", "created_at"),
+    )
+
+class ReportCategoryScore(Base):
+    """One row per FinalReport.category_scores entry."""
+    __tablename__ = "report_category_scores"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, index=True)
+    role = Column(String)
+    difficulty = Column(String)
+    category = Column(String)
+    score = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "category", name="uq_report_category_scores_session_category"),
+        Index("ix_report_category_scores_category_role_difficulty", "category", "role", "difficulty", "created_at"),
+    )
+
+class SessionSkills(Base):
+    """
+    Normalized resume skills and keywords of a session, one row per summary. doc_id is the
+    session's position in the in-memory skill index (app/services/skill_index.py).
+    """
+    __tablename__ = "session_skills"
+
+    doc_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, unique=True, index=True)
+    terms = Column(Text)  # newline-separated
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Never reuse a deleted doc id: indexes only read ids above the highest they have seen
+    __table_args__ = {"sqlite_autoincrement": True}
+
+class LLMCacheEntry(Base):
+    """Persisted structured LLM responses (see app/llm_cache.py)."""
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    provider = Column(String)
+    model = Column(String)
+    response_model = Column(String)
+    response_text = Column(Text)
+    size_bytes = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class SharedCacheEntry(Base):
+    """Cross-worker cache values (see app/shared_cache.py); key is a hash within its namespace."""
+    __tablename__ = "shared_cache"
+
+    namespace = Column(String, primary_key=True)
+    key = Column(String(64), primary_key=True)
+    value = Column(LargeBinary)
+    size_bytes = Column(Integer, default=0)
+    expires_at = Column(Float, nullable=True, index=True)  # unix time; NULL = no expiry
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class SharedCacheLease(Base):
+    """Held while one worker computes a missing value, so others wait for it instead of recomputing."""
+    __tablename__ = "shared_cache_leases"
+
+    namespace = Column(String, primary_key=True)
+    key = Column(String(64), primary_key=True)
+    owner = Column(String)
+    expires_at = Column(Float)
+
+class GraphCheckpoint(Base):
+    """One LangGraph checkpoint per super-step; channel values live in graph_checkpoint_blobs."""
+    __tablename__ = "graph_checkpoints"
+
+    thread_id = Column(String, primary_key=True)  # session id
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True)
+    parent_checkpoint_id = Column(String, nullable=True)
+    checkpoint_type = Column(String)
+    checkpoint = Column(LargeBinary)
+    metadata_type = Column(String)
+    metadata_blob = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class GraphCheckpointBlob(Base):
+    """A channel value at one version. Only channels a step actually wrote get a new row."""
+    __tablename__ = "graph_checkpoint_blobs"
+
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    channel = Column(String, primary_key=True)
+    version = Column(String, primary_key=True)
+    value_type = Column(String)
+    value = Column(LargeBinary, nullable=True)
+
+class GraphCheckpointWrite(Base):
+    """Pending writes of a step (node outputs, interrupts) recorded before its checkpoint."""
+    __tablename__ = "graph_checkpoint_writes"
+
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True)
+    task_id = Column(String, primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    channel = Column(String)
+    value_type = Column(String)
+    value = Column(LargeBinary, nullable=True)
+    task_path = Column(String, default="")
 
 
 # --- Pydantic Models (Domain/API) ---
@@ -90,6 +257,16 @@ class Evaluation(BaseModel):
     followup_needed: bool = False
     followup_reason: Optional[str] = None
     followup_question: Optional[str] = None
+    provisional: SkipJsonSchema[bool] = False # local heuristic grade (LLM missed its deadline); not in the LLM's schema
+
+class EvaluationBatch(BaseModel):
+    evaluations: List[Evaluation]
+
+class TurnResult(BaseModel):
+    """Fused answer turn (FUSED_TURNS): the grade for the last answer plus the next question."""
+    evaluation: Evaluation
+    next_kind: Literal["main", "followup"]
+    next_question: Question
 
 class FinalReport(BaseModel):
     overall_score: int
@@ -99,6 +276,14 @@ class FinalReport(BaseModel):
     improvement_plan_7_days: List[str]
     improved_answers: List[Dict[str, str]] # question_id -> better answer
 
+class InterviewTemplate(BaseModel):
+    id: str
+    name: str
+    role: RoleEnum
+    difficulty: DifficultyEnum
+    num_questions: int = Field(5, ge=1, le=20)
+    topic_schedule: List[str] = Field(..., min_length=1) # topic per main question; the last one repeats
+
 # --- Request/Response Schemas ---
 
 class StartSessionRequest(BaseModel):
@@ -113,6 +298,46 @@ class StartSessionRequest(BaseModel):
 class AnswerRequest(BaseModel):
     text: str
 
+class BatchEvaluationItem(BaseModel):
+    id: str
+    question: str
+    expected_points: List[str] = []
+    answer: str
+
+class BatchEvaluationFailure(BaseModel):
+    question_id: str
+    error: str
+
+class BatchEvaluationRequest(BaseModel):
+    items: List[BatchEvaluationItem]
+    token_budget: Optional[int] = None
+
+class ExportFilters(BaseModel):
+    role: Optional[RoleEnum] = None
+    difficulty: Optional[DifficultyEnum] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
+class ScoreFilter(BaseModel):
+    topic: Optional[str] = None # interview topic ("System Design"): mean score of the session's answers on it
+    category: Optional[str] = None # or a FinalReport category ("communication")
+    metric: Optional[Literal["correctness", "depth", "structure", "communication"]] = None # topic filters: one score instead of the mean of four
+    min: float
+
+class SessionSearchRequest(BaseModel):
+    all_skills: List[str] = [] # AND
+    any_skills: List[str] = [] # OR
+    scores: List[ScoreFilter] = [] # AND
+    limit: int = Field(50, ge=1, le=1000)
+
+class SessionSearchResponse(BaseModel):
+    total: int
+    session_ids: List[str] # newest first
+
+class ProfilingConfig(BaseModel):
+    sample_rate: float
+
 class SessionStateResponse(BaseModel):
     session_id: str
     current_question: Optional[Question]
@@ -122,6 +347,8 @@ class SessionStateResponse(BaseModel):
     scores: Optional[Evaluation] # most recent evaluation
     interview_complete: bool = False
     report_available: bool = False
+    status: str = "ready" # "preparing" | "ready" | "failed"
+    status_detail: Optional[str] = None
 
 class ReportResponse(BaseModel):
     report: FinalReport
@@ -131,3 +358,4 @@ class SpeakRequest(BaseModel):
     voice: str = "en-US-ChristopherNeural"
     rate: str = "+0%"
     pitch: str = "+0Hz"
+    stream: bool = False # sentence-pipelined audio, streamed as each sentence is ready
@@ -0,0 +1,324 @@
+import os
+import re
+import time
+import uuid
+import json
+import pstats
+import random
+import cProfile
+import tempfile
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+# PROFILING=off removes the middleware and leaves instrumented functions undecorated.
+PROFILING_ENABLED = os.getenv("PROFILING", "on").lower() not in ("0", "off", "false", "no")
+
+_current: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar("request_profile", default=None)
+_thread_state = threading.local()  # which profile (if any) owns this thread's cProfile hook
+_NOOP = nullcontext()
+
+SESSION_PATH = re.compile(r"^/session/([^/]+)")
+
+
+class RequestProfile:
+    """
+    Profile of one request: wall-clock spans for the instrumented layers (graph, LLM,
+    repository, PDF) plus cProfile data from every thread those spans ran on.
+
+    The request's own thread is profiled for the whole request. On the event loop this
+    also catches other requests interleaved with it; spans show where this one spent time.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        match = SESSION_PATH.match(path)
+        self.session_id = match.group(1) if match else None
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.status: Optional[int] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._profilers: List[cProfile.Profile] = []
+        self._root = None
+
+    def _enable_thread(self) -> Optional[cProfile.Profile]:
+        # One cProfile hook per thread; a nested span or an overlapping profile on the same thread skips it
+        if getattr(_thread_state, "owner", None) is not None:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler (e.g. a debugger) owns this thread
+            return None
+        _thread_state.owner = self
+        return profiler
+
+    def _disable_thread(self, profiler: Optional[cProfile.Profile]):
+        if profiler is None:
+            return
+        profiler.disable()
+        _thread_state.owner = None
+        with self._lock:
+            self._profilers.append(profiler)
+
+    def start(self):
+        self._root = self._enable_thread()
+
+    def stop(self, status: Optional[int]):
+        self._disable_thread(self._root)
+        self.status = status
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        profiler = self._enable_thread()
+        try:
+            yield
+        finally:
+            self._disable_thread(profiler)
+            with self._lock:
+                self.spans.append({
+                    "name": name,
+                    "thread": threading.current_thread().name,
+                    "start_ms": round((start - self._t0) * 1000, 3),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                })
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            profilers = list(self._profilers)
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        by_name: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            agg = by_name.setdefault(span["name"], {"count": 0, "total_ms": 0.0})
+            agg["count"] += 1
+            agg["total_ms"] = round(agg["total_ms"] + span["duration_ms"], 3)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "session_id": self.session_id,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "span_totals": by_name,
+        }
+
+
+def top_functions(stats: pstats.Stats, limit: int = 30) -> List[Dict[str, Any]]:
+    """Functions by cumulative time, for a quick look without downloading the .prof."""
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            "function": func,
+            "location": f"{_short_path(filename)}:{line}",
+            "calls": nc,
+            "self_ms": round(tt * 1000, 3),
+            "cumulative_ms": round(ct * 1000, 3),
+        })
+    rows.sort(key=lambda r: -r["cumulative_ms"])
+    return rows[:limit]
+
+
+def _short_path(filename: str) -> str:
+    site = "site-packages" + os.sep
+    if site in filename:
+        return filename.split(site, 1)[1]
+    app_dir = os.sep + "app" + os.sep
+    if app_dir in filename:
+        return "app" + os.sep + filename.rsplit(app_dir, 1)[1]
+    return filename
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer: {id}.prof (pstats, opens in snakeviz / `python -m pstats`)
+    and {id}.json (request info, spans, top functions). The oldest profiles are dropped
+    beyond max_files.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str, ext: str) -> Optional[str]:
+        if not re.fullmatch(r"[0-9a-f]{12}", profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}.{ext}")
+
+    def save(self, profile: RequestProfile):
+        os.makedirs(self.directory, exist_ok=True)
+        stats = profile.stats()
+        record = profile.summary()
+        record["spans"] = profile.spans
+        record["top_functions"] = top_functions(stats) if stats else []
+        with self._lock:
+            if stats is not None:
+                stats.dump_stats(self._path(profile.id, "prof"))
+            with open(self._path(profile.id, "json"), "w") as f:
+                json.dump(record, f)
+            self._evict()
+
+    def _evict(self):
+        records = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".json")),
+            key=lambda e: (e.stat().st_mtime_ns, e.name)
+        )
+        for entry in records[:max(0, len(records) - self.max_files)]:
+            profile_id = entry.name[:-len(".json")]
+            for ext in ("json", "prof"):
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}.{ext}"))
+                except FileNotFoundError:
+                    pass
+
+    def list(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        items = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue  # evicted or half-written
+            if session_id and record.get("session_id") != session_id:
+                continue
+            record.pop("spans", None)
+            record.pop("top_functions", None)
+            items.append(record)
+        items.sort(key=lambda r: -r["started_at"])
+        return items
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, "json")
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def raw_path(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, "prof")
+        return path if path and os.path.exists(path) else None
+
+
+class Profiler:
+    """Decides which requests to profile. sample_rate can be changed at runtime (admin endpoint)."""
+
+    def __init__(self, store: ProfileStore, sample_rate: float = 0.0):
+        self.store = store
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        directory = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "interviewer_profiles")
+        return cls(
+            ProfileStore(directory, max_files=int(os.getenv("PROFILE_MAX_FILES", "50"))),
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        )
+
+    def trigger(self, scope) -> Optional[str]:
+        """Why this request should be profiled ("header", "query", "sample"), or None."""
+        requested = None
+        admin_token = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile" and value not in (b"0", b"false"):
+                requested = "header"
+            elif name == b"x-admin-token":
+                admin_token = value.decode("latin-1")
+        if requested is None and b"profile=" in scope.get("query_string", b""):
+            flag = parse_qs(scope["query_string"].decode("latin-1")).get("profile", ["0"])[0]
+            if flag not in ("0", "false"):
+                requested = "query"
+        if requested is not None:
+            # Same rule as the admin endpoints: open unless ADMIN_TOKEN is set
+            expected = os.getenv("ADMIN_TOKEN")
+            if not expected or admin_token == expected:
+                return requested
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+
+profiler = Profiler.from_env()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: profiles selected HTTP requests and adds an X-Profile-Id response header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        trigger = profiler.trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        import asyncio
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+        status = {}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.stop(status.get("code"))
+            _current.reset(token)
+            try:
+                await asyncio.to_thread(profiler.store.save, profile)
+            except Exception as e:
+                print(f"Profile save failed ({profile.id}): {e}")
+
+
+def span(name: str):
+    """Records a span (and profiles this thread) if the current request is being profiled."""
+    profile = _current.get()
+    if profile is None:
+        return _NOOP
+    return profile.span(name)
+
+
+def profiled(name: str):
+    """Decorator form of span(). A no-op at import time when PROFILING=off."""
+    def decorate(fn):
+        if not PROFILING_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            with profile.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
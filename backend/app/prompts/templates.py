@@ -69,7 +69,8 @@ CRITICAL: Set 'followup_needed' to True if:
 3. Answer is too vague, generic, or short (< 30 words) for a technical question.
 4. Candidate dodged the question.
 
-If 'followup_needed' is True, provide a 'followup_reason' and optionally a 'followup_question'.
+If 'followup_needed' is True, provide a 'followup_reason' and a 'followup_question': one concise question,
+addressed to the candidate, that probes the most important missing point.
 """
 
 EVALUATE_ANSWER_USER_PROMPT = """Question: {question}
@@ -80,6 +81,52 @@ Candidate Answer: {answer}
 Provide a detailed Evaluation.
 """
 
+# --- Fused Evaluate-and-Ask (FUSED_TURNS) ---
+# Same rubric as single-answer evaluation, plus the next question in the same response.
+FUSED_TURN_SYSTEM_PROMPT = EVALUATE_ANSWER_SYSTEM_PROMPT + """
+In the same response, also write the interviewer's NEXT question in 'next_question':
+- Set 'next_kind' to "followup" if 'followup_needed' is True, otherwise "main". Only use a kind listed under Allowed Next Kinds.
+- A follow-up stays on the current question's topic and targets the missing points. Keep it concise.
+- A main question moves to the Next Topic, builds on the Resume Summary and Transcript, and does NOT repeat earlier questions.
+"""
+
+FUSED_TURN_USER_PROMPT = """Role: {role}
+Difficulty: {difficulty}
+Resume Summary: {resume_summary}
+
+Transcript History:
+{transcript_history}
+
+Question: {question}
+Expected Points: {expected_points}
+
+Candidate Answer: {answer}
+
+Allowed Next Kinds: {allowed_kinds}
+Next Topic (for a main question): {next_topic}
+
+Provide the Evaluation of this answer and the next question (follow-up, or main question {question_index}).
+"""
+
+# --- Batch Evaluation ---
+# Same rubric as single-answer evaluation; only the framing and output shape differ.
+BATCH_EVALUATE_SYSTEM_PROMPT = EVALUATE_ANSWER_SYSTEM_PROMPT + """
+You will receive SEVERAL independent items, each with an ITEM ID.
+Grade every item on its own, exactly as if it were the only answer.
+Return one Evaluation per item in the 'evaluations' list, with 'question_id' set to the item's ITEM ID.
+"""
+
+BATCH_EVALUATE_ITEM_PROMPT = """### ITEM ID: {item_id}
+Question: {question}
+Expected Points: {expected_points}
+
+Candidate Answer: {answer}
+"""
+
+BATCH_EVALUATE_USER_PROMPT = """{items}
+Provide an Evaluation for each of the {count} items above.
+"""
+
 # --- Final Report ---
 REPORT_SYSTEM_PROMPT = """You are generating the final interview feedback report.
 Analyze the entire session history to produce a comprehensive review.
@@ -0,0 +1,364 @@
+import os
+import json
+import time
+import random
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from .metrics import metrics
+
+
+class ProviderError(Exception):
+    """Raised when a provider fails to produce a completion."""
+
+
+class Provider:
+    """
+    A single LLM backend. Implementations return the raw text completion;
+    parsing into the response model is done by LLMClient.
+    """
+    name: str = "base"
+    model: str = ""
+    temperature: float = 0.7
+
+    def complete(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Optional hook to open connections before the first real request."""
+        return None
+
+
+class LangChainProvider(Provider):
+    """Wraps a LangChain chat model (Gemini, Ollama, ...)."""
+
+    def __init__(self, name: str, model: str, llm: Any, temperature: float = 0.7):
+        self.name = name
+        self.model = model
+        self.llm = llm
+        self.temperature = temperature
+
+    def complete(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        from langchain_core.messages import SystemMessage, HumanMessage
+
+        # Pass messages directly (no ChatPromptTemplate) so '{' in the JSON schema is not parsed as a variable.
+        # The system message comes first and is stable per prompt, so providers that cache
+        # repeated prefixes (Gemini implicit caching, Ollama's KV cache) can reuse it.
+        result = self.llm.invoke([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ])
+        record_cached_tokens(self.name, result)
+        return extract_text(result)
+
+
+def record_cached_tokens(provider_name: str, result: Any):
+    """Counts prompt tokens the provider served from its prefix cache, when it reports them."""
+    usage = getattr(result, "usage_metadata", None) or {}
+    cached = (usage.get("input_token_details") or {}).get("cache_read")
+    if cached:
+        metrics.incr(f"llm.prefix_cache.cached_tokens.{provider_name}", cached)
+
+
+def extract_text(result: Any) -> str:
+    if hasattr(result, 'content'):
+        text_output = result.content
+        if isinstance(text_output, list):
+            # Some versions return list of content blocks
+            parts = []
+            for item in text_output:
+                if isinstance(item, str):
+                    parts.append(item)
+                elif isinstance(item, dict):
+                    parts.append(item.get("text", ""))
+                elif hasattr(item, 'text'):
+                    parts.append(item.text)
+                else:
+                    parts.append(str(item))
+            text_output = "".join(parts)
+        return text_output
+    return str(result)
+
+
+# --- Stub Provider (tests, load tests, offline benchmarks) ---
+
+class StubProvider(Provider):
+    """
+    Local provider with configurable latency and failure behaviour.
+    By default it answers with a minimal valid instance of the requested response model.
+
+    prefix_latency stands in for prefilling an uncached system prompt: it is added only
+    when the system prompt wasn't among the last prefix_cache_size seen, the way
+    provider-side prefix caching makes a repeated prefix cheap.
+    """
+
+    def __init__(
+        self,
+        name: str = "stub",
+        latency: Union[float, Callable[[], float]] = 0.0,
+        failure_rate: float = 0.0,
+        responder: Optional[Callable[[str, str, Type[BaseModel]], Union[str, BaseModel, dict]]] = None,
+        model: str = "stub-model",
+        temperature: float = 0.0,
+        seed: Optional[int] = None,
+        prefix_latency: float = 0.0,
+        prefix_cache_size: int = 128,
+    ):
+        self.name = name
+        self.model = model
+        self.temperature = temperature
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.responder = responder
+        self.prefix_latency = prefix_latency
+        self.prefix_cache_size = prefix_cache_size
+        self.prefix_hits = 0
+        self.prefix_misses = 0
+        self._prefixes: "OrderedDict[int, None]" = OrderedDict()
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _prefix_cached(self, system_prompt: str) -> bool:
+        key = hash(system_prompt)
+        with self._lock:
+            hit = key in self._prefixes
+            if hit:
+                self._prefixes.move_to_end(key)
+                self.prefix_hits += 1
+            else:
+                self._prefixes[key] = None
+                if len(self._prefixes) > self.prefix_cache_size:
+                    self._prefixes.popitem(last=False)
+                self.prefix_misses += 1
+        metrics.incr(f"llm.prefix_cache.{'hits' if hit else 'misses'}.{self.name}")
+        return hit
+
+    def complete(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> str:
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.failure_rate
+
+        delay = self.latency() if callable(self.latency) else self.latency
+        if not self._prefix_cached(system_prompt):
+            delay += self.prefix_latency
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ProviderError(f"{self.name}: simulated failure")
+
+        if self.responder is None:
+            return json.dumps(stub_payload(response_model))
+        out = self.responder(system_prompt, user_prompt, response_model)
+        if isinstance(out, BaseModel):
+            return out.model_dump_json()
+        if isinstance(out, dict):
+            return json.dumps(out)
+        return out
+
+
+def stub_payload(response_model: Type[BaseModel]) -> Dict[str, Any]:
+    """Builds a minimal dict that validates against response_model."""
+    payload = {}
+    for field_name, field in response_model.model_fields.items():
+        if not field.is_required():
+            continue
+        payload[field_name] = _stub_value(field.annotation, field)
+    return payload
+
+
+def _stub_value(annotation: Any, field: Any = None) -> Any:
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _stub_value(args[0]) if args else None
+    if origin is Literal:
+        return get_args(annotation)[0]
+    if origin in (list, List):
+        return []
+    if origin in (dict, Dict):
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return stub_payload(annotation)
+    if isinstance(annotation, type) and hasattr(annotation, "__members__"):
+        return list(annotation.__members__.values())[0].value
+    if annotation is int:
+        low, high = 0, 10
+        for meta in getattr(field, "metadata", []) or []:
+            low = getattr(meta, "ge", low)
+            high = getattr(meta, "le", high)
+        return (low + high) // 2
+    if annotation is float:
+        return 0.5
+    if annotation is bool:
+        return False
+    return "stub"
+
+
+# --- Health Tracking / Circuit Breaker ---
+
+class CircuitBreaker:
+    """
+    closed -> (N consecutive failures) -> open -> (reset timeout) -> half_open
+    half_open lets a single probe through; success closes, failure re-opens.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if self._clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self._probe_in_flight = False
+            # half_open
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = self._clock()
+
+
+class ProviderHealth:
+    def __init__(self, max_samples: int = 200):
+        self._lock = threading.Lock()
+        self.latencies: Deque[float] = deque(maxlen=max_samples)
+        self.successes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+            self.successes += 1
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:200]
+
+    def p95(self, min_samples: int = 5) -> Optional[float]:
+        with self._lock:
+            if len(self.latencies) < min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "successes": self.successes,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "samples": len(self.latencies),
+            }
+
+
+# --- Builders ---
+
+def request_timeout() -> float:
+    """Socket-level ceiling per provider request; turn deadlines (graph nodes) are usually shorter."""
+    return float(os.getenv("LLM_REQUEST_TIMEOUT_SEC", "60"))
+
+
+def build_google_provider() -> Optional[Provider]:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("CRITICAL WARNING: GOOGLE_API_KEY not found. Gemini provider disabled.")
+        return None
+
+    model_name = os.getenv("GOOGLE_MODEL", "gemini-flash-latest")
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = ChatGoogleGenerativeAI(
+            model=model_name,
+            google_api_key=api_key,
+            temperature=0.7,
+            convert_system_message_to_human=True,
+            timeout=request_timeout()
+        )
+        return LangChainProvider("google", model_name, llm, temperature=0.7)
+    except Exception as e:
+        print(f"Error initializing Gemini: {e}")
+        return None
+
+
+def build_ollama_provider() -> Optional[Provider]:
+    # Requires `ollama pull llama3` (or other model) to be run locally first
+    model_name = os.getenv("OLLAMA_MODEL", "llama3")
+    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+    try:
+        from langchain_ollama import ChatOllama
+        llm = ChatOllama(
+            model=model_name,
+            base_url=base_url,
+            temperature=0.7,
+            client_kwargs={"timeout": request_timeout()}
+        )
+        print(f"Initialized Ollama with model: {model_name}")
+        return LangChainProvider("ollama", model_name, llm, temperature=0.7)
+    except ImportError:
+        print("Error: langchain-ollama not installed. Run `pip install langchain-ollama`.")
+    except Exception as e:
+        print(f"Error initializing Ollama: {e}")
+    return None
+
+
+def build_stub_provider() -> Provider:
+    latency = float(os.getenv("STUB_LLM_LATENCY_SEC", "0"))
+    failure_rate = float(os.getenv("STUB_LLM_FAILURE_RATE", "0"))
+    prefix_latency = float(os.getenv("STUB_LLM_PREFIX_LATENCY_SEC", "0"))
+    return StubProvider(latency=latency, failure_rate=failure_rate, prefix_latency=prefix_latency)
+
+
+PROVIDER_BUILDERS: Dict[str, Callable[[], Optional[Provider]]] = {
+    "google": build_google_provider,
+    "ollama": build_ollama_provider,
+    "stub": build_stub_provider,
+}
+
+
+def build_providers_from_env() -> List[Provider]:
+    """
+    LLM_PROVIDERS is an ordered, comma-separated list (e.g. "google,ollama").
+    Falls back to the single LLM_PROVIDER setting.
+    """
+    names = os.getenv("LLM_PROVIDERS") or os.getenv("LLM_PROVIDER", "google")
+    providers = []
+    for name in [n.strip().lower() for n in names.split(",") if n.strip()]:
+        builder = PROVIDER_BUILDERS.get(name)
+        if not builder:
+            print(f"Unknown LLM provider: {name}. Supported: {', '.join(PROVIDER_BUILDERS)}.")
+            continue
+        provider = builder()
+        if provider:
+            providers.append(provider)
+    return providers
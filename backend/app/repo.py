@@ -1,38 +1,103 @@
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session as DbSession
-from .models import Session, SessionStateResponse
+from sqlalchemy.orm.attributes import set_committed_value
+from .models import Session, SessionStateResponse, ExportFilters
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator
+from .profiling import profiled
 
 class SessionRepo:
     def __init__(self, db: DbSession):
         self.db = db
 
-    def create_session(self, role: str, difficulty: str, state: Dict[str, Any]) -> Session:
+    @profiled("repo.create_session")
+    def create_session(self, role: str, difficulty: str, state: Dict[str, Any], status: str = "ready") -> Session:
         db_session = Session(
             role=role, 
             difficulty=difficulty, 
             state_json=state,
-            state_version=1
+            state_version=1,
+            status=status
         )
         self.db.add(db_session)
         self.db.commit()
         self.db.refresh(db_session)
         return db_session
 
+    @profiled("repo.get_session")
     def get_session(self, session_id: str) -> Optional[Session]:
         return self.db.query(Session).filter(Session.id == session_id).first()
 
+    @profiled("repo.update_session_state")
     def update_session_state(self, session_id: str, new_state: Dict[str, Any]):
+        version = self._bump_version(session_id, **Session.state_columns(new_state))
+        self.db.commit()
+        return self._at_version(session_id, version)
+    
+    @profiled("repo.touch_session")
+    def touch_session(self, session_id: str):
+        """Bumps state_version without rewriting state_json (state lives in the graph checkpointer)."""
+        version = self._bump_version(session_id)
+        self.db.commit()
+        return self._at_version(session_id, version)
+
+    def _bump_version(self, session_id: str, **values) -> Optional[int]:
+        """
+        state_version + 1 (and any other column values) in one UPDATE ... RETURNING, so two
+        writers of a session never get the same version, as a read-modify-write could.
+        """
+        stmt = (
+            update(Session).where(Session.id == session_id)
+            .values(state_version=Session.state_version + 1, **values)
+            .returning(Session.state_version)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).scalar()
+
+    def _at_version(self, session_id: str, version: Optional[int]) -> Optional[Session]:
+        """The session, its state_version pinned to the one this write produced (not a later writer's)."""
+        if version is None:
+            return None
+        session = self.get_session(session_id)
+        set_committed_value(session, "state_version", version)
+        return session
+
+    @profiled("repo.set_status")
+    def set_status(self, session_id: str, status: str, detail: Optional[str] = None):
         session = self.get_session(session_id)
         if session:
-            session.state_json = new_state
-            session.state_version += 1
+            session.status = status
+            session.status_detail = detail
             self.db.commit()
-            self.db.refresh(session)
         return session
-    
+
+    @profiled("repo.end_session")
     def end_session(self, session_id: str):
         session = self.get_session(session_id)
         if session:
             session.is_active = False
             self.db.commit()
+
+    def iter_sessions(self, filters: ExportFilters, page_size: int = 100) -> Iterator[Session]:
+        """
+        Streams sessions matching filters, oldest first.
+        Uses a server-side cursor where the driver supports it, so only one page is held in memory.
+        """
+        stmt = select(Session)
+        if filters.role is not None:
+            stmt = stmt.where(Session.role == filters.role.value)
+        if filters.difficulty is not None:
+            stmt = stmt.where(Session.difficulty == filters.difficulty.value)
+        if filters.created_from is not None:
+            stmt = stmt.where(Session.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Session.created_at < filters.created_to)
+        if filters.is_active is not None:
+            stmt = stmt.where(Session.is_active == filters.is_active)
+
+        stmt = stmt.order_by(Session.created_at.asc(), Session.id.asc())
+        stmt = stmt.execution_options(stream_results=True, yield_per=page_size)
+        for session in self.db.execute(stmt).scalars():
+            yield session
+            # Drop rows from the identity map as we go so memory stays flat
+            self.db.expunge(session)
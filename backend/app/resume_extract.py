@@ -0,0 +1,378 @@
+"""
+Local, deterministic resume summarizer (RESUME_SUMMARY_MODE=local / local_refine).
+
+Resume text is split into sections by their headers. Known skills and concepts are found in
+one pass with an Aho-Corasick automaton built once over a dictionary of names and aliases.
+Projects come from the titles in the projects section, and achievements from award-style or
+quantified bullets. No LLM call; a typical resume takes a few milliseconds.
+"""
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .models import ResumeSummary
+
+# Canonical skill -> aliases (matched case-insensitively, on word boundaries)
+SKILLS: Dict[str, Tuple[str, ...]] = {
+    # Languages
+    "Python": ("python", "python3"),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "js", "es6"),
+    "TypeScript": ("typescript",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    "Go": ("golang",),
+    "Rust": ("rust",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("swift",),
+    "Scala": ("scala",),
+    "Ruby": ("ruby",),
+    "PHP": ("php",),
+    "SQL": ("sql",),
+    "Bash": ("bash", "shell scripting"),
+    "MATLAB": ("matlab",),
+    # Web / frameworks
+    "React": ("react", "react.js", "reactjs"),
+    "Next.js": ("next.js", "nextjs"),
+    "Angular": ("angular", "angularjs"),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "Node.js": ("node.js", "nodejs"),
+    "Express": ("express.js", "expressjs"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring Boot": ("spring boot", "springboot"),
+    "Ruby on Rails": ("ruby on rails", "rails"),
+    ".NET": (".net", "asp.net"),
+    "GraphQL": ("graphql",),
+    "REST APIs": ("restful", "rest api", "rest apis"),
+    "gRPC": ("grpc",),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "css3"),
+    "Tailwind CSS": ("tailwind", "tailwind css", "tailwindcss"),
+    # Data stores / messaging
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MySQL": ("mysql",),
+    "SQLite": ("sqlite",),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "Cassandra": ("cassandra",),
+    "DynamoDB": ("dynamodb",),
+    "Elasticsearch": ("elasticsearch", "elastic search"),
+    "Kafka": ("kafka", "apache kafka"),
+    "RabbitMQ": ("rabbitmq",),
+    "Snowflake": ("snowflake",),
+    "BigQuery": ("bigquery",),
+    # Cloud / infra
+    "AWS": ("aws", "amazon web services"),
+    "GCP": ("gcp", "google cloud", "google cloud platform"),
+    "Azure": ("azure", "microsoft azure"),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "Ansible": ("ansible",),
+    "Jenkins": ("jenkins",),
+    "GitHub Actions": ("github actions",),
+    "CI/CD": ("ci/cd", "cicd", "continuous integration", "continuous delivery"),
+    "Linux": ("linux", "unix"),
+    "Git": ("git",),
+    "Nginx": ("nginx",),
+    "Prometheus": ("prometheus",),
+    "Grafana": ("grafana",),
+    "Airflow": ("airflow", "apache airflow"),
+    "Spark": ("spark", "apache spark", "pyspark"),
+    "Hadoop": ("hadoop",),
+    # ML / data
+    "Machine Learning": ("machine learning", "ml"),
+    "Deep Learning": ("deep learning",),
+    "NLP": ("nlp", "natural language processing"),
+    "Computer Vision": ("computer vision",),
+    "LLMs": ("llm", "llms", "large language models"),
+    "TensorFlow": ("tensorflow",),
+    "PyTorch": ("pytorch",),
+    "scikit-learn": ("scikit-learn", "sklearn"),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "LangChain": ("langchain",),
+    "Tableau": ("tableau",),
+    "Power BI": ("power bi", "powerbi"),
+    "Excel": ("excel", "microsoft excel"),
+    # Product / marketing
+    "A/B Testing": ("a/b testing", "ab testing", "a/b tests", "experimentation"),
+    "Product Roadmapping": ("roadmap", "roadmaps", "roadmapping", "product roadmap"),
+    "Agile": ("agile", "scrum", "kanban"),
+    "Jira": ("jira",),
+    "Figma": ("figma",),
+    "SEO": ("seo", "search engine optimization"),
+    "SEM": ("sem", "search engine marketing"),
+    "Google Analytics": ("google analytics", "ga4"),
+    "Content Marketing": ("content marketing",),
+    "Email Marketing": ("email marketing",),
+    "Social Media Marketing": ("social media marketing", "social media"),
+    "HubSpot": ("hubspot",),
+    "Salesforce": ("salesforce",),
+    "Market Research": ("market research",),
+    "Stakeholder Management": ("stakeholder management",),
+}
+
+# Aliases that are also everyday words: only matched with this exact capitalisation
+CASE_SENSITIVE = {"Go": ("Go",), "Swift": ("Swift",), "Rust": ("Rust",), "Spring Boot": ("Spring",),
+                  "Express": ("Express",), "Excel": ("Excel",), "SEM": ("SEM",)}
+# Case-sensitive forms that also name a season: "Spring 2023" / "Spring '23" is a date, not a skill
+SEASON_FORMS = {"Spring"}
+_YEAR_AFTER = re.compile(r"\s+(?:'\d{2}|\d{4})\b")
+
+# Concepts worth steering questions towards; reported as keywords, not skills
+CONCEPTS: Dict[str, Tuple[str, ...]] = {
+    "Distributed Systems": ("distributed systems", "distributed system"),
+    "Microservices": ("microservices", "microservice", "micro-services"),
+    "System Design": ("system design",),
+    "Scalability": ("scalability", "scalable", "horizontal scaling"),
+    "High Availability": ("high availability", "fault tolerance", "fault-tolerant"),
+    "Caching": ("caching", "cache"),
+    "Load Balancing": ("load balancing", "load balancer"),
+    "Event-Driven Architecture": ("event-driven", "event driven", "pub/sub"),
+    "Data Pipelines": ("data pipeline", "data pipelines", "etl"),
+    "Observability": ("observability", "monitoring", "tracing"),
+    "Performance Optimization": ("latency", "throughput", "performance optimization"),
+    "Security": ("security", "authentication", "oauth", "encryption"),
+    "Testing": ("unit testing", "integration testing", "test automation", "tdd"),
+    "Concurrency": ("concurrency", "multithreading", "multi-threading"),
+    "APIs": ("api", "apis"),
+    "Cloud Infrastructure": ("cloud infrastructure", "infrastructure as code"),
+    "Recommendation Systems": ("recommendation system", "recommender", "recommendations"),
+    "Leadership": ("led a team", "team lead", "mentored", "mentoring"),
+    "Cross-functional Collaboration": ("cross-functional",),
+    "User Research": ("user research", "user interviews", "usability testing"),
+    "Go-to-Market": ("go-to-market", "gtm", "product launch"),
+    "Growth": ("growth", "user acquisition", "retention", "conversion rate"),
+    "Analytics": ("analytics", "dashboards", "kpis", "metrics"),
+    "Brand Strategy": ("brand strategy", "branding", "brand awareness"),
+}
+
+SECTION_HEADERS: Dict[str, Tuple[str, ...]] = {
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+               "technologies", "tech stack", "tools", "tools and technologies", "skills and tools"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "selected projects",
+                 "side projects", "project experience"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship experience"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments", "awards and achievements",
+                     "honors and awards", "achievements and awards", "certifications", "awards and honors"),
+    "education": ("education", "academic background", "qualifications"),
+    "summary": ("summary", "professional summary", "profile", "objective", "about", "about me"),
+}
+
+MAX_SKILLS = 30
+MAX_PROJECTS = 6
+MAX_ACHIEVEMENTS = 6
+MAX_KEYWORDS = 15
+
+_BULLET = re.compile(r"^\s*(?:[-*•▪●◦‣⁃∙·➢►>]|\d{1,2}[.)])\s+")
+_QUANTIFIED = re.compile(r"\d+(?:\.\d+)?\s?%|[$₹€£]\s?\d|\b\d+(?:\.\d+)?\s?[xX]\b|\b\d+[kKmMbB]\+?\b|\btop\s+\d+", re.I)
+_AWARD = re.compile(r"\b(?:award|awarded|won|winner|rank(?:ed)?|finalist|scholarship|hackathon|honou?r|recogni[sz]ed|patent|published)\b", re.I)
+_TITLE_SPLIT = re.compile(r"\s+[|–—]\s+|\s+-\s+|:\s+|\s+\(")
+_DATE = re.compile(r"\b(?:19|20)\d{2}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b", re.I)
+
+
+class Automaton:
+    """
+    Aho-Corasick matcher over lowercase patterns: finds every occurrence of every pattern
+    in one pass over the text, however many patterns there are.
+    """
+
+    def __init__(self, patterns: Dict[str, Any]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for word, payload in patterns.items():
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(word), payload))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yields (start, end, payload) for every match, including overlapping ones."""
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in out[node]:
+                yield i - length + 1, i + 1, payload
+
+
+@lru_cache(maxsize=1)
+def _automaton() -> Automaton:
+    patterns: Dict[str, Tuple[str, str, Optional[str]]] = {}
+    for kind, table in (("concept", CONCEPTS), ("skill", SKILLS)):
+        for canonical, aliases in table.items():
+            for alias in aliases + (canonical.lower(),):
+                patterns[alias] = (kind, canonical, None)
+    for canonical, forms in CASE_SENSITIVE.items():
+        for form in forms:
+            patterns[form.lower()] = ("skill", canonical, form)
+    return Automaton(patterns)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "+#"
+
+
+def find_terms(text: str) -> List[Tuple[int, str, str]]:
+    """
+    Dictionary hits in text as (position, kind, canonical), longest match first where
+    matches overlap, and only on word boundaries ("Java" is not found in "JavaScript").
+    """
+    lowered = text.lower()
+    candidates = []
+    for start, end, (kind, canonical, exact) in _automaton().finditer(lowered):
+        if start > 0 and _is_word_char(lowered[start - 1]):
+            continue
+        if end < len(lowered) and _is_word_char(lowered[end]) and not lowered[end - 1] in "+#":
+            continue
+        if exact is not None and text[start:end] != exact:
+            continue
+        if exact in SEASON_FORMS and _YEAR_AFTER.match(text, end):
+            continue
+        candidates.append((start, end, kind, canonical))
+
+    candidates.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+    hits, covered_to = [], -1
+    for start, end, kind, canonical in candidates:
+        if start < covered_to:
+            continue
+        hits.append((start, kind, canonical))
+        covered_to = end
+    return hits
+
+
+@lru_cache(maxsize=1)
+def _header_lookup() -> Dict[str, str]:
+    return {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+
+
+def _normalize_header(line: str) -> str:
+    line = line.replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z ]", " ", line.lower()).split())
+
+
+def section_of(line: str) -> Tuple[Optional[str], str]:
+    """(section, rest of the line) if the line is a section header ("Skills:", "WORK EXPERIENCE"), else (None, line)."""
+    head, sep, rest = line.partition(":")
+    lookup = _header_lookup()
+    if sep and len(head) <= 40:
+        section = lookup.get(_normalize_header(head))
+        if section:
+            return section, rest.strip()
+    stripped = line.strip()
+    if len(stripped) <= 40:
+        section = lookup.get(_normalize_header(stripped))
+        if section:
+            return section, ""
+    return None, line
+
+
+def segment(text: str) -> Dict[str, List[str]]:
+    """Non-empty lines grouped by section; lines before the first header go under "header"."""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section, rest = section_of(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            if rest:
+                sections[current].append(rest)
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _strip_bullet(line: str) -> str:
+    return _BULLET.sub("", line).strip()
+
+
+def _projects(lines: List[str]) -> List[str]:
+    titles = [line for line in lines if not _BULLET.match(line)]
+    if not titles:  # every entry is a bullet: use each bullet's lead clause
+        titles = [_strip_bullet(line) for line in lines]
+    projects = []
+    for line in titles:
+        title = _TITLE_SPLIT.split(line, maxsplit=1)[0].strip(" ,.;")
+        if len(title) < 3 or _DATE.fullmatch(title) or title in projects:
+            continue
+        projects.append(title[:100])
+        if len(projects) == MAX_PROJECTS:
+            break
+    return projects
+
+
+def _achievements(sections: Dict[str, List[str]]) -> List[str]:
+    picked = [_strip_bullet(line) for line in sections.get("achievements", [])]
+    for name in ("experience", "projects", "summary"):
+        for line in sections.get(name, []):
+            if _BULLET.match(line) or len(line) > 60:
+                text = _strip_bullet(line)
+                if _AWARD.search(text) or _QUANTIFIED.search(text):
+                    picked.append(text)
+    achievements = []
+    for text in picked:
+        text = text[:200]
+        if len(text) >= 8 and text not in achievements:
+            achievements.append(text)
+        if len(achievements) == MAX_ACHIEVEMENTS:
+            break
+    return achievements
+
+
+def extract_summary(text: str) -> ResumeSummary:
+    """ResumeSummary from resume text, without an LLM."""
+    sections = segment(text)
+
+    listed: List[str] = []  # skills as written in the skills section, in order
+    counts: Counter = Counter()
+    concepts: Counter = Counter()
+    for name, lines in sections.items():
+        for _, kind, canonical in find_terms("\n".join(lines)):
+            if kind == "concept":
+                concepts[canonical] += 1
+            elif name == "skills":
+                if canonical not in listed:
+                    listed.append(canonical)
+            else:
+                counts[canonical] += 1
+
+    skills = listed + [s for s, _ in counts.most_common() if s not in listed]
+    # Keywords: what the resume talks about most, concepts first, then skills used in context
+    keywords = [c for c, _ in concepts.most_common()] + [s for s, _ in counts.most_common() if s not in concepts]
+
+    return ResumeSummary(
+        skills=skills[:MAX_SKILLS],
+        projects=_projects(sections.get("projects", [])),
+        achievements=_achievements(sections),
+        keywords=keywords[:MAX_KEYWORDS],
+    )
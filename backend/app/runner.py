@@ -0,0 +1,144 @@
+import os
+import copy
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .graph import get_graph
+from .metrics import metrics
+from .profiling import profiled
+
+# A turn is one of: ("start", None), ("answer", text), ("end", None)
+ACTIONS = ("start", "answer", "end")
+
+
+class GraphRunner:
+    """
+    Stateless runner: every turn passes the whole state in, and the caller saves
+    the whole state that comes back (sessions.state_json). The entry router works
+    out where the interview is from the history lengths.
+    """
+
+    checkpointed = False
+
+    def warm_up(self):
+        get_graph(self.checkpointed)
+
+    def load_state(self, session) -> Dict[str, Any]:
+        return session.state_json
+
+    def stream(self, session_id: str, state: Dict[str, Any], action: str, text: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yields (node, state so far) as each node finishes."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        working = copy.deepcopy(state)
+        if action == "answer":
+            working["answer_history"].append({"question_id": working["current_question"]["id"], "text": text})
+        elif action == "end":
+            working["is_finished"] = True
+
+        merged = dict(working)
+        for update in get_graph().stream(working, stream_mode="updates"):
+            for node, node_update in update.items():
+                if not node_update:
+                    continue
+                merged.update(node_update)
+                yield node, merged
+
+    @profiled("graph")
+    def run(self, session_id: str, state: Dict[str, Any], action: str, text: Optional[str] = None) -> Dict[str, Any]:
+        final = state
+        for _, final in self.stream(session_id, state, action, text):
+            pass
+        return final
+
+
+class CheckpointRunner(GraphRunner):
+    """
+    Runner on the checkpointed graph. State lives in the graph checkpointer
+    (thread_id = session id), so turns only send the candidate's reply, and each
+    step persists just the channels its node changed. Sessions created before
+    checkpointing was enabled are adopted into a thread on their next turn.
+    """
+
+    checkpointed = True
+
+    @staticmethod
+    def _config(session_id: str, checkpoint_id: Optional[str] = None) -> dict:
+        configurable = {"thread_id": session_id}
+        if checkpoint_id:
+            configurable["checkpoint_id"] = checkpoint_id
+        return {"configurable": configurable}
+
+    def load_state(self, session) -> Dict[str, Any]:
+        snapshot = get_graph(True).get_state(self._config(session.id))
+        return snapshot.values or session.state_json
+
+    def _adopt(self, graph, config: dict, state: Dict[str, Any]):
+        """Seeds a thread from a state_json-only session and runs it up to the pending interrupt."""
+        if state.get("final_report"):
+            graph.update_state(config, state, as_node="generate_report")
+            return
+        graph.update_state(config, state, as_node="generate_main_question")
+        for _ in graph.stream(None, config, stream_mode="updates"):
+            pass
+        metrics.incr("checkpoint.adopted_sessions")
+
+    def stream(self, session_id: str, state: Dict[str, Any], action: str, text: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        from langgraph.types import Command
+
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        graph = get_graph(True)
+        config = self._config(session_id)
+
+        if action == "start":
+            graph_input = state
+            merged = dict(state)
+        else:
+            snapshot = graph.get_state(config)
+            if not snapshot.values:
+                self._adopt(graph, config, state)
+                snapshot = graph.get_state(config)
+            merged = dict(snapshot.values)
+            if not snapshot.next:
+                return  # interview already complete
+            graph_input = Command(resume={"type": action, "text": text})
+
+        for update in graph.stream(graph_input, config, stream_mode="updates"):
+            for node, node_update in update.items():
+                if node.startswith("__") or not node_update:
+                    continue
+                merged.update(node_update)
+                yield node, merged
+
+    def history(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest first: one entry per checkpoint with the channels that step changed."""
+        saver = get_graph(True).checkpointer
+        entries = []
+        for item in saver.list(self._config(session_id), limit=limit):
+            checkpoint, metadata = item.checkpoint, item.metadata
+            entries.append({
+                "checkpoint_id": checkpoint["id"],
+                "parent_checkpoint_id": item.parent_config["configurable"]["checkpoint_id"] if item.parent_config else None,
+                "ts": checkpoint["ts"],
+                "step": metadata.get("step"),
+                "source": metadata.get("source"),
+                "updated_channels": sorted(checkpoint.get("updated_channels") or []),
+                "pending_writes": sorted({channel for _, channel, _ in item.pending_writes}),
+            })
+        return entries
+
+    def state_at(self, session_id: str, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = get_graph(True).get_state(self._config(session_id, checkpoint_id))
+        if not snapshot.values:
+            return None
+        return {"values": snapshot.values, "next": list(snapshot.next)}
+
+
+def build_runner_from_env() -> GraphRunner:
+    mode = os.getenv("GRAPH_CHECKPOINT", "off").lower()
+    if mode in ("sql", "on", "true", "1"):
+        return CheckpointRunner()
+    return GraphRunner()
+
+
+graph_runner = build_runner_from_env()
@@ -0,0 +1,240 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as DbSession
+
+from ..fallbacks import effective_evaluations
+from ..metrics import metrics
+from ..models import EvaluationScore, ReportCategoryScore
+from .skill_index import record_skills
+
+SCORE_METRICS = {
+    "correctness": EvaluationScore.correctness_score,
+    "depth": EvaluationScore.depth_score,
+    "structure": EvaluationScore.structure_score,
+    "communication": EvaluationScore.communication_score,
+}
+
+GROUP_COLUMNS = {
+    "role": EvaluationScore.role,
+    "difficulty": EvaluationScore.difficulty,
+    "topic": EvaluationScore.topic,
+    "kind": EvaluationScore.kind,
+}
+
+REPORT_GROUP_COLUMNS = {
+    "role": ReportCategoryScore.role,
+    "difficulty": ReportCategoryScore.difficulty,
+    "category": ReportCategoryScore.category,
+}
+
+
+# --- Materialization ---
+
+def _question_index(state: Dict[str, Any]) -> Dict[str, Dict]:
+    questions = {q["id"]: q for q in state.get("question_history", []) if q and q.get("id")}
+    cur = state.get("current_question")
+    if cur and cur.get("id"):
+        questions.setdefault(cur["id"], cur)
+    return questions
+
+
+def record_evaluations(db: DbSession, session_id: str, state: Dict[str, Any], evaluations: List[Dict], commit: bool = True):
+    """
+    Upserts EvaluationScore rows for the given evaluations (keyed by session + question id).
+    Called once per turn with only the evaluations added in that turn.
+    """
+    if not evaluations:
+        return
+    questions = _question_index(state)
+    ids = [e["question_id"] for e in evaluations]
+    existing = {
+        row.question_id: row
+        for row in db.query(EvaluationScore).filter(
+            EvaluationScore.session_id == session_id,
+            EvaluationScore.question_id.in_(ids)
+        )
+    }
+
+    for e in evaluations:
+        q = questions.get(e["question_id"], {})
+        row = existing.get(e["question_id"])
+        if row is None:
+            row = EvaluationScore(session_id=session_id, question_id=e["question_id"])
+            db.add(row)
+        row.role = state.get("role")
+        row.difficulty = state.get("difficulty")
+        row.topic = q.get("topic", "unknown")
+        row.kind = q.get("kind", "followup" if "_f" in e["question_id"] else "main")
+        row.correctness_score = e.get("correctness_score")
+        row.depth_score = e.get("depth_score")
+        row.structure_score = e.get("structure_score")
+        row.communication_score = e.get("communication_score")
+        row.followup_needed = bool(e.get("followup_needed"))
+
+    metrics.incr("analytics.evaluation_rows", len(evaluations))
+    if commit:
+        db.commit()
+
+
+def record_report(db: DbSession, session_id: str, state: Dict[str, Any], commit: bool = True):
+    report = state.get("final_report")
+    if not report:
+        return
+    db.query(ReportCategoryScore).filter(ReportCategoryScore.session_id == session_id).delete(synchronize_session=False)
+    for category, score in (report.get("category_scores") or {}).items():
+        db.add(ReportCategoryScore(
+            session_id=session_id,
+            role=state.get("role"),
+            difficulty=state.get("difficulty"),
+            category=category,
+            score=score
+        ))
+    if commit:
+        db.commit()
+
+
+def record_turn(db: DbSession, session_id: str, evals_before: int, had_report_before: bool, new_state: Dict[str, Any],
+                summary_before: Optional[Dict] = None):
+    """Materializes whatever a graph run added to the state."""
+    summary = new_state.get("resume_summary")
+    summary_changed = bool(summary) and summary != summary_before
+    if summary_changed:
+        record_skills(db, session_id, summary, commit=False)
+    new_evals = effective_evaluations(new_state)[evals_before:]
+    # Re-graded provisional evaluations (rare; upserted again each turn, keyed by question id)
+    regraded = list((new_state.get("deferred_evaluations") or {}).values())
+    if regraded:
+        new_evals = list({e["question_id"]: e for e in regraded + new_evals}.values())
+    if new_evals:
+        record_evaluations(db, session_id, new_state, new_evals, commit=False)
+    if new_state.get("final_report") and not had_report_before:
+        record_report(db, session_id, new_state, commit=False)
+    if summary_changed or new_evals or (new_state.get("final_report") and not had_report_before):
+        db.commit()
+
+
+def backfill_session(db: DbSession, session_id: str, state: Dict[str, Any]):
+    record_evaluations(db, session_id, state, effective_evaluations(state), commit=False)
+    record_report(db, session_id, state, commit=False)
+    if state.get("resume_summary"):
+        record_skills(db, session_id, state["resume_summary"], commit=False)
+    db.commit()
+
+
+# --- Queries ---
+
+def _summarize_histogram(hist: Dict[int, int]) -> Dict[str, Any]:
+    """
+    Scores are small integers, so GROUP BY score yields an exact histogram;
+    count/avg/percentiles are derived from it instead of scanning rows.
+    """
+    total = sum(hist.values())
+    if not total:
+        return {"count": 0, "avg": None, "p50": None, "p90": None, "p95": None, "histogram": {}}
+
+    ordered = sorted(hist.items())
+    avg = sum(score * n for score, n in ordered) / total
+
+    def pct(p):
+        rank = max(1, math.ceil(p / 100 * total))  # nearest-rank
+        seen = 0
+        for score, n in ordered:
+            seen += n
+            if seen >= rank:
+                return score
+        return ordered[-1][0]
+
+    return {
+        "count": total,
+        "avg": round(avg, 3),
+        "p50": pct(50),
+        "p90": pct(90),
+        "p95": pct(95),
+        "histogram": {str(score): n for score, n in ordered},
+    }
+
+
+def _grouped(rows, n_groups: int, group_by: List[str]) -> List[Dict[str, Any]]:
+    groups: Dict[tuple, Dict[int, int]] = {}
+    for row in rows:
+        key = tuple(row[:n_groups])
+        score, count = row[n_groups], row[n_groups + 1]
+        if score is None:
+            continue
+        groups.setdefault(key, {})[int(score)] = count
+
+    out = []
+    for key, hist in sorted(groups.items(), key=lambda kv: tuple(str(k) for k in kv[0])):
+        entry = dict(zip(group_by, key))
+        entry.update(_summarize_histogram(hist))
+        out.append(entry)
+    return out
+
+
+def evaluation_stats(
+    db: DbSession,
+    metric: str = "depth",
+    group_by: Optional[List[str]] = None,
+    role: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    topic: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    if metric not in SCORE_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    group_by = group_by or []
+    for g in group_by:
+        if g not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by: {g}")
+
+    score_col = SCORE_METRICS[metric]
+    group_cols = [GROUP_COLUMNS[g] for g in group_by]
+    query = db.query(*group_cols, score_col, func.count())
+    if role:
+        query = query.filter(EvaluationScore.role == role)
+    if difficulty:
+        query = query.filter(EvaluationScore.difficulty == difficulty)
+    if topic:
+        query = query.filter(EvaluationScore.topic == topic)
+    if created_from:
+        query = query.filter(EvaluationScore.created_at >= created_from)
+    if created_to:
+        query = query.filter(EvaluationScore.created_at < created_to)
+
+    rows = query.group_by(*group_cols, score_col).all()
+    return _grouped(rows, len(group_cols), group_by)
+
+
+def report_stats(
+    db: DbSession,
+    category: Optional[str] = None,
+    group_by: Optional[List[str]] = None,
+    role: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    group_by = group_by or ["category"]
+    for g in group_by:
+        if g not in REPORT_GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by: {g}")
+
+    group_cols = [REPORT_GROUP_COLUMNS[g] for g in group_by]
+    query = db.query(*group_cols, ReportCategoryScore.score, func.count())
+    if category:
+        query = query.filter(ReportCategoryScore.category == category)
+    if role:
+        query = query.filter(ReportCategoryScore.role == role)
+    if difficulty:
+        query = query.filter(ReportCategoryScore.difficulty == difficulty)
+    if created_from:
+        query = query.filter(ReportCategoryScore.created_at >= created_from)
+    if created_to:
+        query = query.filter(ReportCategoryScore.created_at < created_to)
+
+    rows = query.group_by(*group_cols, ReportCategoryScore.score).all()
+    return _grouped(rows, len(group_cols), group_by)
@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Union
+
+from ..llm import llm_client
+from ..metrics import metrics
+from ..models import BatchEvaluationItem, BatchEvaluationFailure, Evaluation, EvaluationBatch
+from ..prompts.templates import (
+    BATCH_EVALUATE_SYSTEM_PROMPT, BATCH_EVALUATE_ITEM_PROMPT, BATCH_EVALUATE_USER_PROMPT,
+    EVALUATE_ANSWER_SYSTEM_PROMPT, EVALUATE_ANSWER_USER_PROMPT
+)
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("BATCH_EVAL_TOKEN_BUDGET", "6000"))
+# Rough output allowance per item (an Evaluation is ~150-250 tokens of JSON)
+OUTPUT_TOKENS_PER_ITEM = 250
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap approximation (~4 chars per token); good enough for packing."""
+    return len(text) // 4 + 1
+
+
+def render_item(item: BatchEvaluationItem) -> str:
+    return BATCH_EVALUATE_ITEM_PROMPT.format(
+        item_id=item.id,
+        question=item.question,
+        expected_points=str(item.expected_points),
+        answer=item.answer
+    )
+
+
+def pack_batches(items: Iterable[BatchEvaluationItem], token_budget: int = DEFAULT_TOKEN_BUDGET) -> Iterator[List[BatchEvaluationItem]]:
+    """
+    Greedily packs items into batches whose prompt + expected output fits token_budget.
+    An item larger than the budget on its own still gets a batch of one.
+    """
+    overhead = estimate_tokens(BATCH_EVALUATE_SYSTEM_PROMPT) + 300  # schema instructions
+    batch: List[BatchEvaluationItem] = []
+    used = overhead
+    for item in items:
+        cost = estimate_tokens(render_item(item)) + OUTPUT_TOKENS_PER_ITEM
+        if batch and used + cost > token_budget:
+            yield batch
+            batch, used = [], overhead
+        batch.append(item)
+        used += cost
+    if batch:
+        yield batch
+
+
+def evaluate_single(item: BatchEvaluationItem) -> Evaluation:
+    evaluation = llm_client.generate_structured(
+        system_prompt=EVALUATE_ANSWER_SYSTEM_PROMPT,
+        user_prompt=EVALUATE_ANSWER_USER_PROMPT.format(
+            question=item.question,
+            expected_points=str(item.expected_points),
+            answer=item.answer
+        ),
+        response_model=Evaluation
+    )
+    evaluation.question_id = item.id
+    return evaluation
+
+
+def evaluate_batch(batch: List[BatchEvaluationItem]) -> List[Evaluation]:
+    """Scores one packed batch; items the model skipped are re-scored individually."""
+    if len(batch) == 1:
+        return [evaluate_single(batch[0])]
+
+    result = llm_client.generate_structured(
+        system_prompt=BATCH_EVALUATE_SYSTEM_PROMPT,
+        user_prompt=BATCH_EVALUATE_USER_PROMPT.format(
+            items="\n".join(render_item(i) for i in batch),
+            count=len(batch)
+        ),
+        response_model=EvaluationBatch
+    )
+    metrics.incr("batch_eval.llm_calls")
+
+    by_id = {e.question_id: e for e in result.evaluations}
+    out = []
+    for item in batch:
+        evaluation = by_id.get(item.id)
+        if evaluation is None:
+            metrics.incr("batch_eval.single_fallbacks")
+            evaluation = evaluate_single(item)
+        out.append(evaluation)
+    return out
+
+
+def evaluate_items(items: Iterable[BatchEvaluationItem], token_budget: Optional[int] = None, max_workers: Optional[int] = None) -> Iterator[Union[Evaluation, BatchEvaluationFailure]]:
+    """
+    Scores items in packed batches, running batches concurrently.
+    Yields Evaluations as each batch finishes (not in input order); a batch that
+    fails entirely yields one BatchEvaluationFailure per item instead of aborting the run.
+    Closing the generator early (the client went away) cancels the batches not yet started.
+    Item ids must be unique: results are matched back to items by id.
+    """
+    batches = list(pack_batches(items, token_budget or DEFAULT_TOKEN_BUDGET))
+    workers = max_workers or llm_client.max_concurrency
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-eval")
+    try:
+        futures = {pool.submit(evaluate_batch, b): b for b in batches}
+        for fut in as_completed(futures):
+            try:
+                evaluations = fut.result()
+            except Exception as e:
+                print(f"Batch evaluation failed: {e}")
+                metrics.incr("batch_eval.failed_items", len(futures[fut]))
+                for item in futures[fut]:
+                    yield BatchEvaluationFailure(question_id=item.id, error=str(e))
+                continue
+            for evaluation in evaluations:
+                metrics.incr("batch_eval.items")
+                yield evaluation
+    finally:
+        # Don't wait for batches nobody will read; ones already running finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
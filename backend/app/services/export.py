@@ -0,0 +1,176 @@
+import io
+import os
+import csv
+import json
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Iterator, Optional, Tuple
+
+from ..database import SessionLocal
+from ..metrics import metrics
+from ..models import ExportFilters
+from ..repo import SessionRepo
+from ..shared_cache import shared_cache
+
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "100"))
+
+
+class _ChunkSink:
+    """
+    Write-only file object for zipfile/tarfile.
+    Without tell()/seek() zipfile switches to streaming mode (data descriptors).
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _render(session_id: str, state: dict) -> bytes:
+    # Top-level so it can be pickled into a worker process. Only renders: the shared
+    # cache is read and filled by the exporting process, so workers never touch the DB
+    from .report import render_report_pdf_bytes
+    return render_report_pdf_bytes(session_id, state)
+
+
+def _submit_pdf(executor: Executor, session_id: str, state: dict):
+    """The cached PDF bytes, or (cache key, future) of a render on the pool."""
+    from .report import report_pdf_key
+
+    key = report_pdf_key(session_id, state)
+    cached = shared_cache.get("report_pdf", key)
+    if cached is not None:
+        metrics.incr("export.pdf_cache_hits")
+        return cached
+    return key, executor.submit(_render, session_id, state)
+
+
+def _iter_reports(filters: ExportFilters, include_pdf: bool, executor: Optional[Executor], page_size: int) -> Iterator[Tuple[dict, dict, Optional[bytes]]]:
+    """
+    Yields (meta, final_report, pdf_bytes) in created_at order.
+    PDF renders run ahead on the pool, bounded to a small window so memory stays flat.
+    """
+    db = SessionLocal()
+    try:
+        repo = SessionRepo(db)
+        window = deque()
+        max_in_flight = max(1, EXPORT_WORKERS * 2)
+
+        for session in repo.iter_sessions(filters, page_size=page_size):
+            state = session.state_json or {}
+            report = state.get("final_report")
+            meta = {
+                "session_id": session.id,
+                "role": session.role,
+                "difficulty": session.difficulty,
+                "created_at": session.created_at.isoformat() if session.created_at else "",
+                "is_active": session.is_active,
+                "overall_score": report.get("overall_score") if report else "",
+            }
+            if not report:
+                metrics.incr("export.skipped_no_report")
+                continue
+
+            pdf = None
+            if include_pdf:
+                pdf = _submit_pdf(executor, session.id, {"final_report": report, "transcript": state.get("transcript", [])})
+            window.append((meta, report, pdf))
+
+            while len(window) >= max_in_flight:
+                yield _resolve(window.popleft())
+
+        while window:
+            yield _resolve(window.popleft())
+    finally:
+        db.close()
+
+
+def _resolve(item):
+    meta, report, pdf = item
+    if pdf is None or isinstance(pdf, bytes):
+        return meta, report, pdf
+    key, future = pdf
+    try:
+        content = future.result()
+    except Exception as e:
+        print(f"PDF Gen Error ({meta['session_id']}): {e}")
+        metrics.incr("export.pdf_errors")
+        return meta, report, None
+    from .report import REPORT_PDF_TTL_SEC
+    shared_cache.set("report_pdf", key, content, ttl=REPORT_PDF_TTL_SEC)
+    return meta, report, content
+
+
+def _index_csv(rows) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=["session_id", "role", "difficulty", "created_at", "is_active", "overall_score", "pdf"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def _make_executor(include_pdf: bool) -> Optional[Executor]:
+    if not include_pdf:
+        return None
+    # ReportLab rendering is CPU-bound; processes sidestep the GIL. Spawned rather than
+    # forked: a fork of the server would inherit its pooled DB connections and any lock
+    # held by another thread at that moment
+    if EXPORT_WORKERS > 1:
+        return ProcessPoolExecutor(max_workers=EXPORT_WORKERS, mp_context=get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def stream_export(filters: ExportFilters, fmt: str = "zip", include_pdf: bool = True, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[bytes]:
+    """
+    Streams an archive of {session_id}/report.json (+ report.pdf) for every
+    matching session with a final report, followed by an index.csv.
+    fmt is "zip" or "tar" (gzip-compressed).
+    """
+    if fmt not in ("zip", "tar"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    sink = _ChunkSink()
+    rows = []
+    executor = _make_executor(include_pdf)
+    try:
+        if fmt == "zip":
+            archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+            add = lambda name, data: archive.writestr(name, data)
+        else:
+            archive = tarfile.open(fileobj=sink, mode="w|gz")
+
+            def add(name, data):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        with archive:
+            for meta, report, pdf in _iter_reports(filters, include_pdf, executor, page_size):
+                sid = meta["session_id"]
+                add(f"{sid}/report.json", json.dumps(report, indent=2).encode("utf-8"))
+                if pdf is not None:
+                    add(f"{sid}/report.pdf", pdf)
+                rows.append({**meta, "pdf": pdf is not None})
+                metrics.incr("export.sessions")
+                yield sink.drain()
+
+            add("index.csv", _index_csv(rows))
+        yield sink.drain()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,71 @@
+"""
+Lightweight report renderer (PDF_RENDERER=fpdf): fpdf2 core fonts, no flowable layout.
+Much cheaper than ReportLab on long transcripts; text is limited to Latin-1.
+"""
+from typing import List, Optional
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
 from ..models import FinalReport
 
+NEXT_LINE = dict(new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
 class PDFReport(FPDF):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._word_widths = {}
+
     def header(self):
         self.set_font('Helvetica', 'B', 15)
-        self.cell(0, 10, 'Interviewer.AI - Session Report', 0, 1, 'C')
+        self.cell(0, 10, 'Interviewer.AI - Session Report', align='C', **NEXT_LINE)
         self.ln(5)
 
     def footer(self):
         self.set_y(-15)
         self.set_font('Helvetica', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+        self.cell(0, 10, f'Page {self.page_no()}', align='C')
+
+    def wrapped_text(self, text: str, h: float):
+        """
+        Writes text wrapped to the page width, one text() call per line, breaking pages as
+        it goes. Same output as multi_cell for plain text, but multi_cell's line breaker
+        re-measures the line on every character, which dominates render time on long answers.
+        """
+        width = self.w - self.l_margin - self.r_margin
+        space = self._word_width(" ")
+        for paragraph in text.splitlines() or [""]:
+            widths = [(word, self._word_width(word)) for word in paragraph.split()]
+            if any(w > width for _, w in widths):
+                # A word wider than the page (URL, hash): let multi_cell break it mid-word
+                self.multi_cell(width, h, paragraph, **NEXT_LINE)
+                continue
+            line, line_w = [], 0.0
+            for word, w in widths:
+                if line and line_w + space + w > width:
+                    self._text_line(" ".join(line), h)
+                    line, line_w = [], 0.0
+                line_w = line_w + space + w if line else w
+                line.append(word)
+            self._text_line(" ".join(line), h)
 
-def generate_pdf_report(report: FinalReport) -> bytes:
+    def _word_width(self, word: str) -> float:
+        key = (self.font_family, self.font_style, self.font_size_pt, word)
+        width = self._word_widths.get(key)
+        if width is None:
+            width = self._word_widths[key] = self.get_string_width(word)
+        return width
+
+    def _text_line(self, line: str, h: float):
+        if self.y + h > self.page_break_trigger:
+            self.add_page()
+        if line:
+            self.text(self.l_margin, self.y + h * 0.7, line)  # text() takes the baseline
+        self.set_y(self.y + h)
+
+def generate_pdf_report(report: FinalReport, session_id: Optional[str] = None, transcript: Optional[List[dict]] = None) -> bytes:
+    """
+    Renders the report and returns the PDF bytes. transcript is a list of
+    {role, text} turns, already capped by the caller; it starts on its own page.
+    """
     pdf = PDFReport()
     pdf.add_page()
     
@@ -21,31 +74,29 @@ def generate_pdf_report(report: FinalReport) -> bytes:
         # Handle unicode
         text = text.encode('latin-1', 'replace').decode('latin-1')
         
-        # Calculate effective page width manually to avoid "Not enough space" error
-        # standard A4 is 210mm. Default margins are 1cm (10mm).
-        # We can also use pdf.epw if available in fpdf2, or pdf.w - pdf.l_margin - pdf.r_margin
-        effective_width = pdf.w - pdf.l_margin - pdf.r_margin
-        if effective_width <= 0:
-            effective_width = 190 # Fallback default
-            
-        pdf.multi_cell(effective_width, 6, text)
+        pdf.wrapped_text(text, 6)
+
+    if session_id:
+        pdf.set_font("Helvetica", "", 9)
+        pdf.cell(0, 6, f"Session ID: {session_id}", **NEXT_LINE)
+        pdf.ln(2)
 
     # Overall Score
     pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 10, f"Overall Score: {report.overall_score}/10", 0, 1)
+    pdf.cell(0, 10, f"Overall Score: {report.overall_score}/10", **NEXT_LINE)
     pdf.ln(5)
     
     # Category Scores
     pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Category Breakdown:", 0, 1)
+    pdf.cell(0, 10, "Category Breakdown:", **NEXT_LINE)
     pdf.set_font("Helvetica", "", 11)
     for cat, score in report.category_scores.items():
-        pdf.cell(0, 7, f"- {cat}: {score}/10", 0, 1)
+        pdf.cell(0, 7, f"- {cat}: {score}/10", **NEXT_LINE)
     pdf.ln(5)
     
     # Strengths
     pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Strengths:", 0, 1)
+    pdf.cell(0, 10, "Strengths:", **NEXT_LINE)
     pdf.set_font("Helvetica", "", 10)
     for s in report.strengths:
         safe_multi_cell(f"- {s}")
@@ -53,7 +104,7 @@ def generate_pdf_report(report: FinalReport) -> bytes:
     
     # Weaknesses
     pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Areas for Improvement:", 0, 1)
+    pdf.cell(0, 10, "Areas for Improvement:", **NEXT_LINE)
     pdf.set_font("Helvetica", "", 10)
     for w in report.weaknesses:
         safe_multi_cell(f"- {w}")
@@ -61,7 +112,7 @@ def generate_pdf_report(report: FinalReport) -> bytes:
     
     # 7-Day Plan
     pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "7-Day Improvement Plan:", 0, 1)
+    pdf.cell(0, 10, "7-Day Improvement Plan:", **NEXT_LINE)
     pdf.set_font("Helvetica", "", 10)
     for item in report.improvement_plan_7_days:
         safe_multi_cell(f"- {item}")
@@ -71,7 +122,7 @@ def generate_pdf_report(report: FinalReport) -> bytes:
     if report.improved_answers:
         pdf.add_page()
         pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(0, 10, "Analysis of Weakest Questions:", 0, 1)
+        pdf.cell(0, 10, "Analysis of Weakest Questions:", **NEXT_LINE)
         pdf.ln(2)
         
         for item in report.improved_answers:
@@ -83,5 +134,17 @@ def generate_pdf_report(report: FinalReport) -> bytes:
                 safe_multi_cell(f"{v}")
                 pdf.ln(2)
             pdf.ln(5)
-            
-    return pdf.output()
+
+    # Transcript (fpdf2 breaks pages itself as the text runs past the bottom margin)
+    if transcript:
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(0, 10, "Session Transcript:", **NEXT_LINE)
+        for turn in transcript:
+            pdf.set_font("Helvetica", "B", 10)
+            safe_multi_cell(f"{turn.get('role', 'unknown').upper()}:")
+            pdf.set_font("Helvetica", "", 10)
+            safe_multi_cell(turn.get("text") or "")
+            pdf.ln(2)
+
+    return bytes(pdf.output())
@@ -4,16 +4,73 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, ListFlowable, ListItem
 from reportlab.lib.units import inch
 from datetime import datetime
+import io
+from typing import List, Optional
+from xml.sax.saxutils import escape
+import os
+import json
 
 from app.models import FinalReport
+from app.profiling import profiled
+from app.singleflight import SingleFlight
 
-def generate_report_pdf(final_report: FinalReport, session_id: str, transcript: list) -> str:
+# "reportlab" (default): richer layout, tables and styled lists. "fpdf": app/services/pdf.py,
+# several times cheaper to render on long transcripts.
+PDF_RENDERER = os.getenv("PDF_RENDERER", "reportlab").lower()
+# Transcript caps (0 = no cap): turns shown, and characters per turn
+PDF_TRANSCRIPT_MAX_TURNS = int(os.getenv("PDF_TRANSCRIPT_MAX_TURNS", "0"))
+PDF_TRANSCRIPT_MAX_CHARS = int(os.getenv("PDF_TRANSCRIPT_MAX_CHARS", "0"))
+# Long turns are laid out as paragraphs of at most this many characters, so ReportLab
+# can break them across pages without re-wrapping the whole turn on every split
+_PARAGRAPH_CHARS = 1500
+
+
+def transcript_for_pdf(transcript: List[dict]) -> List[dict]:
+    """The state's transcript turns with the PDF_TRANSCRIPT_* caps applied."""
+    turns = list(transcript or [])
+    omitted = 0
+    if PDF_TRANSCRIPT_MAX_TURNS and len(turns) > PDF_TRANSCRIPT_MAX_TURNS:
+        omitted = len(turns) - PDF_TRANSCRIPT_MAX_TURNS
+        turns = turns[:PDF_TRANSCRIPT_MAX_TURNS]
+    if PDF_TRANSCRIPT_MAX_CHARS:
+        turns = [
+            {**t, "text": t["text"][:PDF_TRANSCRIPT_MAX_CHARS].rstrip() + " [...]"}
+            if len(t.get("text") or "") > PDF_TRANSCRIPT_MAX_CHARS else t
+            for t in turns
+        ]
+    if omitted:
+        turns.append({"role": "note", "text": f"{omitted} later turns not shown."})
+    return turns
+
+
+def _paragraphs(text: str) -> List[str]:
+    """Splits a turn at line breaks, then at spaces into chunks of at most _PARAGRAPH_CHARS."""
+    chunks = []
+    for line in text.splitlines():
+        while len(line) > _PARAGRAPH_CHARS:
+            cut = line.rfind(" ", 0, _PARAGRAPH_CHARS)
+            cut = cut if cut > 0 else _PARAGRAPH_CHARS
+            chunks.append(line[:cut])
+            line = line[cut:].lstrip()
+        if line.strip():
+            chunks.append(line)
+    return chunks
+
+
+def _page_number(canvas, doc):
+    canvas.saveState()
+    canvas.setFont("Helvetica", 8)
+    canvas.drawCentredString(A4[0] / 2, 40, f"Page {doc.page}")
+    canvas.restoreState()
+
+def generate_report_pdf(final_report: FinalReport, session_id: str, transcript: list) -> bytes:
     """
     Generates a PDF report using ReportLab.
-    Returns the file path to the generated PDF.
+    Returns the PDF bytes; the document is built in memory, so concurrent renders of
+    one session (other workers, export processes) can't clobber each other's output.
     """
-    output_path = f"/tmp/report_{session_id}.pdf"
-    doc = SimpleDocTemplate(output_path, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
     
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name='Justify', alignment=1))
@@ -90,15 +147,76 @@ def generate_report_pdf(final_report: FinalReport, session_id: str, transcript:
         
         story.append(PageBreak())
 
-    # 7. Transcript Loading
-    # (Optional summary or short transcript could go here)
+    # 7. Transcript ({role, text} turns, capped by the caller); its pages are numbered
     if transcript:
         story.append(Paragraph("Session Transcript", styles["Heading2"]))
-        for msg in transcript:
-             role = msg.get("role", "unknown").upper()
-             content = msg.get("content", "")
-             story.append(Paragraph(f"<b>{role}:</b> {content}", styles["Normal"]))
-             story.append(Spacer(1, 6))
-
-    doc.build(story)
-    return output_path
+        for turn in transcript:
+            story.append(Paragraph(f"<b>{escape(turn.get('role', 'unknown').upper())}:</b>", styles["Normal"]))
+            for chunk in _paragraphs(turn.get("text") or ""):
+                story.append(Paragraph(escape(chunk), styles["Normal"]))
+            story.append(Spacer(1, 6))
+
+    doc.build(story, onFirstPage=_page_number, onLaterPages=_page_number)
+    return buffer.getvalue()
+
+
+def _render_reportlab(report: FinalReport, session_id: str, transcript: List[dict]) -> bytes:
+    return generate_report_pdf(report, session_id, transcript)
+
+
+def _render_fpdf(report: FinalReport, session_id: str, transcript: List[dict]) -> bytes:
+    from app.services.pdf import generate_pdf_report
+    return generate_pdf_report(report, session_id, transcript)
+
+
+RENDERERS = {"reportlab": _render_reportlab, "fpdf": _render_fpdf}
+
+
+@profiled("pdf")
+def render_report_pdf_bytes(session_id: str, state: dict, renderer: Optional[str] = None) -> bytes:
+    """
+    Renders the report and transcript of a session state with PDF_RENDERER (or renderer)
+    and returns the PDF bytes. Shared by /report.pdf and the bulk exporter.
+    """
+    name = renderer or PDF_RENDERER
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown PDF_RENDERER: {name}")
+    report_data = FinalReport(**state["final_report"])
+    return RENDERERS[name](report_data, session_id, transcript_for_pdf(state.get("transcript")))
+
+
+REPORT_PDF_TTL_SEC = float(os.getenv("REPORT_PDF_CACHE_TTL_SEC", str(24 * 3600)))
+_pdf_flight = SingleFlight("report_pdf")
+
+
+def report_pdf_key(session_id: str, state: dict) -> str:
+    """Shared cache key ("report_pdf" namespace) of a session's rendered report."""
+    from app.shared_cache import shared_cache
+
+    content = json.dumps(
+        [PDF_RENDERER, state.get("final_report"), transcript_for_pdf(state.get("transcript"))], sort_keys=True, default=str
+    )
+    return shared_cache.make_key(session_id, content)
+
+
+def report_pdf_bytes(session_id: str, state: dict) -> bytes:
+    """
+    render_report_pdf_bytes through the shared cache: a report is rendered once across
+    workers, and concurrent requests for it wait for that render. Requests in the same
+    worker join the in-flight call directly, without lease polling.
+    """
+    from app.shared_cache import shared_cache
+
+    key = report_pdf_key(session_id, state)
+    return _pdf_flight.do(key, lambda: shared_cache.get_or_compute(
+        "report_pdf", key, lambda: render_report_pdf_bytes(session_id, state), ttl=REPORT_PDF_TTL_SEC
+    ))
+
+
+def warm_up():
+    """Loads the renderer's fonts/style sheet so the first PDF request doesn't pay for it."""
+    if PDF_RENDERER == "fpdf":
+        from app.services.pdf import PDFReport
+        PDFReport().add_page()
+    else:
+        getSampleStyleSheet()
@@ -1,23 +1,131 @@
 import io
-from pypdf import PdfReader
+import os
+import hashlib
+import tempfile
+from typing import BinaryIO, Optional, Union
 
-def parse_resume_pdf(file_content: bytes) -> str:
+from ..metrics import metrics
+
+# Upload limits, checked while the upload is copied (size, PDF header) and when it is opened (pages)
+RESUME_MAX_BYTES = int(float(os.getenv("RESUME_MAX_MB", "10")) * 1024 * 1024)
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+# Uploads larger than this spill from memory to a temp file
+RESUME_SPOOL_MEMORY_BYTES = int(os.getenv("RESUME_SPOOL_MEMORY_BYTES", str(1024 * 1024)))
+RESUME_TEXT_TTL_SEC = float(os.getenv("RESUME_TEXT_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+_CHUNK_BYTES = 64 * 1024
+_PDF_HEADER_WINDOW = 1024  # readers accept %PDF- anywhere in the first 1 KB
+
+
+class ResumeRejected(Exception):
+    """The upload breaks a limit or isn't a PDF; status_code/detail are meant for the HTTP response."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ResumeUpload:
+    """
+    An uploaded resume copied to a spooled temp file (memory up to RESUME_SPOOL_MEMORY_BYTES,
+    disk beyond), with its size and SHA-256. The hash is the upload's content key.
+    """
+
+    def __init__(self, file: BinaryIO, size: int, sha256: str):
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        self.file.close()
+
+
+async def spool_upload(upload, max_bytes: Optional[int] = None) -> ResumeUpload:
+    """
+    Copies an UploadFile chunk by chunk, hashing as it goes. Raises ResumeRejected as soon
+    as the upload is over max_bytes or its first KB has no PDF header.
+    """
+    max_bytes = max_bytes or RESUME_MAX_BYTES
+    spool = tempfile.SpooledTemporaryFile(max_size=RESUME_SPOOL_MEMORY_BYTES)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    try:
+        while True:
+            chunk = await upload.read(_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                metrics.incr("resume.rejected.too_large")
+                raise ResumeRejected(413, f"Resume is larger than {max_bytes // (1024 * 1024)} MB")
+            if len(head) < _PDF_HEADER_WINDOW:
+                head += chunk[:_PDF_HEADER_WINDOW - len(head)]
+                if len(head) >= _PDF_HEADER_WINDOW and b"%PDF-" not in head:
+                    raise _not_pdf()
+            digest.update(chunk)
+            spool.write(chunk)
+        if b"%PDF-" not in head:
+            raise _not_pdf()
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    metrics.observe("resume.upload_bytes", size)
+    return ResumeUpload(spool, size, digest.hexdigest())
+
+
+def _not_pdf() -> ResumeRejected:
+    metrics.incr("resume.rejected.not_pdf")
+    return ResumeRejected(415, "Resume must be a PDF")
+
+
+def parse_resume_pdf(file_content: Union[bytes, BinaryIO], max_pages: Optional[int] = None) -> str:
     """
-    Extracts text from a PDF file content.
+    Extracts text from a PDF (bytes, or a seekable file object read in place).
+    Raises ResumeRejected if it has more than max_pages pages.
     """
+    from pypdf import PdfReader  # imported on first upload, not at app startup
+
+    max_pages = max_pages or RESUME_MAX_PAGES
+    stream = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
     try:
-        reader = PdfReader(io.BytesIO(file_content))
+        reader = PdfReader(stream)
+        if len(reader.pages) > max_pages:
+            metrics.incr("resume.rejected.too_many_pages")
+            raise ResumeRejected(422, f"Resume has more than {max_pages} pages")
         text = ""
         for page in reader.pages:
             text += page.extract_text() + "\n"
-        
+
         # Safety / Cleanup
         # If text is too long (e.g. > 20k chars), truncate it to avoid context window issues/abuse
-        max_chars = 20000 
+        max_chars = 20000
         if len(text) > max_chars:
             text = text[:max_chars] + "\n[TRUNCATED]"
-            
+
         return text.strip()
+    except ResumeRejected:
+        raise
     except Exception as e:
         print(f"Error parsing PDF: {e}")
         return ""
+
+
+def parse_resume_upload(upload: ResumeUpload) -> str:
+    """
+    parse_resume_pdf for an upload, cached by its content hash: the same file (e.g. a
+    shared sample resume) is parsed once across workers. Failed parses aren't cached.
+    """
+    from ..shared_cache import shared_cache
+
+    cached = shared_cache.get("resume_text", upload.sha256)
+    if cached is not None:
+        metrics.incr("resume.text_cache_hits")
+        return cached.decode("utf-8")
+    upload.file.seek(0)
+    text = parse_resume_pdf(upload.file)
+    if text:
+        shared_cache.set("resume_text", upload.sha256, text.encode("utf-8"), ttl=RESUME_TEXT_TTL_SEC)
+    return text
@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as DbSession
+
+from ..metrics import metrics
+from ..models import EvaluationScore, ReportCategoryScore, ScoreFilter, SessionSearchRequest, SessionSkills
+from ..resume_extract import CASE_SENSITIVE, CONCEPTS, SKILLS
+
+# Score filters over at most this many candidate sessions use session_id IN (...);
+# larger candidate sets are matched with one grouped query over the topic/category instead
+SKILL_SEARCH_IN_LIMIT = int(os.getenv("SKILL_SEARCH_IN_LIMIT", "20000"))
+_IN_CHUNK = 500
+# Re-read this many doc ids below the highest one seen, for rows whose transaction committed late
+_LATE_COMMIT_WINDOW = 256
+# Names too common in prose to extract from a resume, but unambiguous as a search term
+SEARCH_ALIASES = {"rest": "REST APIs"}
+
+_EVAL_COLUMNS = {
+    "correctness": EvaluationScore.correctness_score,
+    "depth": EvaluationScore.depth_score,
+    "structure": EvaluationScore.structure_score,
+    "communication": EvaluationScore.communication_score,
+}
+
+
+# --- Terms ---
+
+@lru_cache(maxsize=1)
+def _aliases() -> Dict[str, str]:
+    aliases = {}
+    for table in (CONCEPTS, SKILLS):
+        for canonical, names in table.items():
+            for name in names + (canonical,):
+                aliases[name.lower()] = canonical.lower()
+    for canonical, names in CASE_SENSITIVE.items():
+        for name in names:
+            aliases[name.lower()] = canonical.lower()
+    for name, canonical in SEARCH_ALIASES.items():
+        aliases[name] = canonical.lower()
+    return aliases
+
+
+def normalize_term(name: str) -> str:
+    """Lowercase, single-spaced, and known aliases folded into one term ("K8s" -> "kubernetes")."""
+    key = " ".join(name.lower().split()).strip(" .,;:")
+    return _aliases().get(key, key)
+
+
+def session_terms(summary: Dict[str, Any]) -> List[str]:
+    names = (summary.get("skills") or []) + (summary.get("keywords") or [])
+    return list(dict.fromkeys(t for t in (normalize_term(n) for n in names if n) if t))
+
+
+def record_skills(db: DbSession, session_id: str, summary: Dict[str, Any], commit: bool = True):
+    """
+    Replaces the session's indexed terms. The new row gets a new doc id; indexes holding the
+    old one drop it on their next refresh.
+    """
+    db.query(SessionSkills).filter(SessionSkills.session_id == session_id).delete(synchronize_session=False)
+    db.add(SessionSkills(session_id=session_id, terms="\n".join(session_terms(summary))))
+    metrics.incr("skill_index.recorded")
+    if commit:
+        db.commit()
+
+
+# --- Index ---
+
+def _bitmap(docs: List[int]) -> int:
+    if not docs:
+        return 0
+    if len(docs) == 1:
+        return 1 << docs[0]
+    raw = bytearray(max(docs) // 8 + 1)
+    for doc in docs:
+        raw[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(raw, "little")
+
+
+def _docs(bits: int, limit: Optional[int] = None) -> List[int]:
+    """Set bits of a bitmap, highest (newest doc) first."""
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    docs = []
+    for i in range(len(raw) - 1, -1, -1):
+        byte = raw[i]
+        if not byte:
+            continue
+        for j in range(7, -1, -1):
+            if byte >> j & 1:
+                docs.append(i * 8 + j)
+                if limit is not None and len(docs) == limit:
+                    return docs
+    return docs
+
+
+class SkillIndex:
+    """
+    Inverted index from normalized skill/keyword to sessions. Each posting list is a bitmap
+    over doc ids held in a Python int (bit d set = doc d has the term), so AND/OR across
+    terms are single big-int operations. It is filled from session_skills and catches up
+    with one doc_id range query before each search, so every worker sees the others' rows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, int] = {}
+        self._live = 0  # each session's current doc
+        self._session_of: Dict[int, str] = {}
+        self._doc_of: Dict[str, int] = {}
+        self._last_doc = 0
+
+    def refresh(self, db: DbSession):
+        rows = (
+            db.query(SessionSkills.doc_id, SessionSkills.session_id, SessionSkills.terms)
+            .filter(SessionSkills.doc_id > self._last_doc - _LATE_COMMIT_WINDOW)
+            .order_by(SessionSkills.doc_id)
+            .all()
+        )
+        self.add(rows)
+
+    def add(self, rows: Iterable):
+        """Indexes (doc_id, session_id, terms) rows; rows already seen or superseded are skipped."""
+        with self._lock:
+            by_term: Dict[str, List[int]] = {}
+            added, superseded = [], []
+            for doc_id, session_id, terms in rows:
+                current = self._doc_of.get(session_id)
+                if current is not None and current >= doc_id:
+                    continue
+                if current is not None:
+                    superseded.append(current)
+                    self._session_of.pop(current, None)
+                self._doc_of[session_id] = doc_id
+                self._session_of[doc_id] = session_id
+                added.append(doc_id)
+                for term in (terms or "").split("\n"):
+                    if term:
+                        by_term.setdefault(term, []).append(doc_id)
+                self._last_doc = max(self._last_doc, doc_id)
+            if not added:
+                return
+            for term, docs in by_term.items():
+                self._postings[term] = self._postings.get(term, 0) | _bitmap(docs)
+            self._live = (self._live | _bitmap(added)) & ~_bitmap(superseded)
+            metrics.incr("skill_index.docs_added", len(added))
+
+    def match(self, all_terms: List[str], any_terms: List[str]) -> int:
+        """Bitmap of sessions having every term in all_terms and at least one in any_terms."""
+        with self._lock:
+            bits = self._live
+            for term in all_terms:
+                bits &= self._postings.get(term, 0)
+            if any_terms:
+                either = 0
+                for term in any_terms:
+                    either |= self._postings.get(term, 0)
+                bits &= either
+            return bits
+
+    def sessions(self, bits: int, limit: Optional[int] = None) -> List[str]:
+        """Session ids of a match() bitmap, newest first."""
+        with self._lock:
+            return [self._session_of[doc] for doc in _docs(bits, limit) if doc in self._session_of]
+
+    def size(self) -> int:
+        return self._live.bit_count()
+
+
+skill_index = SkillIndex()
+
+
+# --- Search ---
+
+def _score_rows(db: DbSession, f: ScoreFilter, candidates: List[str]):
+    """(session_id, score) rows of the candidates for the filter's topic or category, one query per chunk."""
+    if f.category:
+        columns = (ReportCategoryScore.session_id, ReportCategoryScore.category, ReportCategoryScore.score)
+        wanted = f.category
+    else:
+        metrics_ = [_EVAL_COLUMNS[f.metric]] if f.metric else list(_EVAL_COLUMNS.values())
+        columns = (EvaluationScore.session_id, EvaluationScore.topic, *metrics_)
+        wanted = f.topic
+    # Only session_id in the WHERE clause, so the planner uses its index rather than a
+    # topic/category index that matches most of the table
+    for i in range(0, len(candidates), _IN_CHUNK):
+        for session_id, name, *scores in db.query(*columns).filter(columns[0].in_(candidates[i:i + _IN_CHUNK])):
+            if name == wanted and None not in scores:
+                yield session_id, sum(scores) / len(scores)
+
+
+def _score_matches(db: DbSession, f: ScoreFilter, candidates: List[str]) -> Set[str]:
+    """Sessions among candidates passing one score filter (a topic's score is the mean over its answers)."""
+    if len(candidates) <= SKILL_SEARCH_IN_LIMIT:
+        totals: Dict[str, List[float]] = {}
+        for session_id, score in _score_rows(db, f, candidates):
+            totals.setdefault(session_id, []).append(score)
+        return {s for s, scores in totals.items() if sum(scores) / len(scores) >= f.min}
+
+    if f.category:
+        query = db.query(ReportCategoryScore.session_id).filter(
+            ReportCategoryScore.category == f.category, ReportCategoryScore.score >= f.min)
+    else:
+        score = _EVAL_COLUMNS[f.metric] if f.metric else (
+            EvaluationScore.correctness_score + EvaluationScore.depth_score
+            + EvaluationScore.structure_score + EvaluationScore.communication_score) / 4.0
+        query = (db.query(EvaluationScore.session_id).filter(EvaluationScore.topic == f.topic)
+                 .group_by(EvaluationScore.session_id).having(func.avg(score) >= f.min))
+    return {row[0] for row in query}
+
+
+def search_sessions(db: DbSession, request: SessionSearchRequest) -> Dict[str, Any]:
+    """
+    Sessions whose resume lists all of all_skills and any of any_skills, and that pass every
+    score filter. Skills are matched in the in-memory index; only score filters touch the database.
+    """
+    for f in request.scores:
+        if not (f.topic or f.category):
+            raise ValueError("A score filter needs a topic or a category")
+    start = time.perf_counter()
+    skill_index.refresh(db)
+    bits = skill_index.match(
+        [normalize_term(s) for s in request.all_skills if s.strip()],
+        [normalize_term(s) for s in request.any_skills if s.strip()],
+    )
+
+    if request.scores:
+        sessions = skill_index.sessions(bits)
+        for f in request.scores:
+            if not sessions:
+                break
+            matched = _score_matches(db, f, sessions)
+            sessions = [s for s in sessions if s in matched]
+        total, session_ids = len(sessions), sessions[:request.limit]
+    else:
+        total, session_ids = bits.bit_count(), skill_index.sessions(bits, request.limit)
+
+    metrics.observe("skill_search.ms", (time.perf_counter() - start) * 1000)
+    return {"total": total, "session_ids": session_ids}
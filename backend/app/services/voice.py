@@ -1,11 +1,35 @@
 import io
-import edge_tts
+import os
+import re
+import time
+import asyncio
+from typing import AsyncIterator, List
+
+from ..metrics import metrics
+from ..singleflight import SingleFlight
 
 # Edge-TTS is free and requires no API key.
 # STT is now handled by the frontend (Web Speech API).
 
 _VOICE_ENABLED = True
 
+# "edge" (default) or "stub": silent MP3 of roughly the right length, no network (load tests)
+TTS_PROVIDER = os.getenv("TTS_PROVIDER", "edge").lower()
+
+TTS_CACHE_TTL_SEC = float(os.getenv("TTS_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+_tts_flight = SingleFlight("tts")
+
+# Pipelined synthesis (stream_speech): how many sentences of one request are synthesized at
+# once, and the length past which a sentence is cut at commas/semicolons
+TTS_PIPELINE_WORKERS = int(os.getenv("TTS_PIPELINE_WORKERS", "3"))
+TTS_SEGMENT_MAX_CHARS = int(os.getenv("TTS_SEGMENT_MAX_CHARS", "250"))
+_SEGMENT_MIN_CHARS = 20  # shorter sentences ("Great.") ride along with the next one
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+# One MPEG-1 Layer III frame: 32 kbps, 44.1 kHz, mono, silence (~26 ms)
+_SILENT_MP3_FRAME = b"\xff\xfb\x10\xc0" + b"\x00" * 100
+
 def check_voice_availability() -> bool:
     return _VOICE_ENABLED
 
@@ -19,8 +43,85 @@ async def transcribe_audio(audio_bytes: bytes) -> str:
 async def synthesize_speech(text: str, voice_name: str = "en-US-ChristopherNeural", rate: str = "+0%", pitch: str = "+0Hz") -> bytes:
     """
     Converts text to MP3 audio bytes using edge-tts (Microsoft Edge Neural Voices).
-    Supports custom voice, rate, and pitch.
+    Supports custom voice, rate, and pitch. Audio is kept in the shared cache, so a
+    question is synthesized once across workers, however often it is replayed, and
+    concurrent requests in this worker share one in-flight synthesis.
     """
+    from ..shared_cache import shared_cache
+
+    key = shared_cache.make_key(TTS_PROVIDER, voice_name, rate, pitch, text)
+    return await _tts_flight.ado(key, lambda: shared_cache.aget_or_compute(
+        "tts", key, lambda: _synthesize(text, voice_name, rate, pitch), ttl=TTS_CACHE_TTL_SEC
+    ))
+
+def split_sentences(text: str, max_chars: int = None) -> List[str]:
+    """Text split into speakable segments: sentences, with tiny ones merged forward and long ones cut at clauses."""
+    max_chars = max_chars or TTS_SEGMENT_MAX_CHARS
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        part = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if part and len(part) + 1 + len(clause) > max_chars:
+                pieces.append(part)
+                part = clause
+            else:
+                part = f"{part} {clause}" if part else clause
+        pieces.append(part)
+
+    segments, carry = [], ""
+    for piece in pieces:
+        piece = f"{carry} {piece}" if carry else piece
+        if len(piece) < _SEGMENT_MIN_CHARS:
+            carry = piece
+            continue
+        segments.append(piece)
+        carry = ""
+    if carry:
+        if segments:
+            segments[-1] = f"{segments[-1]} {carry}"
+        else:
+            segments.append(carry)
+    return segments
+
+async def stream_speech(text: str, voice_name: str = "en-US-ChristopherNeural", rate: str = "+0%", pitch: str = "+0Hz") -> AsyncIterator[bytes]:
+    """
+    synthesize_speech pipelined by sentence: up to TTS_PIPELINE_WORKERS sentences are
+    synthesized at once and their MP3 audio is yielded in order, so playback can start
+    after the first sentence instead of the whole text. Each sentence goes through
+    synthesize_speech and its cache, so a sentence shared by several prompts is synthesized once.
+    """
+    segments = split_sentences(text)
+    gate = asyncio.Semaphore(TTS_PIPELINE_WORKERS)
+
+    async def segment_audio(segment: str) -> bytes:
+        async with gate:
+            return await synthesize_speech(segment, voice_name, rate, pitch)
+
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(segment_audio(segment)) for segment in segments]
+    metrics.observe("tts.pipeline.segments", len(tasks))
+    try:
+        for i, task in enumerate(tasks):
+            audio = await task
+            if i == 0:
+                metrics.observe("tts.pipeline.first_audio_ms", (time.perf_counter() - start) * 1000)
+            yield audio
+    finally:
+        for task in tasks:  # client went away: stop the sentences still queued
+            task.cancel()
+
+async def _synthesize(text: str, voice_name: str, rate: str, pitch: str) -> bytes:
+    if TTS_PROVIDER == "stub":
+        return await _synthesize_stub(text)
+
+    import edge_tts  # imported on first use, not at app startup
+
     communicate = edge_tts.Communicate(text, voice_name, rate=rate, pitch=pitch)
     
     mp3_data = b""
@@ -30,6 +131,15 @@ async def synthesize_speech(text: str, voice_name: str = "en-US-ChristopherNeura
             
     return mp3_data
 
+async def _synthesize_stub(text: str) -> bytes:
+    # Fixed delay per request plus one per character, roughly how synthesis time grows with text
+    latency = float(os.getenv("STUB_TTS_LATENCY_SEC", "0")) + float(os.getenv("STUB_TTS_SEC_PER_CHAR", "0")) * len(text)
+    if latency:
+        await asyncio.sleep(latency)
+    # ~15 characters per second of speech, ~38 frames per second
+    frames = max(1, int(len(text) / 15 * 38))
+    return _SILENT_MP3_FRAME * frames
+
 def get_available_voices():
     # Helper to return supported list
     return [
@@ -0,0 +1,597 @@
+import os
+import time
+import uuid
+import struct
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from .metrics import metrics
+
+# _safe's result when the backend raised, so a broken store isn't mistaken for a miss or a held lease
+_FAILED = object()
+
+
+class CacheBackend:
+    """
+    Storage for SharedCache. Values are bytes; keys are already hashed (hex, <= 64 chars).
+
+    A backend needs plain get/set/delete with expiry, plus an exclusive lease per key
+    (acquire fails while another owner holds an unexpired lease) that its owner can
+    renew. A Redis backend would map these onto GET / SET EX / DEL, SET NX PX and a
+    compare-and-PEXPIRE script, and leave size bounds to maxmemory.
+    """
+
+    name = "base"
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def acquire_lease(self, namespace: str, key: str, owner: str, lease_sec: float) -> bool:
+        raise NotImplementedError
+
+    def renew_lease(self, namespace: str, key: str, owner: str, lease_sec: float) -> bool:
+        """Pushes the expiry of owner's lease out to lease_sec from now; False if it was lost."""
+        raise NotImplementedError
+
+    def release_lease(self, namespace: str, key: str, owner: str):
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def trim(self, max_bytes: int) -> int:
+        """Evicts the oldest values until the store holds at most max_bytes; returns how many."""
+        return 0
+
+
+class MemoryBackend(CacheBackend):
+    """Single-process backend (tests, or one worker)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, tuple] = {}
+        self._leases: Dict[tuple, tuple] = {}
+
+    def get(self, namespace, key):
+        with self._lock:
+            item = self._values.get((namespace, key))
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._values[(namespace, key)]
+                return None
+            return value
+
+    def set(self, namespace, key, value, ttl=None):
+        with self._lock:
+            self._values.pop((namespace, key), None)  # re-insert so dict order stays oldest first
+            self._values[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._values.pop((namespace, key), None)
+
+    def acquire_lease(self, namespace, key, owner, lease_sec):
+        now = time.time()
+        with self._lock:
+            held = self._leases.get((namespace, key))
+            if held is not None and held[1] > now and held[0] != owner:
+                return False
+            self._leases[(namespace, key)] = (owner, now + lease_sec)
+            return True
+
+    def renew_lease(self, namespace, key, owner, lease_sec):
+        with self._lock:
+            held = self._leases.get((namespace, key))
+            if held is None or held[0] != owner:
+                return False
+            self._leases[(namespace, key)] = (owner, time.time() + lease_sec)
+            return True
+
+    def release_lease(self, namespace, key, owner):
+        with self._lock:
+            held = self._leases.get((namespace, key))
+            if held is not None and held[0] == owner:
+                del self._leases[(namespace, key)]
+
+    def trim(self, max_bytes):
+        with self._lock:
+            total = sum(len(value) for value, _ in self._values.values())
+            evicted = 0
+            for item in list(self._values):
+                if total <= max_bytes:
+                    break
+                total -= len(self._values.pop(item)[0])
+                evicted += 1
+            return evicted
+
+
+class SQLBackend(CacheBackend):
+    """
+    Tables shared_cache / shared_cache_leases on the app database (or SHARED_CACHE_DB_URL).
+    Leases rely on the primary key: only one worker's INSERT can succeed.
+    """
+
+    name = "db"
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url
+        self._session_factory = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    from sqlalchemy.orm import sessionmaker
+                    from .models import SharedCacheEntry, SharedCacheLease
+
+                    if self.url:
+                        from .database import build_engine
+                        engine = build_engine(self.url)
+                    else:
+                        from .database import engine
+                    for model in (SharedCacheEntry, SharedCacheLease):
+                        model.__table__.create(bind=engine, checkfirst=True)
+                    self._session_factory = sessionmaker(bind=engine, autoflush=False)
+        return self._session_factory()
+
+    def get(self, namespace, key):
+        from .models import SharedCacheEntry
+
+        db = self._db()
+        try:
+            entry = db.get(SharedCacheEntry, (namespace, key))
+            if entry is None or (entry.expires_at is not None and entry.expires_at <= time.time()):
+                return None
+            return entry.value
+        finally:
+            db.close()
+
+    def set(self, namespace, key, value, ttl=None):
+        from .models import SharedCacheEntry
+
+        db = self._db()
+        try:
+            db.merge(SharedCacheEntry(
+                namespace=namespace, key=key, value=value, size_bytes=len(value),
+                expires_at=time.time() + ttl if ttl else None, created_at=datetime.utcnow(),
+            ))
+            db.commit()
+        except Exception:
+            db.rollback()  # lost a race with another writer of the same value
+        finally:
+            db.close()
+
+    def delete(self, namespace, key):
+        from .models import SharedCacheEntry
+
+        db = self._db()
+        try:
+            db.query(SharedCacheEntry).filter_by(namespace=namespace, key=key).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def acquire_lease(self, namespace, key, owner, lease_sec):
+        from sqlalchemy.exc import IntegrityError
+        from .models import SharedCacheLease
+
+        now = time.time()
+        db = self._db()
+        try:
+            for _ in range(2):
+                db.add(SharedCacheLease(namespace=namespace, key=key, owner=owner, expires_at=now + lease_sec))
+                try:
+                    db.commit()
+                    return True
+                except IntegrityError:
+                    db.rollback()
+                # Taken: clear it only if its holder let it expire (e.g. the worker died), then retry once
+                cleared = db.query(SharedCacheLease).filter(
+                    SharedCacheLease.namespace == namespace, SharedCacheLease.key == key,
+                    SharedCacheLease.expires_at <= now,
+                ).delete(synchronize_session=False)
+                db.commit()
+                if not cleared:
+                    return False
+            return False
+        finally:
+            db.close()
+
+    def renew_lease(self, namespace, key, owner, lease_sec):
+        from .models import SharedCacheLease
+
+        db = self._db()
+        try:
+            renewed = db.query(SharedCacheLease).filter_by(namespace=namespace, key=key, owner=owner).update(
+                {SharedCacheLease.expires_at: time.time() + lease_sec}, synchronize_session=False
+            )
+            db.commit()
+            return bool(renewed)
+        finally:
+            db.close()
+
+    def release_lease(self, namespace, key, owner):
+        from .models import SharedCacheLease
+
+        db = self._db()
+        try:
+            db.query(SharedCacheLease).filter_by(namespace=namespace, key=key, owner=owner).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        from .models import SharedCacheEntry, SharedCacheLease
+
+        now = time.time()
+        db = self._db()
+        try:
+            removed = db.query(SharedCacheEntry).filter(SharedCacheEntry.expires_at <= now).delete(synchronize_session=False)
+            db.query(SharedCacheLease).filter(SharedCacheLease.expires_at <= now).delete(synchronize_session=False)
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+    def trim(self, max_bytes):
+        from sqlalchemy import func, tuple_
+        from .models import SharedCacheEntry
+
+        db = self._db()
+        try:
+            excess = (db.query(func.sum(SharedCacheEntry.size_bytes)).scalar() or 0) - max_bytes
+            if excess <= 0:
+                return 0
+            oldest = db.query(SharedCacheEntry.namespace, SharedCacheEntry.key, SharedCacheEntry.size_bytes).order_by(
+                SharedCacheEntry.created_at
+            )
+            victims = []
+            for namespace, key, size in oldest.yield_per(500):
+                victims.append((namespace, key))
+                excess -= size or 0
+                if excess <= 0:
+                    break
+            for start in range(0, len(victims), 500):
+                db.query(SharedCacheEntry).filter(
+                    tuple_(SharedCacheEntry.namespace, SharedCacheEntry.key).in_(victims[start:start + 500])
+                ).delete(synchronize_session=False)
+            db.commit()
+            return len(victims)
+        finally:
+            db.close()
+
+
+class FileBackend(CacheBackend):
+    """
+    One file per value under SHARED_CACHE_DIR/{namespace}/, written atomically (rename);
+    leases are O_EXCL lock files. Any workers on the same host can share it.
+    """
+
+    name = "file"
+    _HEADER = struct.Struct("<d")  # expires_at, 0 = never
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, namespace: str, key: str, suffix: str = "") -> str:
+        folder = os.path.join(self.directory, namespace)
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, key + suffix)
+
+    def get(self, namespace, key):
+        try:
+            with open(self._path(namespace, key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        (expires_at,) = self._HEADER.unpack_from(data)
+        if expires_at and expires_at <= time.time():
+            return None
+        return data[self._HEADER.size:]
+
+    def set(self, namespace, key, value, ttl=None):
+        path = self._path(namespace, key)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(self._HEADER.pack(time.time() + ttl if ttl else 0.0))
+            f.write(value)
+        os.replace(tmp, path)
+
+    def delete(self, namespace, key):
+        try:
+            os.remove(self._path(namespace, key))
+        except FileNotFoundError:
+            pass
+
+    def acquire_lease(self, namespace, key, owner, lease_sec):
+        path = self._path(namespace, key, ".lease")
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                holder, expires_at = self._read_lease(path)
+                if holder is not None and expires_at > time.time():
+                    return False
+                try:
+                    os.remove(path)  # stale: its holder died
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{owner}\n{time.time() + lease_sec}")
+            return True
+        return False
+
+    def renew_lease(self, namespace, key, owner, lease_sec):
+        path = self._path(namespace, key, ".lease")
+        if self._read_lease(path)[0] != owner:
+            return False
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w") as f:
+            f.write(f"{owner}\n{time.time() + lease_sec}")
+        os.replace(tmp, path)
+        return True
+
+    @staticmethod
+    def _read_lease(path: str):
+        try:
+            with open(path) as f:
+                owner, _, expires_at = f.read().partition("\n")
+            return owner, float(expires_at)
+        except FileNotFoundError:
+            return None, 0.0
+        except ValueError:
+            # Being written right now: treat as held
+            return "", time.time() + 1
+
+    def release_lease(self, namespace, key, owner):
+        path = self._path(namespace, key, ".lease")
+        if self._read_lease(path)[0] != owner:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def trim(self, max_bytes):
+        values = []
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith((".lease", ".tmp")):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                values.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in values)
+        evicted = 0
+        for _, size, path in sorted(values):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return evicted
+
+
+class SharedCache:
+    """
+    Cache shared by all workers, with get-or-compute: on a miss, one caller (in any
+    process) takes a lease and computes; the others poll until the value appears, so
+    an LLM call or a render is paid once. The holder renews its lease while it computes;
+    if it dies, the lease expires and a waiter takes over. If waiting runs past wait_sec,
+    or the store itself fails, the caller computes on its own.
+
+    Namespaces not listed in SHARED_CACHE_NAMESPACES bypass the cache (compute every time).
+    The store is kept under max_bytes by evicting the oldest values.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], namespaces: Optional[Set[str]] = None,
+                 lease_sec: float = 60.0, wait_sec: float = 90.0, poll_sec: float = 0.05,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.backend = backend
+        self.namespaces = namespaces
+        self.lease_sec = lease_sec
+        self.wait_sec = wait_sec
+        self.poll_sec = poll_sec
+        self.max_bytes = max_bytes
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._fills = 0
+        self._unswept_bytes = 0
+        self._held: Set[tuple] = set()
+        self._held_lock = threading.Lock()
+        self._renewer: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "SharedCache":
+        kind = os.getenv("SHARED_CACHE_BACKEND", "db").lower()
+        if kind == "off":
+            backend = None
+        elif kind == "memory":
+            backend = MemoryBackend()
+        elif kind == "file":
+            import tempfile
+            backend = FileBackend(os.getenv("SHARED_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "interviewer_cache"))
+        else:
+            backend = SQLBackend(os.getenv("SHARED_CACHE_DB_URL"))
+        names = os.getenv("SHARED_CACHE_NAMESPACES", "report_pdf,tts,resume_summary,resume_text")
+        return cls(
+            backend,
+            namespaces={n.strip() for n in names.split(",") if n.strip()},
+            lease_sec=float(os.getenv("SHARED_CACHE_LEASE_SEC", "60")),
+            max_bytes=int(float(os.getenv("SHARED_CACHE_MAX_MB", "512")) * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        return hashlib.sha256("\x00".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def enabled_for(self, namespace: str) -> bool:
+        return self.backend is not None and (self.namespaces is None or namespace in self.namespaces)
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        if not self.enabled_for(namespace):
+            return None
+        return self._safe(self.backend.get, namespace, key)
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        if self.enabled_for(namespace):
+            self._safe(self.backend.set, namespace, key, value, ttl)
+
+    def delete(self, namespace: str, key: str):
+        if self.enabled_for(namespace):
+            self._safe(self.backend.delete, namespace, key)
+
+    def _safe(self, fn, *args, failed=None):
+        # A broken cache must never fail the request it is trying to speed up
+        try:
+            return fn(*args)
+        except Exception as e:
+            metrics.incr("shared_cache.errors")
+            print(f"Shared cache {fn.__name__} failed: {e}")
+            return failed
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], bytes], ttl: Optional[float] = None) -> bytes:
+        if not self.enabled_for(namespace):
+            return compute()
+        step = self._lookup(namespace, key)
+        while True:
+            kind, value = next(step)
+            if kind == "hit":
+                return value
+            if kind == "compute":
+                self._hold(namespace, key, value)
+                try:
+                    return self._fill(namespace, key, compute(), ttl)
+                finally:
+                    self._release(namespace, key, value)
+            time.sleep(value)
+
+    async def aget_or_compute(self, namespace: str, key: str, compute: Callable[[], Awaitable[bytes]], ttl: Optional[float] = None) -> bytes:
+        """get_or_compute for async producers; backend calls run off the event loop."""
+        if not self.enabled_for(namespace):
+            return await compute()
+        step = self._lookup(namespace, key)
+        while True:
+            kind, value = await asyncio.to_thread(next, step)
+            if kind == "hit":
+                return value
+            if kind == "compute":
+                self._hold(namespace, key, value)
+                try:
+                    produced = await compute()
+                    return await asyncio.to_thread(self._fill, namespace, key, produced, ttl)
+                finally:
+                    await asyncio.to_thread(self._release, namespace, key, value)
+            await asyncio.sleep(value)
+
+    def _lookup(self, namespace: str, key: str):
+        """
+        Yields ("hit", value), ("compute", lease_owner_or_None) or ("wait", seconds) until
+        the caller has a value or should compute it. Kept sync so both variants share it.
+        A store that raises is bypassed at once rather than waited on like a held lease.
+        """
+        value = self._safe(self.backend.get, namespace, key, failed=_FAILED)
+        if value is _FAILED:
+            yield "compute", None
+            return
+        if value is not None:
+            metrics.incr(f"shared_cache.hits.{namespace}")
+            yield "hit", value
+            return
+        metrics.incr(f"shared_cache.misses.{namespace}")
+
+        give_up = time.monotonic() + self.wait_sec
+        delay = self.poll_sec
+        waited = False
+        while True:
+            leased = self._safe(self.backend.acquire_lease, namespace, key, self.owner, self.lease_sec, failed=_FAILED)
+            if leased is _FAILED:
+                yield "compute", None
+                return
+            if leased:
+                # Filled between our miss and the lease?
+                value = self._safe(self.backend.get, namespace, key)
+                if value is not None:
+                    self._release(namespace, key, self.owner)
+                    yield "hit", value
+                    return
+                yield "compute", self.owner
+                return
+            if not waited:
+                metrics.incr(f"shared_cache.coalesced.{namespace}")
+                waited = True
+            if time.monotonic() > give_up:
+                metrics.incr(f"shared_cache.wait_timeouts.{namespace}")
+                yield "compute", None
+                return
+            yield "wait", delay
+            delay = min(delay * 2, 0.5)
+            value = self._safe(self.backend.get, namespace, key, failed=_FAILED)
+            if value is _FAILED:
+                yield "compute", None
+                return
+            if value is not None:
+                yield "hit", value
+                return
+
+    def _fill(self, namespace: str, key: str, value: bytes, ttl: Optional[float]) -> bytes:
+        self._safe(self.backend.set, namespace, key, value, ttl)
+        self._fills += 1
+        self._unswept_bytes += len(value)
+        # Entries expire by TTL and the store is capped at max_bytes: sweep every 200 fills,
+        # or sooner once this worker alone has written a tenth of the cap since the last sweep
+        if self._fills % 200 == 0 or self._unswept_bytes * 10 >= self.max_bytes:
+            self._unswept_bytes = 0
+            self._safe(self.backend.purge_expired)
+            self._safe(self.backend.trim, self.max_bytes)
+        return value
+
+    def _hold(self, namespace: str, key: str, owner: Optional[str]):
+        """Keeps renewing the lease while its value is computed, however long that takes."""
+        if owner is None:
+            return
+        with self._held_lock:
+            self._held.add((namespace, key))
+            if self._renewer is None:
+                self._renewer = threading.Thread(target=self._renew_held, name="shared-cache-leases", daemon=True)
+                self._renewer.start()
+
+    def _renew_held(self):
+        while True:
+            time.sleep(self.lease_sec / 3)
+            with self._held_lock:
+                held = list(self._held)
+            for namespace, key in held:
+                renewed = self._safe(self.backend.renew_lease, namespace, key, self.owner, self.lease_sec)
+                if not renewed and (namespace, key) in self._held:
+                    metrics.incr(f"shared_cache.leases_lost.{namespace}")
+
+    def _release(self, namespace: str, key: str, owner: Optional[str]):
+        if owner is not None:
+            with self._held_lock:
+                self._held.discard((namespace, key))
+            self._safe(self.backend.release_lease, namespace, key, owner)
+
+
+shared_cache = SharedCache.from_env()
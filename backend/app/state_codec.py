@@ -0,0 +1,135 @@
+"""
+Encoding of persisted session state (sessions.state_blob).
+
+Every blob starts with a 5-byte header: b"ST", the format version, then the serializer
+and compressor ids. Blobs are decoded by their own header, so changing STATE_CODEC
+affects new writes only and old blobs stay readable:
+
+    json          JSON (orjson when installed, else the stdlib), uncompressed
+    json+zlib     default; stdlib only
+    json+zstd     needs zstandard
+    msgpack+zlib  needs msgpack
+    msgpack+zstd  needs msgpack and zstandard
+    text          legacy: no blob, state stays JSON text in sessions.state_json
+"""
+import os
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+from .metrics import metrics
+
+STATE_CODEC = os.getenv("STATE_CODEC", "json+zlib").lower()
+ZLIB_LEVEL = int(os.getenv("STATE_ZLIB_LEVEL", "1"))  # higher levels shrink state little more at several times the cost
+ZSTD_LEVEL = int(os.getenv("STATE_ZSTD_LEVEL", "3"))
+
+MAGIC = b"ST"
+VERSION = 1
+_HEADER_LEN = 5
+
+SERIALIZERS = {"json": 1, "msgpack": 2}
+COMPRESSORS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+class StateCodecError(ValueError):
+    pass
+
+
+# --- Serializers ---
+
+def _json_dumps(state: Dict[str, Any]) -> bytes:
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return orjson.dumps(state)
+
+
+def _json_loads(data: bytes) -> Dict[str, Any]:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise StateCodecError("msgpack state codec needs `pip install msgpack`")
+    return msgpack
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise StateCodecError("zstd state codec needs `pip install zstandard`")
+    return zstandard
+
+
+def _serialize(serializer: str, state: Dict[str, Any]) -> bytes:
+    if serializer == "json":
+        return _json_dumps(state)
+    return _msgpack().packb(state, use_bin_type=True)
+
+
+def _deserialize(serializer_id: int, data: bytes) -> Dict[str, Any]:
+    if serializer_id == SERIALIZERS["json"]:
+        return _json_loads(data)
+    if serializer_id == SERIALIZERS["msgpack"]:
+        return _msgpack().unpackb(data, raw=False)
+    raise StateCodecError(f"Unknown state serializer id {serializer_id}")
+
+
+def _compress(compressor: str, data: bytes) -> bytes:
+    if compressor == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if compressor == "zstd":
+        return _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _decompress(compressor_id: int, data: bytes) -> bytes:
+    if compressor_id == COMPRESSORS["zlib"]:
+        return zlib.decompress(data)
+    if compressor_id == COMPRESSORS["zstd"]:
+        return _zstd().ZstdDecompressor().decompress(data)
+    if compressor_id == COMPRESSORS["none"]:
+        return data
+    raise StateCodecError(f"Unknown state compressor id {compressor_id}")
+
+
+# --- Codec ---
+
+def parse_codec(name: str):
+    """'json+zlib' -> ('json', 'zlib'); 'text' -> None."""
+    if name == "text":
+        return None
+    serializer, _, compressor = name.partition("+")
+    compressor = compressor or "none"
+    if serializer not in SERIALIZERS or compressor not in COMPRESSORS:
+        raise StateCodecError(f"Unknown STATE_CODEC: {name}")
+    return serializer, compressor
+
+
+def encode_state(state: Dict[str, Any], codec: Optional[str] = None) -> Optional[bytes]:
+    """State as a headered blob, or None for the legacy "text" codec."""
+    parsed = parse_codec(codec or STATE_CODEC)
+    if parsed is None:
+        return None
+    serializer, compressor = parsed
+    header = MAGIC + bytes((VERSION, SERIALIZERS[serializer], COMPRESSORS[compressor]))
+    blob = header + _compress(compressor, _serialize(serializer, state))
+    metrics.observe("state_codec.blob_bytes", len(blob))
+    return blob
+
+
+def decode_state(blob: bytes) -> Dict[str, Any]:
+    if len(blob) < _HEADER_LEN or blob[:2] != MAGIC:
+        raise StateCodecError("Not an encoded session state")
+    version, serializer_id, compressor_id = blob[2], blob[3], blob[4]
+    if version > VERSION:
+        raise StateCodecError(f"State format version {version} is newer than this build ({VERSION})")
+    return _deserialize(serializer_id, _decompress(compressor_id, bytes(blob[_HEADER_LEN:])))
@@ -0,0 +1,94 @@
+"""
+Bytes persisted per turn: whole-state state_json rewrites vs the SQL graph checkpointer.
+
+Runs the same interviews through both runners with the stub LLM and counts what each
+writes to the database (state_json text per turn vs checkpoint rows, blobs and writes),
+overall and for the first and last answer turn.
+
+    cd backend
+    python -m benchmarks.bench_checkpoint --interviews 5 --questions 10
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def initial_state(n_questions: int, resume_text: str) -> dict:
+    return {
+        "resume_text": resume_text, "resume_summary": None,
+        "role": "SDE1", "difficulty": "Medium", "total_questions": n_questions,
+        "question_history": [], "answer_history": [], "eval_history": [],
+        "current_question": None, "current_step": 1, "final_report": None, "is_finished": False,
+    }
+
+
+def run(runner, interviews: int, n_questions: int, resume_text: str, answer: str) -> dict:
+    from app.metrics import metrics
+
+    metrics.reset()
+    per_turn = []  # bytes written by each answer turn, in turn order (summed over interviews)
+
+    def turn(sid, state, action, text=None):
+        before = metrics.counter("checkpoint.bytes_written")
+        state = runner.run(sid, state, action, text)
+        written = metrics.counter("checkpoint.bytes_written") - before if runner.checkpointed else len(json.dumps(state))
+        return state, written
+
+    start = time.perf_counter()
+    turns, total = 0, 0
+    for i in range(interviews):
+        sid = f"{'ckpt' if runner.checkpointed else 'state'}-{i}"
+        state, written = turn(sid, initial_state(n_questions, resume_text), "start")
+        turns, total = turns + 1, total + written
+        idx = 0
+        while not state.get("final_report"):
+            state, written = turn(sid, state, "answer", answer)
+            turns, total = turns + 1, total + written
+            if idx == len(per_turn):
+                per_turn.append(0)
+            per_turn[idx] += written
+            idx += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "turns": turns, "bytes_per_turn": total / turns,
+        "first_answer": per_turn[0] / interviews, "last_answer": per_turn[-1] / interviews,
+        "ms_per_turn": elapsed * 1000 / turns,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ckpt_bench.db')}")
+    os.environ["LLM_PROVIDERS"] = "stub"
+    os.environ["STUB_LLM_LATENCY_SEC"] = "0"
+
+    import random
+    from app.database import init_db
+    from app.runner import GraphRunner, CheckpointRunner
+    from benchmarks.fixtures import sentence
+
+    init_db()
+    rng = random.Random(0)
+    resume_text = " ".join(sentence(rng, 15) for _ in range(60))
+    answer = " ".join(sentence(rng, 18) for _ in range(6))
+
+    print(f"{args.interviews} interviews x {args.questions} questions (stub LLM)\n")
+    print(f"{'runner':<12} {'turns':>6} {'bytes/turn':>11} {'1st answer':>11} {'last answer':>12} {'ms/turn':>8}")
+    for runner in (GraphRunner(), CheckpointRunner()):
+        r = run(runner, args.interviews, args.questions, resume_text, answer)
+        label = "checkpoint" if runner.checkpointed else "state_json"
+        print(f"{label:<12} {r['turns']:>6} {r['bytes_per_turn']:>11.0f} {r['first_answer']:>11.0f} {r['last_answer']:>12.0f} {r['ms_per_turn']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
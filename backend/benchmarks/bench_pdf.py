@@ -0,0 +1,56 @@
+"""
+Report PDF rendering: ReportLab (PDF_RENDERER=reportlab) vs fpdf2 (PDF_RENDERER=fpdf).
+
+Renders the report and transcript of realistic finished sessions of increasing length
+with each renderer and reports time per render, peak Python memory (tracemalloc, in
+a separate pass so it doesn't skew the timings), PDF size and page count.
+
+    cd backend
+    python -m benchmarks.bench_pdf --questions 5,20,80,200
+    PDF_TRANSCRIPT_MAX_TURNS=60 python -m benchmarks.bench_pdf   # with a transcript cap
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", default="5,20,80,200", help="Comma-separated session sizes")
+    parser.add_argument("--renderers", default="reportlab,fpdf")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.services.report import render_report_pdf_bytes
+    from benchmarks.fixtures import realistic_state
+
+    renderers = args.renderers.split(",")
+    for renderer in renderers:
+        render_report_pdf_bytes("warmup", realistic_state(1), renderer)
+
+    print(f"{'questions':>9} {'turns':>6} {'renderer':<10} {'ms':>8} {'peak MB':>8} {'KB':>7} {'pages':>6}")
+    for n in [int(q) for q in args.questions.split(",")]:
+        state = realistic_state(n, seed=n)
+        for renderer in renderers:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pdf = render_report_pdf_bytes("bench", state, renderer)
+                times.append((time.perf_counter() - start) * 1000)
+            tracemalloc.start()
+            render_report_pdf_bytes("bench", state, renderer)
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            pages = pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+            print(f"{n:>9} {len(state['transcript']):>6} {renderer:<10} {statistics.median(times):>8.1f} "
+                  f"{peak:>8.1f} {len(pdf) / 1024:>7.0f} {pages:>6}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
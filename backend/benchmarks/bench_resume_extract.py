@@ -0,0 +1,180 @@
+"""
+Resume summaries: local extractor (app/resume_extract.py) vs the LLM summarize call.
+
+Scores the local ResumeSummary against a reference one per resume: skill precision/recall
+(names compared after mapping aliases to the extractor's canonical names), project recall
+(a reference project counts as found if a local title is contained in it or vice versa)
+and keyword overlap, plus extraction time.
+
+References come from --references DIR (<resume name>.json, a ResumeSummary). With --llm,
+missing references are generated with the configured LLM (LLM_PROVIDERS) and saved there,
+so later runs compare against the same summaries. Without a corpus, synthetic resumes
+are generated and scored against what they were generated from.
+
+    cd backend
+    python -m benchmarks.bench_resume_extract --synthetic 200
+    python -m benchmarks.bench_resume_extract --corpus ~/resumes --references ~/resumes/llm --llm
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SECTION_STYLES = (
+    ("SKILLS", "EXPERIENCE", "PROJECTS", "ACHIEVEMENTS"),
+    ("Technical Skills:", "Work Experience", "Personal Projects", "Awards & Honors"),
+    ("Core Competencies", "Professional Experience", "Key Projects", "Accomplishments"),
+)
+PROJECT_NAMES = ("Ride Matcher", "Ledger Sync", "Photo Dedup Service", "Course Planner", "Chat Relay",
+                 "Inventory Forecaster", "Log Search", "Trip Splitter", "Feature Flag Service", "Habit Tracker")
+BULLETS = (
+    "Cut p95 latency by {n}% by caching hot reads in {skill}",
+    "Built the ingestion pipeline on {skill}, handling {n}k events per second",
+    "Migrated the billing service to {skill} with zero downtime",
+    "Mentored {n} interns and ran the weekly design review",
+    "Wrote integration tests for the {skill} layer",
+)
+AWARDS = ("Won first place at the {n} national hackathon", "Ranked top {n} in the company-wide coding challenge",
+          "Awarded the spot bonus for the {skill} migration")
+
+
+def synthetic_resume(rng: random.Random):
+    """(text, expected ResumeSummary dict) for a made-up resume."""
+    from app.resume_extract import SKILLS
+
+    skills = rng.sample(sorted(SKILLS), rng.randint(6, 14))
+    used = rng.sample(skills, min(4, len(skills)))
+    projects = rng.sample(PROJECT_NAMES, rng.randint(2, 4))
+    style = rng.choice(SECTION_STYLES)
+    bullet = rng.choice(("-", "•", "*"))
+
+    lines = ["Alex Candidate", "alex@example.com | +1 555 0100", ""]
+    lines += [style[0] + ("" if style[0].endswith(":") else "\n") + " " + ", ".join(skills), ""]
+    lines += [style[1], "Software Engineer, Example Corp (2021 - 2024)"]
+    lines += [f"{bullet} " + rng.choice(BULLETS).format(n=rng.randint(2, 60), skill=s) for s in used]
+    lines += ["", style[2]]
+    for name in projects:
+        lines += [f"{name} | {rng.choice(skills)}, {rng.choice(skills)}",
+                  f"{bullet} " + rng.choice(BULLETS).format(n=rng.randint(2, 60), skill=rng.choice(skills))]
+    lines += ["", style[3], f"{bullet} " + rng.choice(AWARDS).format(n=rng.randint(3, 50), skill=rng.choice(skills))]
+    return "\n".join(lines), {"skills": skills, "projects": projects, "achievements": [], "keywords": []}
+
+
+def load_corpus(path: str):
+    from app.services.resume import parse_resume_pdf
+
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        if name.lower().endswith(".pdf"):
+            with open(full, "rb") as f:
+                yield name, parse_resume_pdf(f.read())
+        elif name.lower().endswith(".txt"):
+            with open(full, encoding="utf-8") as f:
+                yield name, f.read()
+
+
+def llm_reference(text: str):
+    from app.llm import llm_client
+    from app.models import ResumeSummary
+    from app.prompts.templates import SUMMARIZE_SYSTEM_PROMPT, SUMMARIZE_USER_PROMPT
+
+    start = time.perf_counter()
+    summary = llm_client.generate_structured(
+        system_prompt=SUMMARIZE_SYSTEM_PROMPT,
+        user_prompt=SUMMARIZE_USER_PROMPT.format(resume_text=text),
+        response_model=ResumeSummary,
+    )
+    return summary.model_dump(), (time.perf_counter() - start) * 1000
+
+
+def canonical(names):
+    """Reference names mapped to the extractor's canonical skill names where it knows them."""
+    from app.resume_extract import find_terms
+
+    out = set()
+    for name in names:
+        hits = find_terms(name)
+        out.add(hits[0][2].lower() if hits else name.strip().lower())
+    return out
+
+
+def score(local: dict, reference: dict) -> dict:
+    got, want = canonical(local["skills"]), canonical(reference["skills"])
+    hit = len(got & want)
+    local_projects = [p.lower() for p in local["projects"]]
+    found = sum(1 for p in reference["projects"]
+                if any(l in p.lower() or p.lower() in l for l in local_projects))
+    kw_got, kw_want = canonical(local["keywords"]), canonical(reference["keywords"])
+    return {
+        "skill_precision": hit / len(got) if got else 0.0,
+        "skill_recall": hit / len(want) if want else 1.0,
+        "project_recall": found / len(reference["projects"]) if reference["projects"] else 1.0,
+        "keyword_overlap": len(kw_got & kw_want) / len(kw_got | kw_want) if kw_want else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of resume .pdf/.txt files")
+    parser.add_argument("--references", help="Directory of <resume name>.json reference summaries")
+    parser.add_argument("--llm", action="store_true", help="Generate missing references with the configured LLM")
+    parser.add_argument("--synthetic", type=int, default=100, help="Synthetic resumes when no --corpus is given")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from app.resume_extract import extract_summary
+
+    if args.corpus:
+        resumes = []
+        for name, text in load_corpus(args.corpus):
+            ref_path = os.path.join(args.references, name + ".json") if args.references else None
+            reference, llm_ms = None, None
+            if ref_path and os.path.exists(ref_path):
+                with open(ref_path) as f:
+                    reference = json.load(f)
+            elif args.llm:
+                reference, llm_ms = llm_reference(text)
+                if ref_path:
+                    os.makedirs(args.references, exist_ok=True)
+                    with open(ref_path, "w") as f:
+                        json.dump(reference, f, indent=2)
+            if reference is None:
+                print(f"skipping {name}: no reference (pass --references, or --llm)")
+                continue
+            resumes.append((name, text, reference, llm_ms))
+    else:
+        rng = random.Random(args.seed)
+        resumes = [(f"synthetic-{i}", *synthetic_resume(rng), None) for i in range(args.synthetic)]
+
+    if not resumes:
+        sys.exit("no resumes to score")
+
+    extract_summary("warm up the automaton")
+    rows, local_ms, llm_ms = [], [], [r[3] for r in resumes if r[3] is not None]
+    for name, text, reference, _ in resumes:
+        start = time.perf_counter()
+        local = extract_summary(text).model_dump()
+        local_ms.append((time.perf_counter() - start) * 1000)
+        rows.append(score(local, reference))
+
+    def mean(key):
+        values = [r[key] for r in rows if r[key] is not None]
+        return f"{statistics.mean(values):.2f}" if values else "n/a"
+
+    print(f"{len(rows)} resumes ({'corpus ' + args.corpus if args.corpus else 'synthetic'})\n")
+    print(f"skill precision   {mean('skill_precision')}")
+    print(f"skill recall      {mean('skill_recall')}")
+    print(f"project recall    {mean('project_recall')}")
+    print(f"keyword overlap   {mean('keyword_overlap')}")
+    print(f"local ms/resume   p50 {statistics.median(local_ms):.2f}  max {max(local_ms):.2f}")
+    if llm_ms:
+        print(f"llm ms/resume     p50 {statistics.median(llm_ms):.0f}  max {max(llm_ms):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Skill search latency: the in-memory skill index vs scanning state_json.
+
+Fills a fresh SQLite database with --sessions sessions. Each gets a resume summary of
+skills drawn with a skewed popularity (a few very common, a long tail of rare ones)
+plus System Design evaluation rows. It then times cold index load and a set of queries,
+and for comparison one full scan that decodes every session's state.
+
+    cd backend
+    python -m benchmarks.bench_skill_search --sessions 200000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tempfile
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = {
+    "one common skill": {"all_skills": ["Python"]},
+    "AND, common + mid": {"all_skills": ["Python", "Kafka"]},
+    "AND, two rare": {"all_skills": ["Rust", "Cassandra"]},
+    "OR of three": {"any_skills": ["Go", "Rust", "Scala"]},
+    "AND + score >= 7": {"all_skills": ["Kafka"], "scores": [{"topic": "System Design", "min": 7}]},
+    "rare AND + score >= 7": {"all_skills": ["Rust", "Kafka"], "scores": [{"topic": "System Design", "min": 7}]},
+}
+
+
+def populate(n: int, seed: int):
+    from sqlalchemy import insert
+    from app.database import SessionLocal
+    from app.models import EvaluationScore, Session, SessionSkills
+    from app.resume_extract import SKILLS
+    from app.services.skill_index import session_terms
+    from app.state_codec import encode_state
+
+    rng = random.Random(seed)
+    names = list(SKILLS)
+    weights = [1 / (rank + 1) for rank in range(len(names))]  # Zipf-like popularity
+    db = SessionLocal()
+    batch = 5000
+    for offset in range(0, n, batch):
+        sessions, skills, evals = [], [], []
+        for _ in range(min(batch, n - offset)):
+            sid = str(uuid.uuid4())
+            summary = {"skills": list(dict.fromkeys(rng.choices(names, weights, k=rng.randint(5, 15)))), "keywords": []}
+            scores = [rng.randint(3, 10) for _ in range(rng.randint(1, 2))]
+            state = {"resume_summary": summary, "eval_history": [{"question_id": f"q_{i}", "depth_score": s} for i, s in enumerate(scores)],
+                     "question_history": [{"id": f"q_{i}", "topic": "System Design"} for i in range(len(scores))]}
+            sessions.append({"id": sid, "role": "SDE1", "difficulty": "Medium", "state_blob": encode_state(state), "state_version": 1})
+            skills.append({"session_id": sid, "terms": "\n".join(session_terms(summary))})
+            evals += [{"session_id": sid, "question_id": f"q_{i}", "topic": "System Design", "correctness_score": s,
+                       "depth_score": s, "structure_score": s, "communication_score": s} for i, s in enumerate(scores)]
+        db.execute(insert(Session), sessions)
+        db.execute(insert(SessionSkills), skills)
+        db.execute(insert(EvaluationScore), evals)
+        db.commit()
+    db.close()
+
+
+def scan(query: dict) -> int:
+    """What answering the query took before the index: decode every session's state."""
+    from app.database import SessionLocal
+    from app.models import Session
+    from app.services.skill_index import normalize_term
+    from app.state_codec import decode_state
+
+    want = {normalize_term(s) for s in query.get("all_skills", [])}
+    db = SessionLocal()
+    hits = 0
+    for (blob,) in db.query(Session.state_blob).yield_per(5000):
+        state = decode_state(blob)
+        terms = {normalize_term(s) for s in (state.get("resume_summary") or {}).get("skills", [])}
+        hits += want <= terms
+    db.close()
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'skill_search.db')}"
+
+    from app.database import SessionLocal, init_db
+    from app.models import SessionSearchRequest
+    from app.services.skill_index import search_sessions, skill_index
+
+    init_db()
+    start = time.perf_counter()
+    populate(args.sessions, args.seed)
+    print(f"{args.sessions} sessions written in {time.perf_counter() - start:.1f}s\n")
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    skill_index.refresh(db)
+    print(f"index load (cold): {(time.perf_counter() - start) * 1000:.0f} ms, {skill_index.size()} sessions\n")
+
+    print(f"{'query':<24} {'matches':>8} {'p50 ms':>8} {'max ms':>8}")
+    for label, body in QUERIES.items():
+        request = SessionSearchRequest(**body)
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = search_sessions(db, request)
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{label:<24} {result['total']:>8} {statistics.median(times):>8.2f} {max(times):>8.2f}")
+    db.close()
+
+    start = time.perf_counter()
+    hits = scan(QUERIES["AND, common + mid"])
+    print(f"\nstate scan, AND common + mid: {hits} matches in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Startup-time breakdown: import cost of app.main by module, plus the lifespan steps.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+
+    cd backend
+    python -m benchmarks.bench_startup            # import breakdown + startup steps
+    python -m benchmarks.bench_startup --top 30
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}")
+    env.setdefault("LLM_PROVIDERS", "stub")
+    return env
+
+
+def import_breakdown(module: str = "app.main"):
+    """Parses `python -X importtime` output into (self_us, cumulative_us, name, depth) rows."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = [p.strip() for p in line.replace("import time:", "|", 1).split("|")]
+        raw_name = line.rsplit("|", 1)[1]
+        depth = (len(raw_name) - len(raw_name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), name, depth))
+    return rows
+
+
+def startup_steps():
+    code = (
+        "import json, time\n"
+        "t = time.perf_counter()\n"
+        "import app.main as m\n"
+        "imported = (time.perf_counter() - t) * 1000\n"
+        "steps = m.run_startup(warmup=True)\n"
+        "print(json.dumps({'import_app_main': imported, **steps}))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(proc.stderr[-2000:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--module", default="app.main")
+    args = parser.parse_args()
+
+    rows = import_breakdown(args.module)
+    total = max((r[1] for r in rows if r[2] == args.module), default=0)
+
+    # Group third-party cost by top-level package, app modules individually
+    by_package = defaultdict(int)
+    for self_us, _, name, _ in rows:
+        key = name if name.startswith("app.") or name == "app" else name.split(".")[0]
+        by_package[key] += self_us
+
+    print(f"import {args.module}: {total / 1000:.1f} ms total\n")
+    print(f"{'module / package':<40} {'self ms':>10}")
+    for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{name:<40} {us / 1000:>10.1f}")
+
+    print("\nstartup steps (fresh process, warm-up enabled):")
+    for name, ms in startup_steps().items():
+        print(f"  {name:<20} {ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Session state encoding: legacy JSON text (JSONType) vs the state codecs in app/state_codec.py.
+
+Encodes and decodes realistic finished sessions of 5, 10 and 20 questions (transcript,
+histories, evaluations and report) and reports stored bytes and time per call. Codecs
+whose optional packages aren't installed are skipped.
+
+    cd backend
+    python -m benchmarks.bench_state_codec --questions 5,10,20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CODECS = ("json", "json+zlib", "json+zstd", "msgpack+zlib", "msgpack+zstd")
+
+
+def timed(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", default="5,10,20", help="Comma-separated session sizes")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.state_codec import StateCodecError, decode_state, encode_state
+    from benchmarks.fixtures import realistic_state
+
+    print(f"{'questions':>9} {'codec':<16} {'bytes':>8} {'ratio':>6} {'encode us':>10} {'decode us':>10}")
+    for n in [int(q) for q in args.questions.split(",")]:
+        state = realistic_state(n, seed=n)
+        legacy = json.dumps(state)
+        base = len(legacy.encode("utf-8"))
+        enc = timed(json.dumps, state, args.repeat)
+        dec = timed(json.loads, legacy, args.repeat)
+        print(f"{n:>9} {'text (legacy)':<16} {base:>8} {1:>6.2f} {enc:>10.0f} {dec:>10.0f}")
+        for codec in CODECS:
+            try:
+                blob = encode_state(state, codec)
+            except StateCodecError:
+                print(f"{n:>9} {codec:<16} {'(not installed)':>8}")
+                continue
+            assert decode_state(blob) == state
+            enc = timed(lambda s: encode_state(s, codec), state, args.repeat)
+            dec = timed(decode_state, blob, args.repeat)
+            print(f"{n:>9} {codec:<16} {len(blob):>8} {len(blob) / base:>6.2f} {enc:>10.0f} {dec:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+/state response cost: the validated response_model path vs serializing once per
+state_version (STATE_RESPONSE_FAST_PATH in app/main.py).
+
+For realistic sessions of 5, 10 and 20 questions, times in-process:
+  validated  load state + SessionStateResponse + FastAPI's response_model round trip
+  miss       load state + SessionStateResponse + one model_dump_json (cache miss)
+  hit        cached bytes
+then GET /session/{id}/state through the app with the flag off and on.
+
+    cd backend
+    python -m benchmarks.bench_state_response --questions 5,10,20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", default="5,10,20", help="Comma-separated session sizes")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500, help="GET /state calls per mode")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_state_response.db")
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.testclient import TestClient
+    from app import main as app_main
+    from app.database import SessionLocal, init_db
+    from app.models import SessionStateResponse
+    from app.repo import SessionRepo
+    from benchmarks.fixtures import realistic_state
+
+    init_db()
+    sizes = [int(q) for q in args.questions.split(",")]
+    states = {n: realistic_state(n, seed=n, with_report=False) for n in sizes}
+    db = SessionLocal()
+    session_ids = {n: SessionRepo(db).create_session("SDE1", "Medium", states[n]).id for n in sizes}
+
+    def validated_path(session):
+        # What FastAPI does with a returned model and response_model=SessionStateResponse
+        response = app_main.session_response(session)
+        content = SessionStateResponse.model_validate(response.model_dump())
+        return json.dumps(jsonable_encoder(content)).encode("utf-8")
+
+    def miss(session):
+        app_main._state_responses._entries.clear()
+        return app_main.state_json_response(session)
+
+    print(f"{'questions':>9} {'validated us':>13} {'miss us':>8} {'hit us':>7}")
+    for n in sizes:
+        session = SessionRepo(db).get_session(session_ids[n])
+        validated = timed(lambda: validated_path(session), args.repeat)
+        missed = timed(lambda: miss(session), args.repeat)
+        hit = timed(lambda: app_main.state_json_response(session), args.repeat)
+        print(f"{n:>9} {validated:>13.1f} {missed:>8.1f} {hit:>7.1f}")
+    db.close()
+
+    print()
+    print(f"{'questions':>9} {'GET /state validated us':>24} {'GET /state fast path us':>24}")
+    with TestClient(app_main.app) as client:
+        for n in sizes:
+            url = f"/session/{session_ids[n]}/state"
+            get = lambda: client.get(url).raise_for_status()
+            with patch.object(app_main, "STATE_RESPONSE_FAST_PATH", False):
+                validated = timed(get, args.requests)
+            fast = timed(get, args.requests)
+            print(f"{n:>9} {validated:>24.0f} {fast:>24.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Time to first audio: whole-text synthesis vs sentence-pipelined streaming (stream_speech).
+
+Uses the stub synthesizer with a fixed delay per request plus a delay per character
+(--request-latency, --sec-per-char; defaults roughly match edge-tts). Each prompt is
+synthesized both ways, with the cache off so every run synthesizes. A second pipelined
+pass reuses the cache to show what sentences shared between prompts cost.
+
+    cd backend
+    python -m benchmarks.bench_tts --sentences 2,4,8 --workers 1,3,6
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def prompt(rng: random.Random, n_sentences: int) -> str:
+    from benchmarks.fixtures import sentence
+
+    return " ".join(sentence(rng, rng.randint(10, 22))[:-1] + "?" for _ in range(n_sentences))
+
+
+async def whole(text: str):
+    from app.services.voice import synthesize_speech
+
+    start = time.perf_counter()
+    await synthesize_speech(text)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+async def pipelined(text: str):
+    from app.services.voice import stream_speech
+
+    start = time.perf_counter()
+    first = None
+    async for _ in stream_speech(text):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", default="2,4,8", help="Comma-separated prompt lengths in sentences")
+    parser.add_argument("--workers", default="1,3,6", help="Comma-separated TTS_PIPELINE_WORKERS values")
+    parser.add_argument("--request-latency", type=float, default=0.3, help="Stub seconds per synthesis request")
+    parser.add_argument("--sec-per-char", type=float, default=0.004, help="Stub seconds per character")
+    parser.add_argument("--prompts", type=int, default=3, help="Prompts per length")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ["TTS_PROVIDER"] = "stub"
+    os.environ["STUB_TTS_LATENCY_SEC"] = str(args.request_latency)
+    os.environ["STUB_TTS_SEC_PER_CHAR"] = str(args.sec_per_char)
+
+    from app import shared_cache as shared_cache_module
+    from app.services import voice
+    from app.shared_cache import MemoryBackend, SharedCache
+
+    voice.TTS_PROVIDER = "stub"
+    rng = random.Random(args.seed)
+    lengths = [int(n) for n in args.sentences.split(",")]
+    workers = [int(w) for w in args.workers.split(",")]
+
+    print(f"stub TTS: {args.request_latency:g}s/request + {args.sec_per_char * 1000:g}ms/char\n")
+    print(f"{'sentences':>9} {'chars':>6} {'mode':<16} {'first audio ms':>15} {'total ms':>9}")
+    for n in lengths:
+        texts = [prompt(rng, n) for _ in range(args.prompts)]
+        chars = statistics.mean(len(t) for t in texts)
+        rows = []
+
+        shared_cache_module.shared_cache = SharedCache(None)  # no cache: every run synthesizes
+        rows.append(("whole", [asyncio.run(whole(t)) for t in texts]))
+        for w in workers:
+            voice.TTS_PIPELINE_WORKERS = w
+            rows.append((f"pipelined x{w}", [asyncio.run(pipelined(t)) for t in texts]))
+
+        # Cached sentences: the same prompts again, all segments already in the cache
+        shared_cache_module.shared_cache = SharedCache(MemoryBackend(), namespaces={"tts"})
+        for t in texts:
+            asyncio.run(pipelined(t))
+        rows.append(("pipelined cached", [asyncio.run(pipelined(t)) for t in texts]))
+
+        for label, runs in rows:
+            first = statistics.mean(r[0] for r in runs) * 1000
+            total = statistics.mean(r[1] for r in runs) * 1000
+            print(f"{n:>9} {chars:>6.0f} {label:<16} {first:>15.0f} {total:>9.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
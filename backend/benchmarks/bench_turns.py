@@ -0,0 +1,140 @@
+"""
+Answer-turn cost: evaluate-then-ask (two LLM calls) vs fused evaluate-and-ask (FUSED_TURNS).
+
+Runs the same interviews through the graph both ways against the stub LLM and reports,
+per answer turn, the provider calls made, the prompt tokens sent (system prompt with
+schema + user prompt, estimated at 4 chars/token) and the wall time. The stub grades an
+answer as needing a follow-up with probability --followup-rate.
+
+    cd backend
+    python -m benchmarks.bench_turns --interviews 10 --questions 5 --llm-latency 0.3
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def initial_state(n_questions: int, resume_text: str) -> dict:
+    return {
+        "resume_text": resume_text, "resume_summary": None,
+        "role": "SDE1", "difficulty": "Medium", "total_questions": n_questions,
+        "question_history": [], "answer_history": [], "eval_history": [],
+        "current_question": None, "current_step": 1, "final_report": None, "is_finished": False,
+    }
+
+
+class Responder:
+    """Stub answers shaped like a real model's, plus a tally of prompt tokens per response model."""
+
+    def __init__(self, rng: random.Random, followup_rate: float):
+        from app.providers import stub_payload
+
+        self._stub_payload = stub_payload
+        self.rng = rng
+        self.followup_rate = followup_rate
+        self.tokens = {}
+        self.calls = {}
+
+    def evaluation(self) -> dict:
+        needed = self.rng.random() < self.followup_rate
+        return {
+            "question_id": "x", "correctness_score": 4 if needed else 8, "depth_score": 4 if needed else 7,
+            "structure_score": 6, "communication_score": 7, "missing_points": ["Failure modes"] if needed else [],
+            "feedback_text": "Solid structure; some gaps.", "followup_needed": needed,
+            "followup_question": "How would that design behave when a node fails mid-write?" if needed else None,
+        }
+
+    def question(self, kind: str) -> dict:
+        return {
+            "id": "x", "text": f"Walk me through a {self.rng.choice(['cache', 'queue', 'index'])} you designed and its tradeoffs.",
+            "topic": "Technical Deep Dive", "expected_points": ["Tradeoffs", "Metrics"], "difficulty": "Medium", "kind": kind,
+        }
+
+    def __call__(self, system_prompt: str, user_prompt: str, response_model):
+        from app.services.batch_eval import estimate_tokens
+
+        name = response_model.__name__
+        self.tokens[name] = self.tokens.get(name, 0) + estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if name == "Evaluation":
+            return self.evaluation()
+        if name == "Question":
+            return self.question("main")
+        if name == "TurnResult":
+            evaluation = self.evaluation()
+            allowed = re.search(r"Allowed Next Kinds: (.*)", user_prompt).group(1).split(", ")
+            kind = "followup" if evaluation["followup_needed"] and "followup" in allowed else "main"
+            return {"evaluation": evaluation, "next_kind": kind, "next_question": self.question(kind)}
+        return self._stub_payload(response_model)
+
+
+def run(fused: bool, args, resume_text: str, answer: str) -> dict:
+    from app import graph
+    from app.llm import LLMClient
+    from app.providers import StubProvider
+    from app.runner import GraphRunner
+
+    responder = Responder(random.Random(args.seed), args.followup_rate)
+    graph.llm_client = LLMClient(providers=[StubProvider(latency=args.llm_latency, responder=responder)])
+    graph.FUSED_TURNS = fused
+    runner = GraphRunner()
+
+    turns, elapsed, answer_tokens, answer_calls = 0, 0.0, 0, 0
+    for i in range(args.interviews):
+        sid = f"{'fused' if fused else 'split'}-{i}"
+        state = runner.run(sid, initial_state(args.questions, resume_text), "start")
+        while not state.get("final_report"):
+            calls_before, tokens_before = sum(responder.calls.values()), sum(responder.tokens.values())
+            start = time.perf_counter()
+            state = runner.run(sid, state, "answer", answer)
+            if state.get("final_report"):
+                break  # the last turn also writes the report; keep it out of the per-turn numbers
+            elapsed += time.perf_counter() - start
+            turns += 1
+            answer_calls += sum(responder.calls.values()) - calls_before
+            answer_tokens += sum(responder.tokens.values()) - tokens_before
+
+    return {
+        "turns": turns, "calls_per_turn": answer_calls / turns, "prompt_tokens_per_turn": answer_tokens / turns,
+        "ms_per_turn": elapsed * 1000 / turns, "calls": dict(responder.calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM seconds per call")
+    parser.add_argument("--followup-rate", type=float, default=0.4, help="Share of answers graded as needing a follow-up")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'turns_bench.db')}")
+    os.environ["SHARED_CACHE_BACKEND"] = "off"
+
+    from app.database import init_db
+    from benchmarks.fixtures import sentence
+
+    init_db()
+    rng = random.Random(args.seed)
+    resume_text = " ".join(sentence(rng, 15) for _ in range(40))
+    answer = " ".join(sentence(rng, 18) for _ in range(5))
+
+    print(f"{args.interviews} interviews x {args.questions} questions, stub LLM {args.llm_latency:g}s/call, "
+          f"follow-up rate {args.followup_rate:g}\n")
+    print(f"{'mode':<8} {'turns':>6} {'calls/turn':>11} {'prompt tok/turn':>16} {'ms/turn':>8}  calls")
+    for fused in (False, True):
+        r = run(fused, args, resume_text, answer)
+        label = "fused" if fused else "split"
+        print(f"{label:<8} {r['turns']:>6} {r['calls_per_turn']:>11.2f} {r['prompt_tokens_per_turn']:>16.0f} "
+              f"{r['ms_per_turn']:>8.1f}  {r['calls']}")
+
+
+if __name__ == "__main__":
+    main()
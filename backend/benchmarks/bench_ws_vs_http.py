@@ -0,0 +1,151 @@
+"""
+Load test: HTTP request/response turns vs the /session/{id}/ws channel.
+
+Starts one uvicorn worker in-process (stub LLM, temp SQLite), then N simulated
+candidates each answer K questions concurrently, either via
+POST /answer + GET /state (what the interview page does) or over the WebSocket.
+
+    cd backend
+    python -m benchmarks.bench_ws_vs_http --candidates 50 --turns 5 --llm-latency 0.2
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int):
+    import uvicorn
+    from app.main import app
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_queue=64)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def create_sessions(n: int, turns: int) -> list:
+    from app.database import SessionLocal
+    from app.repo import SessionRepo
+
+    state = {
+        "resume_text": "", "resume_summary": {"skills": ["python"]},
+        "role": "SDE1", "difficulty": "Easy", "total_questions": turns + 1,
+        "question_history": [], "answer_history": [], "eval_history": [],
+        "current_question": {"id": "q_1", "text": "Tell me about yourself.", "topic": "General/Intro",
+                             "expected_points": [], "difficulty": "Easy", "kind": "main"},
+        "transcript": [{"role": "interviewer", "text": "Tell me about yourself."}],
+        "asked_main_questions": 1, "followup_count_for_current": 0, "max_followups_per_question": 0,
+        "final_report": None, "is_finished": False,
+    }
+    db = SessionLocal()
+    repo = SessionRepo(db)
+    ids = [repo.create_session("SDE1", "Easy", state).id for _ in range(n)]
+    db.close()
+    return ids
+
+
+ANSWER = "I designed a queue-based pipeline with idempotent consumers and backpressure. " * 4
+
+
+async def http_candidate(client, session_id: str, turns: int, latencies: list, errors: list):
+    for _ in range(turns):
+        start = time.perf_counter()
+        try:
+            r = await client.post(f"/session/{session_id}/answer", json={"text": ANSWER})
+            r.raise_for_status()
+            (await client.get(f"/session/{session_id}/state")).raise_for_status()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def ws_candidate(base_ws: str, session_id: str, turns: int, latencies: list, errors: list):
+    import json
+    import websockets
+
+    try:
+        async with websockets.connect(f"{base_ws}/session/{session_id}/ws") as ws:
+            json.loads(await ws.recv())  # initial state
+            for _ in range(turns):
+                start = time.perf_counter()
+                await ws.send(json.dumps({"type": "answer", "text": ANSWER}))
+                while True:
+                    event = json.loads(await ws.recv())
+                    if event["type"] in ("progress", "complete", "error"):
+                        break
+                if event["type"] == "error":
+                    errors.append(event.get("detail"))
+                    continue
+                latencies.append(time.perf_counter() - start)
+    except Exception as e:
+        errors.append(str(e))
+
+
+async def run_mode(mode: str, port: int, session_ids: list, turns: int) -> dict:
+    import httpx
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    if mode == "http":
+        limits = httpx.Limits(max_connections=len(session_ids))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300, limits=limits) as client:
+            await asyncio.gather(*(http_candidate(client, sid, turns, latencies, errors) for sid in session_ids))
+    else:
+        await asyncio.gather(*(ws_candidate(f"ws://127.0.0.1:{port}", sid, turns, latencies, errors) for sid in session_ids))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pick = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0
+    return {
+        "turns": len(latencies), "errors": len(errors), "elapsed": elapsed,
+        "turns_per_sec": len(latencies) / elapsed if elapsed else 0,
+        "p50_ms": pick(0.5), "p95_ms": pick(0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM seconds per call")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ws_bench.db')}")
+    os.environ["LLM_PROVIDERS"] = "stub"
+    os.environ["STUB_LLM_LATENCY_SEC"] = str(args.llm_latency)
+    os.environ["LLM_MAX_CONCURRENCY"] = str(max(8, args.candidates))
+    os.environ["APP_WARMUP"] = "true"
+
+    port = _free_port()
+    server, thread = start_server(port)
+    try:
+        print(f"{args.candidates} candidates x {args.turns} turns, stub LLM {args.llm_latency}s/call, 1 worker\n")
+        print(f"{'mode':<6} {'turns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7} {'elapsed s':>10}")
+        for mode in ("http", "ws"):
+            ids = create_sessions(args.candidates, args.turns)
+            r = asyncio.run(run_mode(mode, port, ids, args.turns))
+            print(f"{mode:<6} {r['turns_per_sec']:>9.1f} {r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f} {r['errors']:>7} {r['elapsed']:>10.1f}")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
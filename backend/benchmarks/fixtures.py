@@ -0,0 +1,74 @@
+"""
+Shared synthetic data for the benchmark scripts.
+"""
+import random
+
+WORDS = (
+    "system design latency throughput cache database index partition replica queue "
+    "consistency availability tradeoff service api request response client server "
+    "thread lock memory cpu scale shard kafka redis postgres python java project team"
+).split()
+
+
+def sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def realistic_state(n_questions: int, seed: int = 0, with_report: bool = True) -> dict:
+    """
+    An interview state shaped like what the graph persists after n_questions main
+    questions, with roughly one follow-up for every other question.
+    """
+    rng = random.Random(seed)
+    transcript, questions, answers, evals = [], [], [], []
+
+    for i in range(1, n_questions + 1):
+        ids = [f"q_{i}"] + ([f"q_{i}_f1"] if i % 2 == 0 else [])
+        for qid in ids:
+            q_text = " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(2))
+            a_text = " ".join(sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(3, 8)))
+            question = {
+                "id": qid, "text": q_text, "topic": "Technical Deep Dive",
+                "expected_points": [sentence(rng, 5) for _ in range(3)],
+                "difficulty": "Medium", "kind": "followup" if "_f" in qid else "main",
+                "time_limit_sec": 60,
+            }
+            questions.append(question)
+            answers.append({"question_id": qid, "text": a_text})
+            evals.append({
+                "question_id": qid,
+                "correctness_score": rng.randint(3, 9), "depth_score": rng.randint(3, 9),
+                "structure_score": rng.randint(3, 9), "communication_score": rng.randint(3, 9),
+                "missing_points": [sentence(rng, 6) for _ in range(2)],
+                "feedback_text": " ".join(sentence(rng, 12) for _ in range(3)),
+                "followup_needed": qid == f"q_{i}" and i % 2 == 0,
+                "followup_reason": None, "followup_question": None,
+            })
+            transcript.append({"role": "interviewer", "text": q_text})
+            transcript.append({"role": "candidate", "text": a_text})
+
+    report = None
+    if with_report:
+        report = {
+            "overall_score": 7,
+            "category_scores": {"correctness": 7, "depth": 6, "structure": 8, "communication": 7},
+            "strengths": [sentence(rng, 12) for _ in range(3)],
+            "weaknesses": [sentence(rng, 12) for _ in range(3)],
+            "improvement_plan_7_days": [f"Day {d}: " + sentence(rng, 15) for d in range(1, 8)],
+            "improved_answers": [{"question": questions[0]["text"], "ideal_answer": sentence(rng, 60)}],
+        }
+
+    return {
+        "resume_text": " ".join(sentence(rng, 15) for _ in range(60)),
+        "resume_summary": {
+            "skills": rng.sample(WORDS, 10), "projects": [sentence(rng, 10) for _ in range(3)],
+            "achievements": [sentence(rng, 10) for _ in range(2)], "keywords": rng.sample(WORDS, 8),
+            "raw_text_snippet": None,
+        },
+        "role": "SDE1", "difficulty": "Medium", "total_questions": n_questions,
+        "question_history": questions, "answer_history": answers, "eval_history": evals,
+        "current_question": questions[-1], "current_step": n_questions,
+        "transcript": transcript, "asked_main_questions": n_questions,
+        "followup_count_for_current": 0, "max_followups_per_question": 1,
+        "pending_followup": None, "final_report": report, "is_finished": with_report,
+    }
@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+# Keep tests off the checked-in interviewer.db; must run before app.database is imported.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='interviewer_test_')}/test.db")
+
+
+# --- Shared state factories (import with `from conftest import ...`) ---
+
+def new_state(**overrides) -> dict:
+    """A fresh interview state, as /session/start builds it before the graph runs."""
+    state = {
+        "resume_text": "Python and Postgres.", "resume_summary": None,
+        "role": "SDE1", "difficulty": "Easy", "total_questions": 2,
+        "question_history": [], "answer_history": [], "eval_history": [],
+        "current_question": None, "current_step": 1, "final_report": None, "is_finished": False,
+    }
+    state.update(overrides)
+    return state
+
+
+def scored_state(topic: str, scores, fixed=None, **overrides) -> dict:
+    """
+    A state with one evaluated main question per score on topic. Each score goes to all four
+    metrics, except the ones given in fixed (e.g. {"correctness_score": 5}).
+    """
+    questions = [{"id": f"q_{i}", "topic": topic, "kind": "main"} for i in range(1, len(scores) + 1)]
+    evals = [
+        {"question_id": q["id"], "correctness_score": s, "depth_score": s, "structure_score": s,
+         "communication_score": s, "followup_needed": False, **(fixed or {})}
+        for q, s in zip(questions, scores)
+    ]
+    state = {"role": "SDE1", "difficulty": "Medium", "question_history": questions, "eval_history": evals,
+             "final_report": None}
+    state.update(overrides)
+    return state
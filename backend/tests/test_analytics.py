@@ -0,0 +1,62 @@
+import uuid
+from app.database import SessionLocal, init_db
+from app.services import analytics
+from conftest import scored_state
+
+# Only depth varies; the other metrics stay at 5
+DEPTH_ONLY = {"correctness_score": 5, "structure_score": 5, "communication_score": 5}
+
+
+def test_incremental_materialization_and_percentiles():
+    init_db()
+    db = SessionLocal()
+    topic = f"topic-{uuid.uuid4()}"
+    session_id = str(uuid.uuid4())
+    state = scored_state(topic, [2, 4, 6, 8, 10], fixed=DEPTH_ONLY, difficulty="Hard")
+
+    # Turn-by-turn: only the newly added evaluation is written each time
+    for n in range(1, 6):
+        partial = dict(state, eval_history=state["eval_history"][:n])
+        analytics.record_turn(db, session_id, n - 1, False, partial)
+
+    groups = analytics.evaluation_stats(db, metric="depth", group_by=["difficulty"], role="SDE1", topic=topic)
+    db.close()
+
+    assert len(groups) == 1
+    g = groups[0]
+    assert g["difficulty"] == "Hard"
+    assert g["count"] == 5
+    assert g["avg"] == 6
+    assert g["p50"] == 6
+    assert g["histogram"] == {"2": 1, "4": 1, "6": 1, "8": 1, "10": 1}
+
+
+def test_reevaluation_upserts_instead_of_duplicating():
+    init_db()
+    db = SessionLocal()
+    topic = f"topic-{uuid.uuid4()}"
+    session_id = str(uuid.uuid4())
+    state = scored_state(topic, [3], fixed=DEPTH_ONLY, difficulty="Hard")
+    analytics.record_turn(db, session_id, 0, False, state)
+
+    state["eval_history"][0]["depth_score"] = 9
+    analytics.record_evaluations(db, session_id, state, state["eval_history"])
+
+    groups = analytics.evaluation_stats(db, metric="depth", topic=topic)
+    db.close()
+    assert groups[0]["count"] == 1
+    assert groups[0]["histogram"] == {"9": 1}
+
+
+def test_report_category_scores():
+    init_db()
+    db = SessionLocal()
+    category = f"cat-{uuid.uuid4()}"
+    for score in (4, 8):
+        state = {"role": "SDE1", "difficulty": "Easy", "eval_history": [],
+                 "final_report": {"category_scores": {category: score}}}
+        analytics.record_turn(db, str(uuid.uuid4()), 0, False, state)
+
+    groups = analytics.report_stats(db, category=category)
+    db.close()
+    assert groups == [{"category": category, "count": 2, "avg": 6, "p50": 4, "p90": 8, "p95": 8, "histogram": {"4": 1, "8": 1}}]
@@ -0,0 +1,91 @@
+import re
+import time
+from unittest.mock import patch
+
+from app.llm import LLMClient
+from app.providers import StubProvider
+from app.models import BatchEvaluationItem, BatchEvaluationFailure, Evaluation, EvaluationBatch
+from app.services.batch_eval import pack_batches, evaluate_items
+
+
+def make_items(n, answer_len=50):
+    return [
+        BatchEvaluationItem(id=f"item_{i}", question=f"Question {i}?", expected_points=["a", "b"], answer="word " * answer_len)
+        for i in range(n)
+    ]
+
+
+def batch_responder(system_prompt, user_prompt, response_model):
+    def evaluation(item_id):
+        return Evaluation(
+            question_id=item_id, correctness_score=7, depth_score=6,
+            structure_score=8, communication_score=7, feedback_text="ok"
+        )
+    if response_model is EvaluationBatch:
+        ids = re.findall(r"### ITEM ID: (\S+)", user_prompt)
+        # Drop the last item to exercise the per-item fallback
+        return EvaluationBatch(evaluations=[evaluation(i) for i in ids[:-1]])
+    return evaluation("single")
+
+
+def test_pack_batches_respects_token_budget():
+    items = make_items(20)
+    batches = list(pack_batches(items, token_budget=2000))
+
+    assert sum(len(b) for b in batches) == 20
+    assert len(batches) > 1
+    assert all(len(b) >= 1 for b in batches)
+
+
+def test_oversized_item_gets_its_own_batch():
+    items = make_items(3, answer_len=5000)
+    batches = list(pack_batches(items, token_budget=1000))
+    assert [len(b) for b in batches] == [1, 1, 1]
+
+
+def test_evaluate_items_returns_one_result_per_item():
+    stub = StubProvider(responder=batch_responder)
+    with patch("app.services.batch_eval.llm_client", LLMClient(providers=[stub])):
+        results = list(evaluate_items(make_items(12), token_budget=2500, max_workers=4))
+
+    assert sorted(r.question_id for r in results) == sorted(f"item_{i}" for i in range(12))
+    assert all(isinstance(r, Evaluation) for r in results)
+    # Far fewer calls than one per item, even with the fallback for the dropped item
+    assert stub.calls < 12
+
+
+def test_failed_batch_yields_failures_instead_of_aborting():
+    stub = StubProvider(failure_rate=1.0)
+    with patch("app.services.batch_eval.llm_client", LLMClient(providers=[stub])):
+        results = list(evaluate_items(make_items(3), max_workers=2))
+
+    assert len(results) == 3
+    assert all(isinstance(r, BatchEvaluationFailure) for r in results)
+
+
+def test_closing_the_stream_cancels_pending_batches():
+    calls = []
+
+    def slow(system_prompt, user_prompt, response_model):
+        calls.append(1)
+        time.sleep(0.1)
+        return batch_responder(system_prompt, user_prompt, response_model)
+
+    items = make_items(8, answer_len=2000)  # one item per batch
+    with patch("app.services.batch_eval.llm_client", LLMClient(providers=[StubProvider(responder=slow)])):
+        results = evaluate_items(items, token_budget=1000, max_workers=1)
+        next(results)
+        start = time.perf_counter()
+        results.close()
+        assert time.perf_counter() - start < 0.1
+        time.sleep(0.3)
+    assert len(calls) <= 2
+
+
+def test_duplicate_item_ids_are_rejected():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    item = {"id": "q_1", "question": "What is a B-tree?", "answer": "A balanced search tree."}
+    response = TestClient(app).post("/evaluate/batch", json={"items": [item, item]})
+    assert response.status_code == 400 and "q_1" in response.json()["detail"]
@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import patch
+
+from app.database import init_db, SessionLocal
+from app.graph import get_graph
+from app.llm import LLMClient
+from app.models import GraphCheckpointBlob
+from app.providers import StubProvider
+from app.repo import SessionRepo
+from app.runner import CheckpointRunner, GraphRunner
+from conftest import new_state
+
+RESUME = "Built a queue-based pipeline in Python. " * 50  # large, so re-writing it per step would show
+
+
+@pytest.fixture
+def runner():
+    init_db()
+    stub = LLMClient(providers=[StubProvider()])
+    with patch("app.graph.llm_client", stub):
+        yield CheckpointRunner()
+
+
+def blob_channels(session_id):
+    db = SessionLocal()
+    try:
+        return [b.channel for b in db.query(GraphCheckpointBlob).filter(GraphCheckpointBlob.thread_id == session_id)]
+    finally:
+        db.close()
+
+
+def test_turns_resume_from_checkpoint(runner):
+    sid = "ckpt-turns"
+    state = runner.run(sid, new_state(resume_text=RESUME), "start")
+    assert state["current_question"]["id"] == "q_1"
+
+    snapshot = get_graph(True).get_state({"configurable": {"thread_id": sid}})
+    assert snapshot.next == ("await_answer",)
+
+    # The caller's copy is not needed: the answer alone resumes the thread
+    state = runner.run(sid, {}, "answer", "A detailed answer.")
+    assert len(state["eval_history"]) == 1
+    assert state["answer_history"][-1] == {"question_id": "q_1", "text": "A detailed answer."}
+    assert state["current_question"]["id"] in ("q_1_f1", "q_2")
+
+    state = runner.run(sid, {}, "end")
+    assert state["final_report"] and state["is_finished"]
+    assert not get_graph(True).get_state({"configurable": {"thread_id": sid}}).next
+
+    # Ending again is a no-op on a completed thread
+    assert runner.run(sid, state, "end") == state
+
+
+def test_only_changed_channels_are_persisted(runner):
+    sid = "ckpt-deltas"
+    runner.run(sid, new_state(resume_text=RESUME), "start")
+    runner.run(sid, {}, "answer", "First answer.")
+
+    channels = blob_channels(sid)
+    # Written once by the input step, never again by the nodes
+    assert channels.count("resume_text") == 1
+    assert channels.count("role") == 1
+    assert channels.count("eval_history") >= 2
+
+    history = runner.history(sid)
+    assert history[0]["step"] > history[-1]["step"]
+    evaluate_step = next(h for h in history if "eval_history" in h["updated_channels"])
+    assert "resume_text" not in evaluate_step["updated_channels"]
+
+    at = runner.state_at(sid, evaluate_step["checkpoint_id"])
+    assert len(at["values"]["eval_history"]) == 1
+
+    # The limit is applied in the query, newest checkpoints first
+    assert runner.history(sid, limit=2) == history[:2]
+
+
+def test_adopts_session_without_checkpoint(runner):
+    db = SessionLocal()
+    try:
+        repo = SessionRepo(db)
+        session = repo.create_session("SDE1", "Easy", new_state(resume_text=RESUME))
+        legacy = GraphRunner().run(session.id, session.state_json, "start")
+        repo.update_session_state(session.id, legacy)
+        session = repo.get_session(session.id)
+
+        # No thread yet: load_state falls back to state_json
+        assert runner.load_state(session) == session.state_json
+
+        state = runner.run(session.id, session.state_json, "answer", "Answer after upgrade.")
+        assert state["answer_history"][-1]["question_id"] == "q_1"
+        assert len(state["eval_history"]) == 1
+    finally:
+        db.close()
@@ -0,0 +1,114 @@
+import time
+import uuid
+import pytest
+from unittest.mock import patch
+
+from app.fallbacks import heuristic_evaluation, QUESTION_BANK, ROLE_QUESTION_BANK, effective_evaluations
+from app.llm import LLMClient, LLMDeadlineExceeded
+from app.models import Evaluation, Question
+from app.providers import StubProvider, stub_payload
+from app.runner import GraphRunner
+from conftest import new_state
+
+
+def slow_for(*models, delay=0.5):
+    def responder(system_prompt, user_prompt, response_model):
+        if response_model in models:
+            time.sleep(delay)
+        return stub_payload(response_model)
+    return responder
+
+
+def test_generate_structured_deadline():
+    client = LLMClient(providers=[StubProvider(latency=1.0)])
+    start = time.perf_counter()
+    with pytest.raises(LLMDeadlineExceeded):
+        client.generate_structured("sys", "user", Evaluation, deadline_sec=0.05)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_slow_evaluation_falls_back_then_finalizes():
+    stub = LLMClient(providers=[StubProvider(responder=slow_for(Evaluation, delay=0.3))])
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub), patch("app.graph.EVAL_DEADLINE_SEC", 0.05):
+        state = runner.run("dl-eval", new_state(), "start")
+        state = runner.run("dl-eval", state, "answer", "Short answer.")
+
+        evaluation = state["eval_history"][-1]
+        assert evaluation["provisional"] and evaluation["question_id"] == "q_1"
+        assert state["degraded_steps"][-1]["node"] == "evaluate_answer"
+
+        # The report step waits for the background grade and records it
+        state = runner.run("dl-eval", state, "end")
+
+    assert state["final_report"]
+    final = state["deferred_evaluations"]["q_1"]
+    assert not final["provisional"]
+    assert effective_evaluations(state)[0] == final
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_late_evaluation_is_adopted_not_repeated(fused):
+    calls = []
+
+    def responder(system_prompt, user_prompt, response_model):
+        calls.append(response_model.__name__)
+        if response_model.__name__ in ("Evaluation", "TurnResult"):
+            time.sleep(0.3)
+        return stub_payload(response_model)
+
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub), patch("app.graph.EVAL_DEADLINE_SEC", 0.05), \
+            patch("app.graph.FUSED_TURNS", fused):
+        state = runner.run(f"dl-adopt-{fused}", new_state(), "start")
+        # A fresh answer, so no earlier test's background grade is keyed the same
+        state = runner.run(f"dl-adopt-{fused}", state, "answer", f"Short answer {uuid.uuid4().hex}.")
+        assert state["eval_history"][-1]["provisional"]
+        state = runner.run(f"dl-adopt-{fused}", state, "end")
+
+    # The grade that missed its deadline is the one the report uses; no second grading call
+    assert not state["deferred_evaluations"]["q_1"]["provisional"]
+    graded = [c for c in calls if c in ("Evaluation", "TurnResult")]
+    assert graded == ["TurnResult" if fused else "Evaluation"]
+
+
+def test_slow_question_uses_bank():
+    stub = LLMClient(providers=[StubProvider(responder=slow_for(Question))])
+    with patch("app.graph.llm_client", stub), patch("app.graph.QUESTION_DEADLINE_SEC", 0.05):
+        state = GraphRunner().run("dl-question", new_state(), "start")
+
+    question = state["current_question"]
+    assert question["id"] == "q_1" and question["topic"] == "General/Intro"
+    assert question["text"] == QUESTION_BANK["General/Intro"][0]["text"]
+    assert state["degraded_steps"] == [{
+        "node": "generate_main_question", "question_id": "q_1", "fallback": "question_bank", "budget_sec": 0.05
+    }]
+
+
+def test_slow_question_uses_role_bank_for_product_manager():
+    stub = LLMClient(providers=[StubProvider(responder=slow_for(Question))])
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub), patch("app.graph.QUESTION_DEADLINE_SEC", 0.05):
+        state = runner.run("dl-question-pm", new_state(role="Product Manager"), "start")
+        state = runner.run("dl-question-pm", state, "answer", "I led the checkout redesign.")
+
+    question = state["current_question"]
+    assert question["id"] == "q_2" and question["topic"] == "Technical Deep Dive"
+    assert question["text"] == ROLE_QUESTION_BANK["Product Manager"]["Technical Deep Dive"][0]["text"]
+    assert all(question["text"] != e["text"] for e in ROLE_QUESTION_BANK["SDE1"]["Technical Deep Dive"])
+
+
+def test_heuristic_evaluation_rubric():
+    question = {"id": "q_2", "expected_points": ["Cache invalidation strategy", "Consistent hashing", "Replication lag"]}
+    thorough = heuristic_evaluation(question, (
+        "We used consistent hashing across the cache nodes. For the invalidation strategy we published "
+        "write events and let each cache expire keys on receipt. Replication lag was bounded by reading "
+        "from the primary for a short window after writes. That kept stale reads rare in practice."
+    ))
+    vague = heuristic_evaluation(question, "I would add a cache.")
+
+    assert thorough.missing_points == [] and not thorough.followup_needed
+    assert vague.followup_needed and len(vague.missing_points) == 3
+    assert thorough.depth_score > vague.depth_score
+    assert thorough.provisional and vague.provisional
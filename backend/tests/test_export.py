@@ -0,0 +1,84 @@
+import io
+import json
+import tarfile
+import zipfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from app.database import SessionLocal, init_db
+from app.models import ExportFilters, RoleEnum
+from app.repo import SessionRepo
+from app.services import export
+
+
+REPORT = {
+    "overall_score": 7,
+    "category_scores": {"correctness": 7, "depth": 6},
+    "strengths": ["Clear"],
+    "weaknesses": ["Shallow"],
+    "improvement_plan_7_days": ["Day 1: practice"],
+    "improved_answers": []
+}
+
+
+@pytest.fixture
+def sessions():
+    init_db()
+    db = SessionLocal()
+    repo = SessionRepo(db)
+    created = []
+    for i, role in enumerate(["SDE1", "SDE1", "Product Manager"]):
+        s = repo.create_session(role, "Easy", {"final_report": REPORT, "role": role})
+        created.append(s.id)
+    unfinished = repo.create_session("SDE1", "Easy", {"final_report": None})
+    created.append(unfinished.id)
+    db.close()
+    yield created
+
+    db = SessionLocal()
+    for sid in created:
+        db.delete(SessionRepo(db).get_session(sid))
+    db.commit()
+    db.close()
+
+
+def test_zip_export_filters_by_role(sessions, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_WORKERS", 1)
+    data = b"".join(export.stream_export(ExportFilters(role=RoleEnum.SDE1), fmt="zip"))
+
+    names = zipfile.ZipFile(io.BytesIO(data)).namelist()
+    assert f"{sessions[0]}/report.json" in names
+    assert f"{sessions[0]}/report.pdf" in names
+    assert f"{sessions[2]}/report.json" not in names  # other role
+    assert f"{sessions[3]}/report.json" not in names  # no report yet
+    assert "index.csv" in names
+
+
+def test_tar_export_without_pdf(sessions):
+    filters = ExportFilters(created_from=datetime.utcnow() - timedelta(hours=1))
+    data = b"".join(export.stream_export(filters, fmt="tar", include_pdf=False))
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+        names = tar.getnames()
+        report = json.load(tar.extractfile(f"{sessions[2]}/report.json"))
+    assert report["overall_score"] == 7
+    assert not any(n.endswith(".pdf") for n in names)
+
+
+def test_pdf_workers_spawned_and_only_render(sessions, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_WORKERS", 2)
+    executor = export._make_executor(include_pdf=True)
+    try:
+        assert executor._mp_context.get_start_method() == "spawn"
+    finally:
+        executor.shutdown()
+
+    # Cache reads and writes stay in the exporting process; a second export renders nothing
+    monkeypatch.setattr(export, "EXPORT_WORKERS", 1)
+    filters = ExportFilters(role=RoleEnum.SDE1)
+    first = zipfile.ZipFile(io.BytesIO(b"".join(export.stream_export(filters))))
+    with patch.object(export, "_render", side_effect=AssertionError("rendered twice")):
+        second = zipfile.ZipFile(io.BytesIO(b"".join(export.stream_export(filters))))
+    pdf = f"{sessions[0]}/report.pdf"
+    assert second.read(pdf) == first.read(pdf)
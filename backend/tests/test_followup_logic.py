@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from app.graph import workflow, InterviewState
 from app.models import Evaluation, Question, DifficultyEnum
+from conftest import new_state
 
 # Mock LLM Client
 @pytest.fixture
@@ -85,3 +86,104 @@ def test_followup_trigger_logic(mock_llm):
     state["eval_history"].append(mock_eval.model_dump()) # Append another bad eval
     next_node_2 = decide_next_step(state)
     assert next_node_2 == "generate_main_question", "Should move to next main question if max followups reached"
+
+
+def test_followup_promoted_from_evaluation(mock_llm):
+    state = InterviewState(
+        current_question={"id": "q_2", "text": "How does HTTP caching work?", "expected_points": [], "topic": "Networking", "kind": "main", "difficulty": "Medium"},
+        answer_history=[{"question_id": "q_2", "text": "Browsers keep copies."}],
+        eval_history=[Evaluation(
+            question_id="q_2", correctness_score=4, depth_score=3, structure_score=5, communication_score=5,
+            missing_points=["Cache-Control", "ETags"], feedback_text="Too brief.", followup_needed=True,
+            followup_question="How would you use ETags to revalidate a cached response?"
+        ).model_dump()],
+        transcript=[], question_history=[], followup_count_for_current=0, difficulty="Medium",
+    )
+
+    from app.graph import node_generate_followup
+    state = node_generate_followup(state)
+
+    mock_llm.generate_structured.assert_not_called()
+    assert state["current_question"] == {
+        "id": "q_2_f1", "text": "How would you use ETags to revalidate a cached response?", "topic": "Networking",
+        "expected_points": ["Cache-Control", "ETags"], "difficulty": "Medium", "kind": "followup", "time_limit_sec": 60,
+    }
+
+    # A blank suggestion falls back to the dedicated follow-up call
+    state["eval_history"] = [{**state["eval_history"][0], "followup_question": "  "}]
+    mock_llm.generate_structured.return_value = Question(
+        id="x", text="What does Cache-Control: no-cache mean?", topic="x", expected_points=[], difficulty=DifficultyEnum.MEDIUM
+    )
+    state = node_generate_followup(state)
+    assert mock_llm.generate_structured.call_count == 1
+    assert state["current_question"]["id"] == "q_2_f2"
+
+
+def test_fused_turn_one_call_and_local_limits():
+    from app.llm import LLMClient
+    from app.providers import StubProvider, stub_payload
+    from app.runner import GraphRunner
+
+    seen = []
+
+    def responder(system_prompt, user_prompt, response_model):
+        seen.append(response_model.__name__)
+        if response_model.__name__ != "TurnResult":
+            return stub_payload(response_model)
+        # The model always asks for a follow-up, even once the cap is reached
+        evaluation = {**stub_payload(Evaluation), "followup_needed": True, "followup_question": None}
+        question = {**stub_payload(Question), "text": "Which failure modes did you test?"}
+        return {"evaluation": evaluation, "next_kind": "followup", "next_question": question}
+
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    state = new_state(resume_text="Python.")
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub), patch("app.graph.FUSED_TURNS", True):
+        state = runner.run("fused", state, "start")
+        seen.clear()
+        state = runner.run("fused", state, "answer", "An answer.")
+        assert seen == ["TurnResult"]
+        assert state["current_question"]["id"] == "q_1_f1"
+        assert state["current_question"]["text"] == "Which failure modes did you test?"
+        assert state["prepared_question"] is None
+
+        # Follow-up cap reached: the model's follow-up is discarded and q_2 is asked instead
+        seen.clear()
+        state = runner.run("fused", state, "answer", "Another answer.")
+        assert seen == ["TurnResult", "Question"]
+        assert state["current_question"]["id"] == "q_2"
+
+
+def test_fused_question_is_used_or_dropped_with_the_report():
+    from app.llm import LLMClient
+    from app.providers import StubProvider, stub_payload
+    from app.runner import GraphRunner
+
+    seen = []
+
+    def responder(system_prompt, user_prompt, response_model):
+        seen.append(response_model.__name__)
+        if response_model.__name__ != "TurnResult":
+            return stub_payload(response_model)
+        # The model writes a follow-up but doesn't flag one as needed
+        evaluation = {**stub_payload(Evaluation), "followup_needed": False, "followup_question": None}
+        question = {**stub_payload(Question), "text": "How did you roll that change out?"}
+        return {"evaluation": evaluation, "next_kind": "followup", "next_question": question}
+
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub), patch("app.graph.FUSED_TURNS", True):
+        state = runner.run("fused-kinds", new_state(resume_text="Python."), "start")
+        seen.clear()
+        # The question it wrote is asked; no second call for a main question
+        state = runner.run("fused-kinds", state, "answer", "An answer.")
+        assert seen == ["TurnResult"]
+        assert state["current_question"]["text"] == "How did you roll that change out?"
+        assert state["eval_history"][-1]["followup_needed"]
+
+        # Last main question and no follow-up flagged: straight to the report, nothing left prepared
+        state = runner.run("fused-last", new_state(resume_text="Python.", total_questions=1), "start")
+        seen.clear()
+        state = runner.run("fused-last", state, "answer", "An answer.")
+        assert seen == ["TurnResult", "FinalReport"]
+        assert state["final_report"] and state["prepared_question"] is None
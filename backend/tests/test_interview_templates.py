@@ -0,0 +1,65 @@
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.interview_templates import template_registry, topic_for, question_system_prompt
+from app.llm import LLMClient, system_prompt_with_schema
+from app.main import app
+from app.models import Question
+from app.providers import StubProvider, stub_payload
+from app.runner import GraphRunner
+from conftest import new_state
+
+
+def test_default_template_keeps_legacy_topics():
+    template = template_registry.for_state({"role": "SDE1", "difficulty": "Easy"})
+    topics = [topic_for(template, i) for i in range(1, 6)]
+    assert topics == ["General/Intro", "Technical Deep Dive", "Technical Deep Dive",
+                      "System Design / Architecture", "System Design / Architecture"]
+
+
+def test_template_schedule_drives_question_prompts():
+    question_prompts = []
+
+    def responder(system_prompt, user_prompt, response_model):
+        if response_model is Question:
+            question_prompts.append(system_prompt)
+        return stub_payload(response_model)
+
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    runner = GraphRunner()
+    with patch("app.graph.llm_client", stub):
+        state = new_state(resume_text="Python, Kafka, Postgres.", difficulty="Hard", total_questions=3,
+                          template_id="sde1-system-design")
+        state = runner.run("tpl-1", state, "start")
+        for _ in range(2):
+            state = runner.run("tpl-1", state, "answer", "An answer.")
+
+    assert [p.split("Current Topic Focus: ")[1].split("\n")[0] for p in question_prompts] == [
+        "General/Intro", "System Design / Architecture", "Scalability & Reliability"
+    ]
+    # The rendered prefix is reused, not rebuilt, on later turns
+    prefix = question_system_prompt("SDE1", "Hard", "General/Intro")
+    assert system_prompt_with_schema(prefix, Question) is question_prompts[0]
+
+
+def test_stub_prefix_cache():
+    stub = StubProvider(prefix_latency=0.01)
+    for _ in range(3):
+        stub.complete("same system prompt", "user", Question)
+    stub.complete("another system prompt", "user", Question)
+    assert (stub.prefix_hits, stub.prefix_misses) == (2, 2)
+
+
+def test_start_session_from_template():
+    stub = LLMClient(providers=[StubProvider()])
+    resume = {"resume": ("resume.pdf", b"%PDF-1.4\n", "application/pdf")}
+    with patch("app.graph.llm_client", stub), patch("app.main.parse_resume_upload", return_value="Resume text"), \
+            TestClient(app) as client:
+        assert client.get("/templates").status_code == 200
+
+        r = client.post("/session/start", data={"template_id": "pm-product-sense"}, files=resume)
+        assert r.status_code == 200
+        assert r.json()["progress"] == "1/4"
+
+        assert client.post("/session/start", data={"template_id": "nope"}, files=resume).status_code == 404
+        assert client.post("/session/start", data={"role": "SDE1"}, files=resume).status_code == 422
@@ -0,0 +1,57 @@
+import pytest
+from app.llm import LLMClient
+from app.llm_cache import ResponseCache, CacheMissError
+from app.providers import StubProvider
+from app.models import ResumeSummary, Question
+
+
+@pytest.fixture
+def cache_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'llm_cache.db'}"
+
+
+def test_cached_node_hits_after_first_call(cache_url):
+    stub = StubProvider()
+    client = LLMClient(providers=[stub], cache=ResponseCache(url=cache_url, mode="rw"))
+
+    first = client.generate_structured("sys", "resume text", ResumeSummary, cache_tag="summarize")
+    second = client.generate_structured("sys", "resume text", ResumeSummary, cache_tag="summarize")
+
+    assert first == second
+    assert stub.calls == 1
+    stats = client.cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_uncached_nodes_always_call_provider(cache_url):
+    stub = StubProvider()
+    client = LLMClient(providers=[stub], cache=ResponseCache(url=cache_url, mode="rw"))
+
+    client.generate_structured("sys", "user", Question)
+    client.generate_structured("sys", "user", Question, cache_tag="generate_question")
+
+    assert stub.calls == 2
+
+
+def test_replay_mode_is_read_only(cache_url):
+    recorder = LLMClient(providers=[StubProvider()], cache=ResponseCache(url=cache_url, mode="rw"))
+    recorder.generate_structured("sys", "known", ResumeSummary, cache_tag="summarize")
+
+    stub = StubProvider()
+    replay = LLMClient(providers=[stub], cache=ResponseCache(url=cache_url, mode="replay"))
+    replay.generate_structured("sys", "known", ResumeSummary, cache_tag="summarize")
+    with pytest.raises(CacheMissError):
+        replay.generate_structured("sys", "unknown", ResumeSummary, cache_tag="summarize")
+
+    assert stub.calls == 0
+
+
+def test_size_based_eviction(cache_url):
+    cache = ResponseCache(url=cache_url, mode="rw", max_bytes=300)
+    for i in range(10):
+        cache.put(f"key{i}", "stub", "stub-model", ResumeSummary, "x" * 100)
+
+    assert cache.stats()["stored_bytes"] <= 300
+    assert cache.get("key9") is not None
+    assert cache.get("key0") is None
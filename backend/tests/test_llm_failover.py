@@ -0,0 +1,134 @@
+import time
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.llm import LLMClient, LLMUnavailableError
+from app.providers import StubProvider, CircuitBreaker, stub_payload
+from app.models import Evaluation, ResumeSummary
+
+
+def test_generate_structured_with_stub_payload():
+    client = LLMClient(providers=[StubProvider()])
+    evaluation = client.generate_structured("sys", "user", Evaluation)
+
+    assert isinstance(evaluation, Evaluation)
+    assert 0 <= evaluation.depth_score <= 10
+
+
+def test_no_providers_raises_clear_error():
+    client = LLMClient(providers=[])
+    with pytest.raises(LLMUnavailableError):
+        client.generate_structured("sys", "user", ResumeSummary)
+
+
+def test_failover_to_secondary_on_error():
+    primary = StubProvider(name="primary", failure_rate=1.0)
+    secondary = StubProvider(name="secondary")
+    client = LLMClient(providers=[primary, secondary], hedge=False)
+
+    client.generate_structured("sys", "user", ResumeSummary)
+
+    assert primary.calls == 1
+    assert secondary.calls == 1
+
+
+def test_circuit_opens_and_skips_failing_provider():
+    primary = StubProvider(name="primary", failure_rate=1.0)
+    secondary = StubProvider(name="secondary")
+    client = LLMClient(providers=[primary, secondary], hedge=False, breaker_threshold=2, breaker_reset=60)
+
+    for _ in range(4):
+        client.generate_structured("sys", "user", ResumeSummary)
+
+    # After 2 failures the primary's circuit is open and it is no longer called
+    assert primary.calls == 2
+    assert secondary.calls == 4
+    assert client.health()[0]["circuit"] == "open"
+
+
+def test_circuit_half_open_probe_closes_on_success():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()       # probe
+    assert not breaker.allow()   # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_hedged_request_uses_faster_secondary():
+    slow = StubProvider(name="slow", latency=0.5)
+    fast = StubProvider(name="fast", latency=0.01)
+    client = LLMClient(providers=[slow, fast], hedge=True, hedge_delay=0.05)
+
+    start = time.perf_counter()
+    client.generate_structured("sys", "user", ResumeSummary)
+    elapsed = time.perf_counter() - start
+
+    assert fast.calls == 1
+    assert elapsed < 0.4
+
+
+def test_no_hedge_when_primary_is_fast():
+    primary = StubProvider(name="primary", latency=0.0)
+    secondary = StubProvider(name="secondary")
+    client = LLMClient(providers=[primary, secondary], hedge=True, hedge_delay=0.5)
+
+    client.generate_structured("sys", "user", ResumeSummary)
+
+    assert secondary.calls == 0
+
+
+def test_hedges_count_against_max_concurrency():
+    lock = threading.Lock()
+    in_flight, peak = [0], [0]
+
+    def responder(delay):
+        def respond(system_prompt, user_prompt, response_model):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(delay)
+            with lock:
+                in_flight[0] -= 1
+            return stub_payload(response_model)
+        return respond
+
+    slow = StubProvider(name="slow", responder=responder(0.3))
+    fast = StubProvider(name="fast", responder=responder(0.05))
+    client = LLMClient(providers=[slow, fast], hedge=True, hedge_delay=0.02, max_concurrency=2)
+
+    threads = [threading.Thread(target=client.generate_structured, args=("sys", f"user {i}", ResumeSummary)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    time.sleep(0.35)  # losing hedges finish in the background
+
+    assert fast.calls >= 1
+    assert peak[0] == 2
+
+
+def test_hedge_executor_created_once():
+    client = LLMClient(providers=[StubProvider(name="a", latency=0.05), StubProvider(name="b")], hedge=True, hedge_delay=0.01)
+    barrier = threading.Barrier(8)
+
+    def call():
+        barrier.wait()
+        client.generate_structured("sys", "user", ResumeSummary)
+
+    def slow_pool(*args, **kwargs):
+        time.sleep(0.05)  # widens the window between the None check and the assignment
+        return ThreadPoolExecutor(*args, **kwargs)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    with patch("app.llm.ThreadPoolExecutor", side_effect=slow_pool) as pools:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert pools.call_count == 1
@@ -1,5 +1,13 @@
+import io
 import os
-from app.services.report import generate_report_pdf
+import uuid
+from unittest.mock import patch
+
+import pytest
+from pypdf import PdfReader
+
+from app.services import report as report_service
+from app.services.report import generate_report_pdf, render_report_pdf_bytes, transcript_for_pdf
 from app.models import FinalReport
 
 def test_generate_pdf_report():
@@ -35,7 +43,7 @@ def test_generate_pdf_report():
         ]
     )
     
-    session_id = "test_pdf_gen_123"
+    session_id = f"test_pdf_gen_{uuid.uuid4().hex}"
     transcript = [
         {"role": "interviewer", "text": "Hello"},
         {"role": "candidate", "text": "Hi there"},
@@ -44,17 +52,40 @@ def test_generate_pdf_report():
     ]
     
     # Run Generation
-    pdf_path = generate_report_pdf(report, session_id, transcript)
-    
-    # Verification
-    assert os.path.exists(pdf_path)
-    file_size = os.path.getsize(pdf_path)
-    print(f"Generated PDF size: {file_size} bytes")
-    
-    assert file_size > 1000 # Should be substantial
-    
-    # Check cleanup (optional, or manual)
-    # os.remove(pdf_path)
+    pdf = generate_report_pdf(report, session_id, transcript)
+
+    # Verification: built in memory, nothing left under /tmp
+    assert pdf.startswith(b"%PDF")
+    assert len(pdf) > 1000 # Should be substantial
+    assert not os.path.exists(f"/tmp/report_{session_id}.pdf")
+
+
+REPORT = {
+    "overall_score": 7, "category_scores": {"correctness": 7, "depth": 6},
+    "strengths": ["Clear"], "weaknesses": ["Shallow"], "improvement_plan_7_days": ["Day 1: read"],
+    "improved_answers": [],
+}
+
+
+@pytest.mark.parametrize("renderer", ["reportlab", "fpdf"])
+def test_renderers_include_transcript(renderer):
+    answer = "Use a <b>heap</b> & compare: a < b.\n" + "Then rebalance the shards. " * 300
+    transcript = [{"role": "interviewer", "text": "How do you merge k lists?"}, {"role": "candidate", "text": answer}]
+    pdf = PdfReader(io.BytesIO(render_report_pdf_bytes("s1", {"final_report": REPORT, "transcript": transcript}, renderer)))
+    text = "\n".join(page.extract_text() for page in pdf.pages)
+
+    assert "How do you merge k lists?" in text
+    assert "Use a <b>heap</b> & compare: a < b." in text
+    assert len(pdf.pages) >= 3 and f"Page {len(pdf.pages)}" in text
+
+
+def test_transcript_caps():
+    transcript = [{"role": "candidate", "text": "word " * 100}] * 5
+    assert transcript_for_pdf(transcript) == transcript
+    with patch.object(report_service, "PDF_TRANSCRIPT_MAX_TURNS", 2), patch.object(report_service, "PDF_TRANSCRIPT_MAX_CHARS", 50):
+        capped = transcript_for_pdf(transcript)
+    assert len(capped) == 3 and capped[-1] == {"role": "note", "text": "3 later turns not shown."}
+    assert capped[0]["text"].endswith(" [...]") and len(capped[0]["text"]) <= 56
 
 if __name__ == "__main__":
     test_generate_pdf_report()
@@ -0,0 +1,59 @@
+import pstats
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.llm import LLMClient
+from app.main import app
+from app.profiling import ProfileStore, profiler
+from app.providers import StubProvider
+from tests.test_ws_channel import make_session
+
+
+@pytest.fixture
+def client(tmp_path):
+    stub = LLMClient(providers=[StubProvider()])
+    store = ProfileStore(str(tmp_path / "profiles"), max_files=2)
+    with patch("app.graph.llm_client", stub), patch.object(profiler, "store", store), TestClient(app) as c:
+        yield c
+
+
+def test_header_profiles_request_across_layers(client, tmp_path):
+    session_id = make_session()
+    r = client.post(f"/session/{session_id}/answer", json={"text": "An answer."}, headers={"X-Profile": "1"})
+    assert r.status_code == 200
+    profile_id = r.headers["X-Profile-Id"]
+
+    record = client.get(f"/admin/profiles/{profile_id}").json()
+    assert record["session_id"] == session_id
+    assert record["trigger"] == "header"
+    spans = set(record["span_totals"])
+    assert {"graph", "llm.Evaluation", "repo.get_session", "repo.update_session_state"} <= spans
+    assert record["top_functions"]
+
+    listed = client.get("/admin/profiles", params={"session_id": session_id}).json()["profiles"]
+    assert [p["id"] for p in listed] == [profile_id]
+
+    raw = client.get(f"/admin/profiles/{profile_id}/download")
+    path = tmp_path / "download.prof"
+    path.write_bytes(raw.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_untriggered_requests_are_not_profiled(client):
+    r = client.get("/metrics")
+    assert "X-Profile-Id" not in r.headers
+    assert client.get("/admin/profiles").json()["profiles"] == []
+
+
+def test_ring_buffer_and_runtime_sampling(client):
+    for _ in range(3):
+        assert "X-Profile-Id" in client.get("/metrics?profile=1").headers
+    assert len(client.get("/admin/profiles").json()["profiles"]) == 2
+
+    assert client.put("/admin/profiles/config", json={"sample_rate": 1.0}).status_code == 200
+    try:
+        assert "X-Profile-Id" in client.get("/metrics").headers
+    finally:
+        client.put("/admin/profiles/config", json={"sample_rate": 0.0})
+    assert client.put("/admin/profiles/config", json={"sample_rate": 2}).status_code == 400
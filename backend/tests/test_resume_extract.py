@@ -0,0 +1,84 @@
+import time
+from unittest.mock import patch
+
+from app import graph
+from app.graph import node_summarize_resume, node_generate_main_question
+from app.llm import LLMClient
+from app.providers import StubProvider, stub_payload
+from app.resume_extract import extract_summary, find_terms
+from conftest import new_state
+
+RESUME = """Jane Doe
+jane@example.com | github.com/jane
+
+SUMMARY
+Backend engineer building distributed systems and microservices.
+
+Technical Skills: Python, Go, PostgreSQL, Kubernetes, AWS
+Frameworks: React, Node.js
+
+EXPERIENCE
+Software Engineer, Acme Corp (2021 - 2024)
+- Cut p99 latency by 40% by adding a Redis cache in front of the pricing service
+- Moved the team from cron jobs to Kafka consumers
+- Let the interns go home early on Fridays
+
+PROJECTS
+Ride Matcher | Golang, Redis
+- Matched riders to drivers with geohash buckets
+Resume Parser - Python, spaCy
+- Extracted sections from PDFs
+
+Awards
+- Won first place at the 2023 city hackathon
+"""
+
+
+def test_terms_match_on_word_boundaries():
+    found = [(kind, name) for _, kind, name in find_terms("JavaScript and Java; let's go. Go and C++ with k8s")]
+    assert found == [("skill", "JavaScript"), ("skill", "Java"), ("skill", "Go"), ("skill", "C++"), ("skill", "Kubernetes")]
+
+
+def test_everyday_words_are_not_skills():
+    prose = "Worked with the rest of the team during Spring 2023 to ship the billing service."
+    assert extract_summary(prose).skills == []
+
+    found = [name for _, _, name in find_terms("Built RESTful services with Spring and a REST API gateway")]
+    assert found == ["REST APIs", "Spring Boot", "REST APIs"]
+
+
+def test_extract_summary():
+    summary = extract_summary(RESUME)
+
+    # Skills section entries first, in order, then skills only mentioned elsewhere
+    assert summary.skills[:7] == ["Python", "Go", "PostgreSQL", "Kubernetes", "AWS", "React", "Node.js"]
+    assert "Redis" in summary.skills and "Kafka" in summary.skills
+    assert summary.projects == ["Ride Matcher", "Resume Parser"]
+    assert summary.achievements == [
+        "Won first place at the 2023 city hackathon",
+        "Cut p99 latency by 40% by adding a Redis cache in front of the pricing service",
+    ]
+    assert {"Distributed Systems", "Microservices", "Caching"} <= set(summary.keywords)
+
+
+def test_local_refine_swaps_in_llm_summary():
+    def responder(system_prompt, user_prompt, response_model):
+        if response_model.__name__ == "ResumeSummary":
+            time.sleep(0.2)
+            return {"skills": ["Refined"], "projects": [], "achievements": [], "keywords": []}
+        return stub_payload(response_model)
+
+    state = new_state(resume_text=RESUME + str(time.time()), total_questions=3)
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    with patch("app.graph.llm_client", stub), patch("app.graph.RESUME_SUMMARY_MODE", "local_refine"):
+        start = time.perf_counter()
+        state = node_summarize_resume(state)
+        assert time.perf_counter() - start < 0.15  # didn't wait for the LLM
+        assert state["resume_summary_source"] == "local" and "Python" in state["resume_summary"]["skills"]
+
+        for future in list(graph._refinements.values()):
+            future.result(timeout=5)
+        state = node_generate_main_question(state)
+
+    assert state["resume_summary_source"] == "llm"
+    assert state["resume_summary"]["skills"] == ["Refined"]
@@ -0,0 +1,111 @@
+import time
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.graph import node_summarize_resume, node_generate_main_question
+from app.llm import LLMClient
+from app.models import Question
+from app.providers import StubProvider, stub_payload
+from app.main import app
+from conftest import new_state
+
+RESUME = {"resume": ("resume.pdf", b"%PDF-1.4\n", "application/pdf")}
+FORM = {"role": "SDE1", "difficulty": "Easy", "num_questions": "2", "background": "true"}
+
+
+def test_background_start_prepares_after_response():
+    stub = LLMClient(providers=[StubProvider()])
+    with patch("app.graph.llm_client", stub), patch("app.main.parse_resume_upload", return_value="Resume text"), \
+            TestClient(app) as client:
+        r = client.post("/session/start", data=FORM, files=RESUME)
+        assert r.status_code == 200
+        body = r.json()
+        assert body["status"] == "preparing" and body["current_question"] is None
+
+        # TestClient runs background tasks before returning, so the session is ready by now
+        state = client.get(f"/session/{body['session_id']}/state").json()
+        assert state["status"] == "ready"
+        assert state["current_question"]["id"] == "q_1"
+
+
+def test_background_start_reports_unreadable_resume():
+    with patch("app.main.parse_resume_upload", return_value=""), TestClient(app) as client:
+        session_id = client.post("/session/start", data=FORM, files=RESUME).json()["session_id"]
+        state = client.get(f"/session/{session_id}/state").json()
+        assert (state["status"], state["status_detail"]) == ("failed", "Could not parse PDF")
+
+        # The synchronous start still fails the request itself
+        r = client.post("/session/start", data={**FORM, "background": "false"}, files=RESUME)
+        assert r.status_code == 400
+
+
+def test_intro_question_runs_alongside_summary():
+    seen = []
+
+    def responder(system_prompt, user_prompt, response_model):
+        seen.append(response_model.__name__)
+        time.sleep(0.3)
+        return stub_payload(response_model)
+
+    state = new_state(resume_text="Ten years of Python.", total_questions=3)
+    stub = LLMClient(providers=[StubProvider(responder=responder)])
+    start = time.perf_counter()
+    with patch("app.graph.llm_client", stub):
+        state = node_generate_main_question(node_summarize_resume(state))
+
+    assert time.perf_counter() - start < 0.55  # two 0.3s calls, overlapped
+    assert sorted(seen) == ["Question", "ResumeSummary"]
+    assert state["current_question"]["id"] == "q_1" and state["prepared_question"] is None
+
+
+def pdf_bytes(pages: int, text: str) -> bytes:
+    import io
+    from reportlab.pdfgen import canvas
+
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(pages):
+        c.drawString(72, 720, f"{text} page {i + 1}")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_upload_limits():
+    with TestClient(app) as client:
+        def start(content):
+            return client.post("/session/start", data={**FORM, "background": "false"},
+                               files={"resume": ("resume.pdf", content, "application/pdf")})
+
+        assert start(b"<html>not a resume</html>").status_code == 415
+        with patch("app.services.resume.RESUME_MAX_BYTES", 1024):
+            assert start(b"%PDF-1.4\n" + b"0" * 4096).status_code == 413
+        with patch("app.services.resume.RESUME_MAX_PAGES", 2):
+            r = start(pdf_bytes(3, "Long resume"))
+            assert (r.status_code, r.json()["detail"]) == (422, "Resume has more than 2 pages")
+
+
+def test_same_upload_parsed_once():
+    import asyncio
+    import io
+    from starlette.datastructures import UploadFile
+    from app.services import resume
+
+    content = pdf_bytes(1, f"Sample resume {time.time()}")
+    calls = []
+    real_parse = resume.parse_resume_pdf
+
+    def parse(stream, max_pages=None):
+        calls.append(1)
+        return real_parse(stream, max_pages)
+
+    with patch("app.services.resume.parse_resume_pdf", parse), patch("app.services.resume.RESUME_SPOOL_MEMORY_BYTES", 256):
+        texts = []
+        for _ in range(2):
+            upload = asyncio.run(resume.spool_upload(UploadFile(io.BytesIO(content))))
+            assert upload.size == len(content) and upload.file._rolled  # spilled to disk past the memory limit
+            texts.append(resume.parse_resume_upload(upload))
+            upload.close()
+
+    assert texts[0] == texts[1] and "Sample resume" in texts[0]
+    assert len(calls) == 1
@@ -0,0 +1,128 @@
+import time
+import uuid
+import asyncio
+import threading
+import pytest
+
+from app.shared_cache import SharedCache, SQLBackend, FileBackend, MemoryBackend
+
+
+def workers(make_backend):
+    # Two caches on one store stand in for two uvicorn worker processes
+    backend = make_backend()
+    return [SharedCache(backend, lease_sec=5), SharedCache(make_backend() if backend.name == "file" else backend, lease_sec=5)]
+
+
+@pytest.fixture(params=["db", "file"])
+def make_backend(request, tmp_path):
+    if request.param == "db":
+        return SQLBackend
+    return lambda: FileBackend(str(tmp_path))
+
+
+def test_concurrent_misses_compute_once(make_backend):
+    caches = workers(make_backend)
+    key = uuid.uuid4().hex
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return b"rendered"
+
+    def request(cache):
+        results.append(cache.get_or_compute("report_pdf", key, compute, ttl=60))
+
+    threads = [threading.Thread(target=request, args=(caches[i % 2],)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [b"rendered"] * 6
+    assert caches[1].get("report_pdf", key) == b"rendered"
+
+
+def test_expired_lease_is_taken_over(make_backend):
+    backend = make_backend()
+    key = uuid.uuid4().hex
+    # A worker took the lease and died
+    assert backend.acquire_lease("tts", key, "dead-worker", lease_sec=0.05)
+    time.sleep(0.1)
+
+    cache = SharedCache(backend)
+    assert cache.get_or_compute("tts", key, lambda: b"audio") == b"audio"
+
+
+def test_ttl_and_disabled_namespace():
+    cache = SharedCache(MemoryBackend(), namespaces={"tts"})
+    cache.set("tts", "k", b"v", ttl=0.05)
+    assert cache.get("tts", "k") == b"v"
+    time.sleep(0.1)
+    assert cache.get("tts", "k") is None
+
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute("report_pdf", "k", lambda: calls.append(1) or b"x")
+    assert len(calls) == 2
+
+
+def test_async_callers_share_one_computation():
+    cache = SharedCache(SQLBackend())
+    key = uuid.uuid4().hex
+    calls = []
+
+    async def synthesize():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return b"mp3"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_compute("tts", key, synthesize) for _ in range(4)))
+
+    assert asyncio.run(main()) == [b"mp3"] * 4
+    assert len(calls) == 1
+
+
+class BrokenBackend(MemoryBackend):
+    def get(self, namespace, key):
+        raise RuntimeError("database is locked")
+
+
+def test_broken_store_computes_without_waiting():
+    cache = SharedCache(BrokenBackend(), wait_sec=30)
+    start = time.monotonic()
+    assert cache.get_or_compute("tts", "k", lambda: b"audio") == b"audio"
+    assert asyncio.run(cache.aget_or_compute("tts", "k", lambda: asyncio.sleep(0, b"audio"))) == b"audio"
+    assert time.monotonic() - start < 1
+
+
+def test_lease_renewed_while_computing(make_backend):
+    backend = make_backend()
+    holder, other = SharedCache(backend, lease_sec=0.3), SharedCache(backend, lease_sec=0.3)
+    key = uuid.uuid4().hex
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(1)  # outlives several lease periods
+        return b"pdf"
+
+    first = threading.Thread(target=holder.get_or_compute, args=("report_pdf", key, compute))
+    first.start()
+    time.sleep(0.1)
+    assert other.get_or_compute("report_pdf", key, compute) == b"pdf"
+    first.join()
+    assert len(calls) == 1
+
+
+def test_store_trimmed_to_max_bytes(make_backend):
+    backend = make_backend()
+    cache = SharedCache(backend, max_bytes=2500)
+    keys = [uuid.uuid4().hex for _ in range(5)]
+    for key in keys:
+        cache.get_or_compute("tts", key, lambda: b"x" * 1000)
+        time.sleep(0.01)
+    # Only the newest values that fit remain
+    assert [backend.get("tts", key) is not None for key in keys] == [False, False, False, True, True]
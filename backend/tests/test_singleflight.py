@@ -0,0 +1,91 @@
+import time
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+
+from app.singleflight import SingleFlight
+from app.services import report
+
+
+def run_threads(n, target):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight("test")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "report"
+
+    assert run_threads(5, lambda: flight.do("k", compute)) == ["report"] * 5
+    assert len(calls) == 1 and flight.in_flight() == 0
+
+    # Nothing is kept afterwards: a later call computes again
+    flight.do("k", compute)
+    assert len(calls) == 2
+
+
+def test_waiters_get_the_leaders_error():
+    flight = SingleFlight("test")
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError("render failed")
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except RuntimeError as e:
+            return str(e)
+
+    assert run_threads(3, call) == ["render failed"] * 3
+
+
+def test_async_waiter_retries_when_leader_is_cancelled():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def synthesize():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return b"mp3"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado("k", synthesize))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.ado("k", synthesize)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()  # e.g. the client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == [b"mp3"] * 3
+    assert len(calls) == 2
+
+
+def test_report_pdf_rendered_once_for_concurrent_requests():
+    renders = []
+
+    def render(session_id, state):
+        renders.append(session_id)
+        time.sleep(0.2)
+        return b"%PDF"
+
+    state = {"final_report": {"overall_score": 7}, "messages": []}
+    with patch("app.services.report.render_report_pdf_bytes", render), \
+         patch("app.shared_cache.shared_cache.enabled_for", return_value=False):
+        results = run_threads(4, lambda: report.report_pdf_bytes("sf-session", state))
+
+    assert results == [b"%PDF"] * 4
+    assert renders == ["sf-session"]
@@ -0,0 +1,67 @@
+import uuid
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, init_db
+from app.main import app
+from app.services import analytics
+from app.services.skill_index import SkillIndex, normalize_term
+from conftest import scored_state
+
+
+def skills_state(skills, design_scores=()):
+    return scored_state("System Design", design_scores, resume_summary={"skills": skills, "keywords": []})
+
+
+def test_normalize_term_folds_aliases():
+    assert normalize_term("  K8s ") == "kubernetes"
+    assert normalize_term("Apache  Kafka") == "kafka"
+    assert normalize_term("Unknown Tool") == "unknown tool"
+    assert normalize_term("REST") == normalize_term("RESTful") == "rest apis"
+
+
+def test_search_by_skills_and_scores():
+    init_db()
+    db = SessionLocal()
+    tag = f"skill-{uuid.uuid4().hex[:8]}"  # unique to this run; the index is process-wide
+    sessions = {}
+    for name, skills, scores in [
+        ("a", ["Apache Kafka", tag, "Python"], [8, 9]),
+        ("b", ["kafka", tag], [5]),
+        ("c", [tag, "Go"], [9]),
+        ("d", ["Kafka", "Java"], [9]),
+    ]:
+        sessions[name] = str(uuid.uuid4())
+        analytics.record_turn(db, sessions[name], 0, False, skills_state(skills, scores))
+    db.close()
+
+    def search(**body):
+        with TestClient(app) as client:
+            r = client.post("/admin/sessions/search", json=body)
+            assert r.status_code == 200, r.text
+            return r.json()
+
+    found = search(all_skills=[tag, "Kafka"])
+    assert found == {"total": 2, "session_ids": [sessions["b"], sessions["a"]]}  # newest first
+    assert set(search(all_skills=[tag], any_skills=["Go", "python"])["session_ids"]) == {sessions["a"], sessions["c"]}
+    found = search(all_skills=[tag, "kafka"], scores=[{"topic": "System Design", "min": 7}])
+    assert found == {"total": 1, "session_ids": [sessions["a"]]}
+
+    with TestClient(app) as client:
+        assert client.post("/admin/sessions/search", json={"scores": [{"min": 7}]}).status_code == 400
+
+
+def test_refined_summary_replaces_terms():
+    init_db()
+    db = SessionLocal()
+    session_id, old, new = str(uuid.uuid4()), f"old-{uuid.uuid4().hex}", f"new-{uuid.uuid4().hex}"
+    state = skills_state([old])
+    analytics.record_turn(db, session_id, 0, False, state)
+    index = SkillIndex()
+    index.refresh(db)
+    assert index.sessions(index.match([old], [])) == [session_id]
+
+    analytics.record_turn(db, session_id, 0, False, skills_state([new]), summary_before=state["resume_summary"])
+    index.refresh(db)
+    db.close()
+    assert index.sessions(index.match([old], [])) == []
+    assert index.sessions(index.match([new], [])) == [session_id]
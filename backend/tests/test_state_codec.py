@@ -0,0 +1,56 @@
+import pytest
+
+from app.database import SessionLocal, init_db
+from app.models import Session
+from app.repo import SessionRepo
+from app.state_codec import StateCodecError, decode_state, encode_state
+
+STATE = {"role": "SDE1", "transcript": [{"role": "interviewer", "text": "Héllo — tell me about caching."}] * 20,
+         "eval_history": [{"question_id": "q_1", "depth_score": 7}], "final_report": None}
+
+
+@pytest.mark.parametrize("codec", ["json", "json+zlib", "json+zstd", "msgpack+zlib"])
+def test_roundtrip(codec):
+    if "zstd" in codec:
+        pytest.importorskip("zstandard")
+    if "msgpack" in codec:
+        pytest.importorskip("msgpack")
+    blob = encode_state(STATE, codec)
+    assert blob[:3] == b"ST\x01"
+    assert decode_state(blob) == STATE
+
+
+def test_rejects_unknown_blobs():
+    with pytest.raises(StateCodecError):
+        decode_state(b"{}")
+    newer = b"ST\x09" + encode_state(STATE, "json")[3:]
+    with pytest.raises(StateCodecError, match="newer"):
+        decode_state(newer)
+    assert encode_state(STATE, "text") is None
+
+
+def test_legacy_text_rows_read_and_upgraded():
+    from app.cli import main as cli
+
+    init_db()
+    db = SessionLocal()
+    legacy = Session(role="SDE1", difficulty="Easy", state_text=STATE, state_version=1)
+    other = Session(role="SDE1", difficulty="Easy", state_text=STATE, state_version=1)
+    db.add_all([legacy, other])
+    db.commit()
+
+    repo = SessionRepo(db)
+    assert repo.get_session(legacy.id).state_json == STATE
+
+    # Upgraded on its next write
+    repo.update_session_state(legacy.id, {**STATE, "is_finished": True})
+    row = repo.get_session(legacy.id)
+    assert row.state_text is None and row.state_blob[:2] == b"ST"
+    assert row.state_json["is_finished"] is True
+
+    # ... or all at once
+    cli(["upgrade-state"])
+    db.expire_all()
+    row = repo.get_session(other.id)
+    assert row.state_text is None and row.state_json == STATE
+    db.close()
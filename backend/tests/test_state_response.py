@@ -0,0 +1,75 @@
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app import main
+from app.database import SessionLocal, init_db
+from app.metrics import metrics
+from app.repo import SessionRepo
+
+QUESTION = {"id": "q_2", "text": "How would you shard a hot table?", "topic": "Databases",
+            "expected_points": ["Shard key", "Rebalancing"], "difficulty": "Medium", "kind": "followup",
+            "time_limit_sec": 60}
+STATE = {
+    "role": "SDE1", "difficulty": "Medium", "total_questions": 3, "current_step": 2,
+    "current_question": QUESTION,
+    "transcript": [{"role": "interviewer", "text": "Tell me about indexes."}, {"role": "candidate", "text": "B-trees."}],
+    "eval_history": [{"question_id": "q_1", "correctness_score": 7, "depth_score": 6, "structure_score": 8,
+                      "communication_score": 7, "missing_points": ["Covering indexes"], "feedback_text": "Good."}],
+    "final_report": None, "is_finished": False,
+}
+
+
+def test_fast_path_body_matches_validated_response():
+    init_db()
+    db = SessionLocal()
+    session_id = SessionRepo(db).create_session("SDE1", "Medium", STATE).id
+    db.close()
+
+    with TestClient(main.app) as client:
+        fast = client.get(f"/session/{session_id}/state").json()
+        with patch.object(main, "STATE_RESPONSE_FAST_PATH", False):
+            validated = client.get(f"/session/{session_id}/state").json()
+    assert fast == validated
+    assert fast["is_followup"] and fast["scores"]["depth_score"] == 6
+
+
+def test_state_body_cached_until_next_version():
+    init_db()
+    db = SessionLocal()
+    repo = SessionRepo(db)
+    session_id = repo.create_session("SDE1", "Medium", STATE).id
+    db.close()
+
+    with TestClient(main.app) as client:
+        hits = metrics.counter("state_response.cache_hits")
+        first = client.get(f"/session/{session_id}/state")
+        second = client.get(f"/session/{session_id}/state")
+        assert first.status_code == 200 and first.content == second.content
+        assert first.json()["current_question"]["id"] == "q_2"
+        assert metrics.counter("state_response.cache_hits") == hits + 1
+
+        db = SessionLocal()
+        SessionRepo(db).update_session_state(session_id, {**STATE, "current_question": None})
+        db.close()
+        assert client.get(f"/session/{session_id}/state").json()["current_question"] is None
+
+
+def test_overlapping_writers_get_distinct_versions():
+    init_db()
+    db = SessionLocal()
+    session_id = SessionRepo(db).create_session("SDE1", "Medium", STATE).id
+    db.close()
+
+    # Both writers loaded the row at version 1 before either wrote
+    first_db, second_db = SessionLocal(), SessionLocal()
+    first, second = SessionRepo(first_db), SessionRepo(second_db)
+    assert first.get_session(session_id).state_version == second.get_session(session_id).state_version == 1
+    v1 = first.update_session_state(session_id, {**STATE, "current_step": 3}).state_version
+    v2 = second.touch_session(session_id).state_version
+    v3 = second.update_session_state(session_id, {**STATE, "current_question": None}).state_version
+    first_db.close()
+    second_db.close()
+    assert (v1, v2, v3) == (2, 3, 4)
+
+    with TestClient(main.app) as client:
+        assert client.get(f"/session/{session_id}/state").json()["current_question"] is None
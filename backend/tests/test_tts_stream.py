@@ -0,0 +1,48 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.voice import split_sentences, stream_speech
+
+
+def test_split_sentences():
+    text = "Great. Tell me about the cache you built! How did you size it, and what got evicted first?\nTake your time."
+    assert split_sentences(text) == [
+        "Great. Tell me about the cache you built!",
+        "How did you size it, and what got evicted first? Take your time.",  # too short to stand alone
+    ]
+    long = "You said the queue backs up, " * 6 + "so what would you change first?"
+    assert all(len(s) <= 60 for s in split_sentences(long, max_chars=60))
+    assert " ".join(split_sentences(long, max_chars=60)) == long.strip()
+
+
+def test_stream_is_ordered_bounded_and_cached_per_sentence():
+    tag = uuid.uuid4().hex[:8]
+    sentences = [f"Sentence number {i} about {tag} goes here." for i in range(5)]
+    synthesized, running, peak = [], [0], [0]
+
+    async def fake_synthesize(text, voice_name, rate, pitch):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05 if text == sentences[0] else 0.01)  # later sentences finish first
+        running[0] -= 1
+        synthesized.append(text)
+        return text.encode()
+
+    async def collect(text):
+        return [chunk async for chunk in stream_speech(text)]
+
+    with patch("app.services.voice._synthesize", fake_synthesize), patch("app.services.voice.TTS_PIPELINE_WORKERS", 2):
+        chunks = asyncio.run(collect(" ".join(sentences)))
+        assert chunks == [s.encode() for s in sentences]
+        assert peak[0] == 2
+
+        # A prompt repeating a sentence only synthesizes the new one
+        synthesized.clear()
+        with TestClient(app) as client:
+            r = client.get("/speech/stream", params={"text": f"{sentences[2]} A brand new closing line {tag}."})
+        assert r.status_code == 200 and r.headers["content-type"] == "audio/mpeg"
+        assert r.content == f"{sentences[2]}A brand new closing line {tag}.".encode()
+        assert synthesized == [f"A brand new closing line {tag}."]
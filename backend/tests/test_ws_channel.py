@@ -0,0 +1,105 @@
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.llm import LLMClient
+from app.providers import StubProvider
+from app.repo import SessionRepo
+from app.database import SessionLocal
+from app.main import app
+from conftest import new_state
+
+
+@pytest.fixture
+def client():
+    stub = LLMClient(providers=[StubProvider()])
+    with patch("app.graph.llm_client", stub), TestClient(app) as c:
+        yield c
+
+
+def make_session(total_questions=2):
+    state = new_state(
+        resume_text="", resume_summary={"skills": ["python"]}, total_questions=total_questions,
+        current_question={"id": "q_1", "text": "Tell me about yourself.", "topic": "General/Intro",
+                          "expected_points": [], "difficulty": "Easy", "kind": "main"},
+        transcript=[{"role": "interviewer", "text": "Tell me about yourself."}],
+        asked_main_questions=1, followup_count_for_current=0, max_followups_per_question=1,
+    )
+    db = SessionLocal()
+    session_id = SessionRepo(db).create_session("SDE1", "Easy", state).id
+    db.close()
+    return session_id
+
+
+def wait_for_state(client, session_id, predicate, timeout=3.0):
+    # State is persisted in the background after each turn
+    deadline = time.time() + timeout
+    while True:
+        state = client.get(f"/session/{session_id}/state").json()
+        if predicate(state) or time.time() > deadline:
+            return state
+        time.sleep(0.05)
+
+
+def receive_until(ws, event_type):
+    events = []
+    while True:
+        event = ws.receive_json()
+        events.append(event)
+        if event["type"] in (event_type, "error"):
+            return events
+
+
+def test_answer_turn_pushes_events_and_persists(client):
+    session_id = make_session()
+    with client.websocket_connect(f"/session/{session_id}/ws") as ws:
+        assert ws.receive_json()["type"] == "state"
+
+        ws.send_json({"type": "answer", "text": "I build backend systems."})
+        events = receive_until(ws, "progress")
+        assert [e["type"] for e in events] == ["evaluation", "question", "progress"]
+        assert events[2]["data"]["progress"] == "2/2"
+
+        # Poll while connected: the TestClient stops the socket's event loop on close
+        state = wait_for_state(client, session_id, lambda s: s["progress"] == "2/2")
+    assert state["progress"] == "2/2"
+    assert state["scores"] is not None
+
+
+def test_end_generates_report(client):
+    session_id = make_session()
+    with client.websocket_connect(f"/session/{session_id}/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "end"})
+        events = receive_until(ws, "ended")
+        assert "complete" in [e["type"] for e in events]
+
+        state = wait_for_state(client, session_id, lambda s: s["report_available"])
+        assert state["report_available"]
+
+
+def test_unknown_session_is_rejected(client):
+    with client.websocket_connect("/session/missing/ws") as ws:
+        assert ws.receive_json()["type"] == "error"
+
+
+def test_turn_persisted_when_client_drops_mid_turn(client):
+    from starlette.websockets import WebSocket
+
+    session_id = make_session()
+    real_send = WebSocket.send_json
+
+    async def send_json(self, data, mode="text"):
+        if data["type"] in ("evaluation", "question", "progress"):
+            raise RuntimeError('Cannot call "send" once a close message has been sent.')
+        await real_send(self, data, mode)
+
+    with client.websocket_connect(f"/session/{session_id}/ws") as ws:
+        assert ws.receive_json()["type"] == "state"
+        with patch.object(WebSocket, "send_json", send_json):
+            ws.send_json({"type": "answer", "text": "I build backend systems."})
+            # The evaluated answer and next question are persisted though no event reached the client
+            state = wait_for_state(client, session_id, lambda s: s["progress"] == "2/2")
+    assert state["progress"] == "2/2"
+    assert state["scores"] is not None
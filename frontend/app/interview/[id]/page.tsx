@@ -2,7 +2,7 @@
 
 import { useEffect, useState, useRef, useMemo, useCallback } from "react";
 import { useParams, useRouter } from "next/navigation";
-import { getSessionState, submitAnswer, endSession, getVoiceStatus, synthesizeSpeech, getVoiceOptions } from "@/lib/api";
+import { getSessionState, submitAnswer, endSession, getVoiceStatus, speechStreamUrl, getVoiceOptions } from "@/lib/api";
 import { SessionState, Message, VoiceOption } from "@/types";
 import { DictationInput } from "@/components/DictationInput";
 import { Settings, Send, LayoutDashboard, MessageSquare, UserCircle } from "lucide-react";
@@ -52,14 +52,12 @@ export default function InterviewPage() {
             const ratePct = Math.round((voiceRate - 1.0) * 100);
             const rateStr = ratePct >= 0 ? `+${ratePct}%` : `${ratePct}%`;
 
-            const blob = await synthesizeSpeech(text, selectedVoice, rateStr);
-            const url = URL.createObjectURL(blob);
-
             if (audioRef.current) {
                 audioRef.current.pause();
-                audioRef.current.src = url;
-                audioRef.current.play();
+                audioRef.current.src = speechStreamUrl(text, selectedVoice, rateStr);
                 audioRef.current.onended = () => setIsPlaying(false);
+                audioRef.current.onerror = () => setIsPlaying(false);
+                await audioRef.current.play();
             }
         } catch (err) {
             console.error("TTS play failed", err);
@@ -69,13 +67,26 @@ export default function InterviewPage() {
 
     // 1. Init Session & Voice Check
     useEffect(() => {
-        getSessionState(sessionId).then(setSession).catch(console.error);
+        // A new session is prepared in the background: poll until its first question exists
+        let cancelled = false;
+        let timer: ReturnType<typeof setTimeout>;
+        const load = async () => {
+            const state = await getSessionState(sessionId);
+            if (cancelled) return;
+            setSession(state);
+            if (state.status === "preparing") timer = setTimeout(() => load().catch(console.error), 1000);
+        };
+        load().catch(console.error);
         getVoiceStatus().then((enabled) => {
             setVoiceEnabled(enabled);
             if (enabled) {
                 getVoiceOptions().then(setVoiceOptions).catch(console.error);
             }
         }).catch(() => setVoiceEnabled(false));
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
     }, [sessionId]);
 
     // 2. Auto-scroll
@@ -155,6 +166,8 @@ export default function InterviewPage() {
     }, [session]);
 
     if (!session) return <div className="flex h-screen items-center justify-center text-white">Loading...</div>;
+    if (session.status === "preparing") return <div className="flex h-screen items-center justify-center text-white">Reading your resume and preparing the first question...</div>;
+    if (session.status === "failed") return <div className="flex h-screen items-center justify-center text-white">{session.status_detail || "Could not prepare the interview."}</div>;
 
     return (
         <div className="flex h-screen overflow-hidden relative bg-zinc-950">
@@ -1,4 +1,4 @@
-import { SessionState, ReportResponse, RoleEnum, DifficultyEnum } from "@/types";
+import { SessionState, ReportResponse, RoleEnum, DifficultyEnum, InterviewEvent } from "@/types";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
@@ -14,6 +14,8 @@ export async function startSession(
     formData.append("difficulty", difficulty);
     formData.append("num_questions", numQuestions.toString());
     formData.append("voice_enabled", voiceEnabled.toString());
+    // Respond right away; the interview page waits for status "ready"
+    formData.append("background", "true");
     formData.append("resume", resumeFile);
 
     const res = await fetch(`${API_URL}/session/start`, {
@@ -63,6 +65,37 @@ export async function getReport(sessionId: string): Promise<ReportResponse> {
 }
 
 
+// --- Real-time channel ---
+
+export interface InterviewSocket {
+    sendAnswer: (text: string) => void;
+    end: () => void;
+    close: () => void;
+}
+
+export function connectInterviewSocket(
+    sessionId: string,
+    onEvent: (event: InterviewEvent) => void
+): InterviewSocket {
+    const wsUrl = API_URL.replace(/^http/, "ws");
+    const socket = new WebSocket(`${wsUrl}/session/${sessionId}/ws`);
+
+    socket.onmessage = (msg) => onEvent(JSON.parse(msg.data) as InterviewEvent);
+    socket.onerror = () => onEvent({ type: "error", detail: "Connection error" });
+
+    const send = (payload: object) => {
+        if (socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify(payload));
+        }
+    };
+
+    return {
+        sendAnswer: (text: string) => send({ type: "answer", text }),
+        end: () => send({ type: "end" }),
+        close: () => socket.close(),
+    };
+}
+
 export function getReportPdfUrl(sessionId: string): string {
     return `${API_URL}/session/${sessionId}/report.pdf`;
 }
@@ -86,6 +119,15 @@ export async function getVoiceOptions(): Promise<import("@/types").VoiceOption[]
     return res.json();
 }
 
+// Sentence-pipelined speech as a streamed MP3: usable as an <audio> src, which starts
+// playing after the first sentence instead of after the whole prompt is synthesized
+export function speechStreamUrl(text: string, voiceName?: string, rate?: string): string {
+    const params = new URLSearchParams({ text });
+    if (voiceName) params.set("voice", voiceName);
+    if (rate) params.set("rate", rate);
+    return `${API_URL}/speech/stream?${params.toString()}`;
+}
+
 export async function synthesizeSpeech(text: string, voiceName?: string, rate?: string): Promise<Blob> {
     const res = await fetch(`${API_URL}/speech/speak`, {
         method: "POST",
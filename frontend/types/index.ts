@@ -24,6 +24,7 @@ export interface Evaluation {
   missing_points: string[];
   feedback_text: string;
   followup_needed: boolean;
+  provisional?: boolean; // quick local score; the evaluator missed its deadline
 }
 
 export interface Message {
@@ -40,6 +41,8 @@ export interface SessionState {
   scores: Evaluation | null;
   interview_complete: boolean;
   report_available: boolean;
+  status: "preparing" | "ready" | "failed";
+  status_detail?: string | null;
 }
 
 export interface FinalReport {
@@ -61,3 +64,15 @@ export interface VoiceOption {
   locale: string;
   friendly_name: string;
 }
+
+// --- Real-time channel (/session/{id}/ws) ---
+
+export type InterviewEvent =
+  | { type: "state"; data: SessionState }
+  | { type: "evaluation"; data: Evaluation }
+  | { type: "question"; data: Question; is_followup: boolean }
+  | { type: "progress"; data: { progress: string } }
+  | { type: "complete"; data: { report_available: boolean } }
+  | { type: "ended" }
+  | { type: "pong" }
+  | { type: "error"; detail: string };